@@ -0,0 +1,36 @@
+"""Micro-benchmark the emoji asset loading between the pretty-printed json file
+and its compact marshal sidecar file.
+
+Run with: ``python benchmarks/bench_emoji_asset.py``
+"""
+
+import json
+import timeit
+from pathlib import Path
+
+from clishelf.emoji import EmojiData, load_emoji_sidecar
+
+ASSET: Path = Path(__file__).parent.parent / "clishelf/assets/emoji.json"
+SIDECAR: Path = ASSET.with_suffix(".marshal")
+NUMBER: int = 200
+
+
+def load_json() -> EmojiData:
+    return EmojiData.from_records(json.loads(ASSET.read_bytes()))
+
+
+def load_sidecar() -> EmojiData:
+    data = load_emoji_sidecar(ASSET.read_bytes(), SIDECAR)
+    assert data is not None, "Sidecar does not exist, run `shelf emoji fetch`."
+    return data
+
+
+def main() -> None:
+    assert load_json() == load_sidecar()
+    for name, func in (("json", load_json), ("sidecar", load_sidecar)):
+        best: float = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:<8}: {best / NUMBER * 1_000:.3f} ms per load")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark the commit record parser of `git log` output on a synthetic
+stream of 100k commits between the previous `(END)` line format and the NUL
+terminated record format.
+
+Run with: ``python benchmarks/bench_git_log_parser.py``
+"""
+
+import io
+import time
+import tracemalloc
+from collections.abc import Iterator
+from datetime import datetime
+
+from clishelf.git import parse_commit_records
+from clishelf.utils import Profile
+
+COMMITS: int = 100_000
+CHUNK: int = 64 * 1024
+
+
+def make_end_stream(n: int) -> bytes:
+    """Make the output of ``%h|%D|%cI|%cn|%ce%n%s%n%b%-C()%n(END)``."""
+    return "\n".join(
+        f"{i:07x}|{'tag: v1.0.' + str(i) if i % 100 == 0 else ''}|"
+        f"2024-01-01T00:00:00+07:00|User Name|user@mail.com\n"
+        f"feat: add the feature number {i}\n"
+        f"first line of body\nsecond line of body\n(END)"
+        for i in range(n)
+    ).encode("utf-8")
+
+
+def make_nul_stream(n: int) -> bytes:
+    """Make the output of ``GIT_LOG_FORMAT`` with the ``-z`` option."""
+    return "".join(
+        f"{i:040x}\x1e{i:07x}\x1e{'tag: v1.0.' + str(i) if i % 100 == 0 else ''}\x1e"
+        f"1704042000\x1e+0700\x1eUser Name\x1euser@mail.com\x1e"
+        f"feat: add the feature number {i}\x1e"
+        f"first line of body\nsecond line of body\n\x00"
+        for i in range(n)
+    ).encode("utf-8")
+
+
+def parse_end(stream: bytes) -> Iterator[tuple]:
+    """The previous parser that split the decoded output by lines."""
+    prepare: list[str] = []
+    for line in stream.decode("utf-8").strip().splitlines():
+        if line == "(END)":
+            header = prepare[0].split("|")
+            yield (
+                header[0],
+                header[1],
+                datetime.fromisoformat(header[2]),
+                Profile(name=header[3], email=header[4]),
+                prepare[1],
+                "|".join(prepare[2:]),
+            )
+            prepare = []
+            continue
+        prepare.append(line)
+
+
+def parse_nul(stream: bytes) -> Iterator[tuple]:
+    """The NUL terminated record parser that read chunks like a live pipe."""
+    pipe = io.BytesIO(stream)
+    for r in parse_commit_records(iter(lambda: pipe.read1(CHUNK), b"")):
+        yield r.hash, r.refs, r.date, r.author, r.subject, r.body
+
+
+def bench(name: str, func, stream: bytes, repeat: int = 5) -> None:
+    elapsed: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        count: int = sum(1 for _ in func(stream))
+        elapsed = min(elapsed, time.perf_counter() - start)
+        assert count == COMMITS
+
+    # NOTE: Measure the peak memory that the parser allocate on top of the
+    #   input stream.
+    tracemalloc.start()
+    for _ in func(stream):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<6}: {elapsed:.3f} s for {count:,} commits, "
+        f"peak {peak / 1024 / 1024:.1f} MiB "
+        f"(stream {len(stream) / 1024 / 1024:.1f} MiB)"
+    )
+
+
+def main() -> None:
+    bench("(END)", parse_end, make_end_stream(COMMITS))
+    bench("NUL", parse_nul, make_nul_stream(COMMITS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the version serializing between the previous trial formatting of
+each serialize format and the precompiled serialize plans on a million
+versions of the bump version formats.
+
+Run with: ``python benchmarks/bench_version_serialize.py``
+"""
+
+import string
+import time
+from collections.abc import Callable
+
+from clishelf.bump.bump import assemble_context
+from clishelf.bump.configs import get_part_configs
+from clishelf.bump.version_part import (
+    Version,
+    VersionConfig,
+    VersionPart,
+)
+from clishelf.errors import (
+    IncompleteVersionRepresentationException,
+    MissingValueForSerializationException,
+)
+from clishelf.settings import BumpVerConf
+
+VERSIONS: int = 1_000_000
+
+
+def make_config() -> VersionConfig:
+    return VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=list(BumpVerConf.serialize),
+        search="{current_version}",
+        replace="{new_version}",
+        part_configs=get_part_configs(),
+    )
+
+
+def make_versions(vc: VersionConfig, n: int) -> list[Version]:
+    """Make the versions that rotate between all serialize formats."""
+    samples: list[Version] = [
+        vc.parse(v)
+        for v in ("1.2.3", "1.2.3.rc1", "1.2.3.post2", "1.2.3.b1.post2")
+    ]
+    return [samples[i % len(samples)] for i in range(n)]
+
+
+def serialize_trial(vc: VersionConfig, version: Version, context) -> str:
+    """The previous serializer that format each candidate and parse its labels
+    on every attempt.
+    """
+    values = {**context, **version.values}
+    for fmt in vc.serialize_formats:
+        try:
+            try:
+                serialized = fmt.format(**values)
+            except KeyError as e:
+                raise MissingValueForSerializationException(e) from e
+            required = {
+                label
+                for _, label, _, _ in string.Formatter().parse(fmt)
+                if label
+            }
+            present = {
+                k
+                for k, v in values.items()
+                if isinstance(v, VersionPart) and v.value != "_"
+            }
+            if required - present:
+                raise IncompleteVersionRepresentationException(fmt)
+            return serialized
+        except IncompleteVersionRepresentationException:
+            continue
+    raise KeyError("No valid serialization format found")
+
+
+def bench(name: str, func: Callable[[Version], str], versions: list[Version]):
+    start: float = time.perf_counter()
+    for version in versions:
+        func(version)
+    elapsed: float = time.perf_counter() - start
+    print(
+        f"{name:<6}: {elapsed:.3f} s for {len(versions):,} versions "
+        f"({elapsed / len(versions) * 1e9:.0f} ns/version)"
+    )
+
+
+def main() -> None:
+    vc: VersionConfig = make_config()
+    context = assemble_context()
+    versions: list[Version] = make_versions(vc, VERSIONS)
+    for version in versions[:4]:
+        assert serialize_trial(vc, version, context) == vc.serialize(
+            version, context
+        )
+
+    bench("trial", lambda v: serialize_trial(vc, v, context), versions)
+    bench("plan", lambda v: vc.serialize(v, context), versions)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,37 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Iterable
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from pathlib import Path
+from typing import Any, TypeVar, Union
 
 from ..errors import (
     IncompleteVersionRepresentationException,
     MissingValueForSerializationException,
+    VersionFilesException,
     WorkingDirectoryIsDirtyException,
 )
-from .utils import ConfFile, kv_str, prefixed_env
+from .utils import (
+    ConfFile,
+    StreamEdit,
+    find_bytes,
+    is_large,
+    kv_str,
+    overlaps,
+    prefixed_env,
+    stream_replace,
+    write_atomic,
+)
 from .vcs import Git, Mercurial
 from .version_part import Version, VersionConfig
 
+T = TypeVar("T")
+# NOTE: An edit of a file that is the pair of its current and new contents, or
+#   the stream edit of a large file.
+FileEdit = Union[tuple[str, str], StreamEdit]
 logger = logging.getLogger(__name__)
 time_context: dict[str, datetime] = {
     "now": datetime.now(),
@@ -23,27 +41,31 @@ special_char_context: dict[str, str] = {"#": "#", ";": ";"}
 VCS_HANDLERS = [Git, Mercurial]
 
 
-def determine_vcs_usability() -> dict[str, Any]:
+def determine_vcs_usability(dirty: bool = False) -> dict[str, Any]:
     """Determine usable VCS and return latest tag info merged.
 
     This mirrors the original behavior: check each VCS.is_usable and gather
-    latest_tag_info.
+    latest_tag_info. The dirty flag adds the ``dirty`` key of the working
+    directory.
     """
     vcs_info: dict[str, Any] = {}
     for vcs in VCS_HANDLERS:
         if vcs.is_usable():
-            vcs_info.update(vcs.latest_tag_info())
+            vcs_info.update(vcs.latest_tag_info(dirty=dirty))
     return vcs_info
 
 
-def determine_vcs_dirty(allow_dirty: bool = False):
+def determine_vcs_dirty(allow_dirty: bool = False, check: bool = True):
     """
     Return the first usable VCS class that is not dirty (unless allow_dirty).
-    Mirrors original `_determine_vcs_dirty`.
+    Mirrors original `_determine_vcs_dirty`. The check flag skips the dirty
+    check when the VCS will not commit or tag.
     """
     for vcs in VCS_HANDLERS:
         if not vcs.is_usable():
             continue
+        if not check:
+            return vcs
         try:
             vcs.assert_nondirty()
         except WorkingDirectoryIsDirtyException as e:
@@ -70,8 +92,8 @@ def opportunistic_bump_part_and_serialize(
     version_config: VersionConfig,
     context: dict[str, Any],
 ) -> str | None:
-    """Attempt to increment the indicated part and serialize — returns
-    serialized string.
+    """Attempt to increment the indicated part and serialize it with the
+    serialize plans, or return None if no plan is able to represent it.
 
     Mirrors `_assemble_new_version` opportunistic part bumping when new_version
     is implied.
@@ -113,15 +135,13 @@ def bump_version_by_part_or_literal(
             raise ValueError(
                 "No part specified and no explicit new version provided"
             )
-        new_str: str | None = opportunistic_bump_part_and_serialize(
-            part, current_obj, version_config, context
-        )
-        if new_str is None:
-            # last resort: perform bump on object and serialize
-            new_obj = current_obj.bump(part, version_config.order())
-            new_str = version_config.serialize(new_obj, context)
-        else:
-            new_obj = version_config.parse(new_str)
+        # NOTE: Bump once and serialize with the precompiled plans. It raises
+        #   the errors of the serialize method if no plan is able to
+        #   represent the new version.
+        new_obj = current_obj.bump(part, version_config.order())
+        logger.info(f"Values are now: {kv_str(new_obj.values)}")
+        new_str = version_config.serialize(new_obj, context)
+        new_obj = version_config.parse(new_str)
     return current_obj, new_obj, new_str
 
 
@@ -129,20 +149,309 @@ def check_files_contain_version(
     files: Iterable[ConfFile],
     current_version_str: str,
     context: dict[str, Any],
-):
-    for f in files:
-        f.should_contain_version(current_version_str, context)
+) -> None:
+    """Verify that every configured file contains its search of the current
+    version. It plans the edits to the same version, so nothing is written.
+
+    :raise ValueError: If a file does not contain its search.
+    """
+    plan_version_edits(files, current_version_str, current_version_str, context)
 
 
 def replace_version_in_files(
     files: Iterable[ConfFile],
-    current_version,
-    new_version,
+    current_version: str,
+    new_version: str,
     dry_run: bool,
     context: dict[str, Any],
-):
+) -> list[Path]:
+    """Replace the current version of the configured files with the new
+    version. It plans all files before it writes each one atomically.
+
+    :rtype: list[Path]
+    :return: A list of the file paths that changed.
+    """
+    return write_version_edits(
+        plan_version_edits(files, current_version, new_version, context),
+        dry_run=dry_run,
+    )
+
+
+class _LogBuffer(logging.Filter):
+    """Log Buffer filter that hold the log records of the worker threads that
+    registered, so they replay later in the order of the files instead of the
+    order that the threads finish.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: dict[int, list[logging.LogRecord]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if (buffer := self.records.get(threading.get_ident())) is not None:
+            buffer.append(record)
+            return False
+        return True
+
+
+_log_buffer = _LogBuffer()
+for _name in (__name__, ConfFile.__module__):
+    logging.getLogger(_name).addFilter(_log_buffer)
+
+
+def map_files(
+    func: Callable[..., T],
+    items: list[tuple[Any, ...]],
+    jobs: int = 1,
+) -> list[T]:
+    """Call a function with each item of arguments, and return the results in
+    the order of the items. With more than one job, the calls run on a thread
+    pool and their log records replay in the order of the items after all
+    calls finished. It calls every item even if some of them fail, like a
+    template that names a missing key, and raises the errors of all items
+    together.
+
+    :param func: A function that want to call with each item.
+    :param items: A list of argument tuples, the first is the file path.
+    :param jobs: A number of the worker threads.
+
+    :raise VersionFilesException: If more than one item failed.
+
+    :rtype: list[T]
+    """
+
+    def call(item: tuple[Any, ...]):
+        try:
+            return func(*item), None
+        except Exception as err:
+            return None, err
+
+    def call_buffered(item: tuple[Any, ...]):
+        ident: int = threading.get_ident()
+        _log_buffer.records[ident] = records = []
+        try:
+            return call(item), records
+        finally:
+            del _log_buffer.records[ident]
+
+    if jobs > 1 and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            outputs = list(pool.map(call_buffered, items))
+        for _, records in outputs:
+            for record in records:
+                logging.getLogger(record.name).handle(record)
+        results = [output for output, _ in outputs]
+    else:
+        results = [call(item) for item in items]
+
+    if errors := [err for _, err in results if err is not None]:
+        if len(errors) == 1:
+            raise errors[0]
+        raise VersionFilesException(errors)
+    return [rs for rs, _ in results]
+
+
+def plan_file_edit(
+    path: Path,
+    files: list[ConfFile],
+    current_version: str,
+    new_version: str,
+    context: dict[str, Any],
+    text: str | None = None,
+) -> FileEdit:
+    """Return the current and new contents of a file that has many configured
+    sections. Every section is verified against the current content before
+    any replacement. A file that is larger than the stream threshold returns
+    its stream edit instead.
+
+    :rtype: FileEdit
+    """
+    if text is None:
+        if not path.exists():
+            raise FileNotFoundError(f"Configured file '{path}' does not exist")
+        if is_large(path):
+            return plan_stream_edit(
+                path, files, current_version, new_version, context
+            )
+        text = path.read_text(encoding="utf-8")
+    for f in files:
+        f.check_text(text, current_version, context)
+    new_text: str = text
     for f in files:
-        f.replace(current_version, new_version, context, dry_run)
+        new_text = f.replace_text(
+            new_text, current_version, new_version, context
+        )
+    return text, new_text
+
+
+def plan_stream_edit(
+    path: Path,
+    files: list[ConfFile],
+    current_version: str,
+    new_version: str,
+    context: dict[str, Any],
+) -> StreamEdit:
+    """Return the stream edit of a large file that verifies every section on
+    the memory mapping of the file without reading it as a text. The sections
+    are verified against the original file, but they replace one after
+    another, so a section whose search overlaps the search or the replace of
+    an earlier section fails here instead of in the middle of the write.
+
+    :raise ValueError: If a search does not exist in the file or it depends
+        on an earlier section.
+
+    :rtype: StreamEdit
+    """
+    searches: list[str] = [
+        f.format_search(current_version, context) for f in files
+    ]
+    for search, found in zip(
+        searches,
+        find_bytes(path, [search.encode("utf-8") for search in searches]),
+        strict=True,
+    ):
+        if not found:
+            raise ValueError(
+                f"File {path} does not contain expected search pattern: "
+                f"{search}"
+            )
+    pairs: list[tuple[bytes, bytes]] = []
+    for f in files:
+        search, replace = f.format_templates(
+            current_version, new_version, context
+        )
+        pair: tuple[bytes, bytes] = (
+            search.encode("utf-8"),
+            replace.encode("utf-8"),
+        )
+        if pair[0] != pair[1]:
+            for prev in pairs:
+                if prev[0] != prev[1] and any(
+                    overlaps(pair[0], text) for text in prev
+                ):
+                    raise ValueError(
+                        f"File {path} can not stream the search pattern "
+                        f"{search} because it overlaps the earlier section "
+                        f"{prev[0].decode('utf-8')} → "
+                        f"{prev[1].decode('utf-8')}"
+                    )
+        logger.info(f"[{path}] Stream replace: {search} → {replace}")
+        pairs.append(pair)
+    return StreamEdit(tuple(pairs))
+
+
+def plan_version_edits(
+    files: Iterable[ConfFile],
+    current_version: str,
+    new_version: str,
+    context: dict[str, Any],
+    texts: dict[Path, str] | None = None,
+    jobs: int = 1,
+) -> dict[Path, FileEdit]:
+    """Return the edit plan that map each file path to its current and new
+    contents. It groups the files by path, so a file that has many sections
+    is read only once, and the replacements apply in the order of the
+    sections. It verifies all
+    files before it returns, so nothing is written if any file fails.
+
+    :param files: A list of configured files.
+    :param current_version: A current version string.
+    :param new_version: A new version string.
+    :param context: A context of the search and replace templates.
+    :param texts: A mapping of file paths and their contents that was already
+        read or rendered in memory.
+    :param jobs: A number of the worker threads.
+
+    :rtype: dict[Path, FileEdit]
+    """
+    groups: dict[Path, list[ConfFile]] = {}
+    for f in files:
+        groups.setdefault(f.path, []).append(f)
+
+    texts = texts or {}
+    items: list[tuple[Any, ...]] = [
+        (path, confs, current_version, new_version, context, texts.get(path))
+        for path, confs in groups.items()
+    ]
+    return dict(
+        zip(groups, map_files(plan_file_edit, items, jobs=jobs), strict=True)
+    )
+
+
+def write_file_edit(
+    path: Path,
+    edit: str | StreamEdit,
+    dry_run: bool = False,
+) -> None:
+    if dry_run:
+        logger.debug(f"[{path}] Dry run enabled; not writing file.")
+        return
+    if isinstance(edit, StreamEdit):
+        stream_replace(path, list(edit.pairs))
+    else:
+        write_atomic(path, edit)
+    logger.debug(f"[{path}] Wrote updated content")
+
+
+def write_version_edits(
+    plan: dict[Path, FileEdit],
+    dry_run: bool = False,
+    jobs: int = 1,
+) -> list[Path]:
+    """Write the new contents of an edit plan that changed, each file with
+    one atomic write.
+
+    :param plan: An edit plan from the ``plan_version_edits`` function.
+    :param dry_run: A dry run flag that does not write any file.
+    :param jobs: A number of the worker threads.
+
+    :rtype: list[Path]
+    :return: A list of the file paths that changed.
+    """
+    items: list[tuple[Any, ...]] = []
+    for path, edit in plan.items():
+        if isinstance(edit, StreamEdit):
+            if edit.changed:
+                items.append((path, edit, dry_run))
+        elif edit[0] != edit[1]:
+            items.append((path, edit[1], dry_run))
+    map_files(write_file_edit, items, jobs=jobs)
+    return [item[0] for item in items]
+
+
+def restore_version_edits(
+    plan: dict[Path, FileEdit],
+    changed: list[Path],
+    originals: dict[Path, str | None] | None = None,
+) -> list[Path]:
+    """Write back the original contents of the changed files of an edit plan,
+    like after the commit of the new version failed. The streamed files do not
+    keep their original contents in memory, so they are not restored.
+
+    :param plan: An edit plan from the ``plan_version_edits`` function.
+    :param changed: A list of the file paths that were written.
+    :param originals: A mapping of the file paths and their contents on disk
+        if the plan started from the other texts, or None for the files that
+        did not exist.
+
+    :rtype: list[Path]
+    :return: A list of the file paths that still have the new version.
+    """
+    originals = originals or {}
+    kept: list[Path] = []
+    for path in changed:
+        if path in originals:
+            if (text := originals[path]) is None:
+                path.unlink(missing_ok=True)
+            else:
+                write_atomic(path, text)
+        elif isinstance(edit := plan[path], StreamEdit):
+            kept.append(path)
+            continue
+        else:
+            write_atomic(path, edit[0])
+        logger.debug(f"[{path}] Restored original content")
+    return kept
 
 
 def commit_and_tag_if_required(
@@ -178,8 +487,8 @@ def commit_and_tag_if_required(
             f'{"Would add" if not do_commit else "Adding"} changes in file '
             f"{path!r} to {vcs.__name__}"
         )
-        if do_commit:
-            vcs.add_path(path)
+    if do_commit:
+        vcs.add_paths([str(path) for path in commit_files])
 
     context: dict[str, Any] = {
         "current_version": current_version_str,
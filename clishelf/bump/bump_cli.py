@@ -9,11 +9,11 @@ import click
 from .bump import (
     assemble_context,
     bump_version_by_part_or_literal,
-    check_files_contain_version,
     commit_and_tag_if_required,
     determine_vcs_dirty,
     determine_vcs_usability,
-    replace_version_in_files,
+    plan_version_edits,
+    write_version_edits,
 )
 from .conf import load_config, save_config
 from .utils import ConfFile
@@ -116,6 +116,13 @@ def cli(ctx: click.Context, verbose: int, show_list: bool):
     default="",
     help="Extra args passed to commit command (multiple lines allowed)",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of threads that verify and replace the files",
+)
 @click.option("--parse", default=None, help="Override parse regex")
 @click.option(
     "--serialize",
@@ -142,6 +149,7 @@ def bump(
     tag_message: str,
     message: str,
     commit_args: str,
+    jobs: int,
     parse: Optional[str],
     serialize: Optional[str],
     search: Optional[str],
@@ -219,8 +227,15 @@ def bump(
     # assemble context
     context = assemble_context()
 
+    # NOTE: The dirty check refreshes the index, so it runs only when the
+    #   version will be committed or tagged.
+    do_commit: bool = (
+        commit if commit is not None else defaults.get("commit", False)
+    )
+    do_tag: bool = tag if tag is not None else defaults.get("tag", False)
+
     # determine VCS usability / defaults merging like original
-    vcs_info = determine_vcs_usability()
+    vcs_info = determine_vcs_usability(dirty=do_commit or do_tag)
     context.update(vcs_info)
 
     # NOTE: Determine new version. If new_version_str is None here,
@@ -229,13 +244,13 @@ def bump(
         vc, current_version, part, new_version, context
     )
 
-    # NOTE: verify each file contains the current version
-    check_files_contain_version(final_files, current_version, context)
-
-    # NOTE: replace in files
-    replace_version_in_files(
-        final_files, current_version, new_version_str, dry_run, context
+    # NOTE: Verify each file contains the current version and replace it in
+    #   memory, so a file with many sections is read and written only once.
+    #   All files are verified before any of them is written.
+    plan = plan_version_edits(
+        final_files, current_version, new_version_str, context, jobs=jobs
     )
+    write_version_edits(plan, dry_run=dry_run, jobs=jobs)
 
     try:
         save_config(
@@ -245,14 +260,14 @@ def bump(
         logger.info(f"Unable to update config file: {exc}")
 
     # NOTE: Commit and tag if requested
-    selected_vcs = determine_vcs_dirty(allow_dirty=allow_dirty)
+    selected_vcs = determine_vcs_dirty(
+        allow_dirty=allow_dirty, check=do_commit or do_tag
+    )
 
     # Build args mapping to satisfy commit_and_tag_if_required
     args_map: dict[str, Any] = {
-        "commit": (
-            commit if commit is not None else defaults.get("commit", False)
-        ),
-        "tag": tag if tag is not None else defaults.get("tag", False),
+        "commit": do_commit,
+        "tag": do_tag,
         "sign_tags": (
             sign_tags
             if sign_tags is not None
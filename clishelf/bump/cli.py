@@ -5,6 +5,9 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import logging
 import os
 import re
@@ -19,9 +22,20 @@ import click
 
 from ..emoji import emojize
 from ..git import CommitLog
+from ..profiling import phase
+from ..runner import runner
 from ..settings import BumpVerConf
 from ..utils import Level, load_config, make_color
+from .bump import (
+    assemble_context,
+    bump_version_by_part_or_literal,
+    plan_version_edits,
+    restore_version_edits,
+    write_version_edits,
+)
 from .bump_cli import bump as bump_cli
+from .configs import get_bump_configs
+from .utils import ConfFile
 
 cli_vs: click.Command
 
@@ -32,6 +46,7 @@ UTF8: str = "utf-8"
 HEAD: str = "HEAD"
 CHANGELOG_HEADER: str = "# Changelogs"
 CHANGELOG_LATEST: str = "## Latest Changes"
+CHANGELOG_STATE: str = "clishelf/changelog.json"
 LINESEP: str = os.linesep
 
 
@@ -39,11 +54,13 @@ def map_group_commit_logs(
     *,
     all_tags: bool = False,
     is_dt: bool = False,
+    rev_range: Optional[str] = None,
 ) -> TagGroupCommitLog:
     """Mapping Group to the getting commit logs function.
 
     :param all_tags: All tags flag.
     :param is_dt:
+    :param rev_range: A revision range that want to get the commit logs.
 
     :rtype: GroupCommitLog
     """
@@ -57,6 +74,7 @@ def map_group_commit_logs(
             r"^Merge",
         ],
         is_dt=is_dt,
+        rev_range=rev_range,
     ):
         tag_group_logs[log.refs][log.msg.mtype].append(log)
 
@@ -149,12 +167,33 @@ def write_group_log(
         writer.write(LINESEP)
 
 
+def write_changed(file: Union[str, Path], content: str) -> bool:
+    """Write a content to the file only if it is not the same with the current
+    content, so the modified time of the file does not change.
+
+    :param file: A file path that want to write.
+    :param content: A content string that want to write.
+
+    :rtype: bool
+    :return: True if the file was written.
+    """
+    path: Path = Path(file)
+    if path.exists():
+        with path.open(mode="r", encoding=UTF8, newline="") as f:
+            if f.read() == content:
+                return False
+    with path.open(mode="w", encoding=UTF8, newline="") as f:
+        f.write(content)
+    return True
+
+
 def create_changelog(
     file: Union[str, Path],
     *,
     all_tags: bool = False,
     refresh: bool = False,
     is_dt: bool = False,
+    incremental: bool = False,
 ) -> None:
     """Create Changelog file that generate from Git Log command.
 
@@ -162,43 +201,261 @@ def create_changelog(
     :param all_tags:
     :param refresh:
     :param is_dt:
+    :param incremental: An incremental flag that re-render only the sections
+        that changed since the previous run.
     """
-    group_logs: TagGroupCommitLog = map_group_commit_logs(
-        all_tags=all_tags,
-        is_dt=is_dt,
+    if incremental:
+        create_changelog_incremental(file, refresh=refresh, is_dt=is_dt)
+        return
+
+    content: str = render_changelog(
+        file, all_tags=all_tags, refresh=refresh, is_dt=is_dt
+    )
+    with phase("changelog.write"):
+        write_changed(file, content)
+
+
+def render_changelog(
+    file: Union[str, Path],
+    *,
+    all_tags: bool = False,
+    refresh: bool = False,
+    is_dt: bool = False,
+) -> str:
+    """Return the content of the changelog file that generate from Git Log
+    command without writing it.
+
+    :param file:
+    :param all_tags:
+    :param refresh:
+    :param is_dt:
+
+    :rtype: str
+    """
+    from ..tags import version_key
+
+    with phase("changelog.logs"):
+        group_logs: TagGroupCommitLog = map_group_commit_logs(
+            all_tags=all_tags,
+            is_dt=is_dt,
+        )
+    tags: list[str] = sorted(
+        filter(lambda t: t != HEAD, group_logs.keys()),
+        key=lambda t: version_key(t, is_dt),
+        reverse=True,
     )
-    tags: list[str] = list(filter(lambda t: t != HEAD, group_logs.keys()))
     prev_change: Iterator[str] = get_changelog(file, tags=tags, refresh=refresh)
 
-    with Path(file).open(mode="w", encoding=UTF8, newline="") as writer:
-        skip_line: bool = False
-        for line in prev_change:
-            if line.startswith(CHANGELOG_LATEST):
+    writer = io.StringIO(newline="")
+    skip_line: bool = False
+    for line in prev_change:
+        if line.startswith(CHANGELOG_LATEST):
+
+            # NOTE: Start write group log for the HEAD refs.
+            write_group_log(
+                writer,
+                group_logs.get(HEAD, {}),
+                tag_value="Latest Changes",
+            )
+            skip_line: bool = True
 
-                # NOTE: Start write group log for the HEAD refs.
+        elif m := re.match(rf"^##\s({BumpVerConf.get_regex(is_dt)})", line):
+            get_tag: str = m.group(1)
+            if get_tag in tags:  # pragma: no cov
                 write_group_log(
                     writer,
-                    group_logs.get(HEAD, {}),
-                    tag_value="Latest Changes",
+                    group_logs[get_tag],
+                    tag_value=get_tag,
                 )
-                skip_line: bool = True
-
-            elif m := re.match(rf"^##\s({BumpVerConf.get_regex(is_dt)})", line):
-                get_tag: str = m.group(1)
-                if get_tag in tags:  # pragma: no cov
-                    write_group_log(
-                        writer,
-                        group_logs[get_tag],
-                        tag_value=get_tag,
-                    )
-                    skip_line = True
-                else:
-                    skip_line = False
-            elif line.startswith("## "):
+                skip_line = True
+            else:
                 skip_line = False
+        elif line.startswith("## "):
+            skip_line = False
+
+        if not skip_line:
+            writer.write(line + LINESEP)
+    return writer.getvalue()
+
+
+def get_tag_ranges(is_dt: bool = False) -> list[tuple[str, str]]:
+    """Return the list of pair of a version tag and its revision range from the
+    highest version tag that reachable from the HEAD. The range of a tag starts
+    at the tag of the previous version, so the tags that were created out of
+    order do not split the sections by their positions on the history.
+
+    :param is_dt: A datetime mode flag.
+
+    :rtype: list[tuple[str, str]]
+    """
+    from ..tags import get_tag_index
+
+    return [
+        (tag.version, rev_range)
+        for tag, rev_range in get_tag_index(is_dt, merged=HEAD).ranges()
+    ]
+
+
+def get_range_group_logs(
+    rev_range: str,
+    is_dt: bool = False,
+) -> GroupCommitLog:
+    """Return the group commit logs of all commits in a revision range.
+
+    :param rev_range: A revision range that want to get the commit logs.
+    :param is_dt: A datetime mode flag.
+
+    :rtype: GroupCommitLog
+    """
+    rs: dict[str, list[CommitLog]] = defaultdict(list)
+    for group_logs in map_group_commit_logs(
+        rev_range=rev_range, is_dt=is_dt
+    ).values():
+        for group, logs in group_logs.items():
+            rs[group].extend(logs)
+    return {
+        k: sorted(v, key=lambda x: x.date, reverse=True) for k, v in rs.items()
+    }
+
+
+def split_changelog(
+    content: str,
+    is_dt: bool = False,
+) -> tuple[str, list[tuple[Optional[str], str]]]:
+    """Split the content of changelog file to its header and the list of pair
+    of a section name and its raw text. The section name will be HEAD for the
+    latest changes section, a tag for a version section, or None for the
+    others.
+
+    :param content: A content of the changelog file.
+    :param is_dt: A datetime mode flag.
+
+    :rtype: tuple[str, list[tuple[Optional[str], str]]]
+    """
+    header: list[str] = []
+    sections: list[tuple[Optional[str], list[str]]] = []
+    for line in content.splitlines(keepends=True):
+        if line.startswith(CHANGELOG_LATEST):
+            sections.append((HEAD, [line]))
+        elif line.startswith("## "):
+            m = re.match(rf"^##\s({BumpVerConf.get_regex(is_dt)})", line)
+            sections.append((m.group(1) if m else None, [line]))
+        elif sections:
+            sections[-1][1].append(line)
+        else:
+            header.append(line)
+    return "".join(header), [(name, "".join(lines)) for name, lines in sections]
+
+
+def changelog_config_hash() -> str:
+    """Return the hash of config values that the rendered changelog sections
+    depend on.
+
+    :rtype: str
+    """
+    from ..index import config_hash
+
+    return hashlib.sha1(
+        json.dumps(
+            [config_hash(), load_config().get("version", {})],
+            sort_keys=True,
+            default=str,
+        ).encode(UTF8)
+    ).hexdigest()
+
+
+def create_changelog_incremental(
+    file: Union[str, Path],
+    *,
+    refresh: bool = False,
+    is_dt: bool = False,
+) -> None:
+    """Create Changelog file that re-render only the latest changes section and
+    the tag sections that its revision range was moved since the previous run.
+    The other sections are kept byte-for-byte, and the revision range of each
+    rendered section keeps on the state file under the git directory.
+
+    :param file: A changelog file path.
+    :param refresh: A refresh flag that re-render all tag sections.
+    :param is_dt: A datetime mode flag.
+    """
+    from ..git import get_git_dir
+
+    path: Path = Path(file)
+    state_file: Path = get_git_dir() / CHANGELOG_STATE
+    try:
+        state: dict[str, Any] = json.loads(state_file.read_text(encoding=UTF8))
+    except (OSError, ValueError):
+        state = {}
+
+    key: str = str(path.absolute())
+    cf_hash: str = changelog_config_hash()
+    prev: dict[str, Any] = state.get(key, {})
+    rendered: dict[str, str] = (
+        {}
+        if refresh or prev.get("config") != cf_hash
+        else prev.get("sections", {})
+    )
+    ranges: list[tuple[str, str]] = get_tag_ranges(is_dt)
+    tag_ranges: dict[str, str] = dict(ranges)
+
+    if refresh or not path.exists():
+        header: str = f"{CHANGELOG_HEADER}{LINESEP}{LINESEP}"
+        sections: list[tuple[Optional[str], str]] = [(HEAD, "")]
+    else:
+        with path.open(mode="r", encoding=UTF8, newline="") as f:
+            header, sections = split_changelog(f.read(), is_dt=is_dt)
+
+    # NOTE: Add the new tags that newer than all tag sections on the file
+    #   after the latest changes section.
+    exists: set[Optional[str]] = {name for name, _ in sections}
+    news: list[tuple[Optional[str], str]] = []
+    for tag, _ in ranges:
+        if tag in exists:
+            break
+        news.append((tag, ""))
+    if news:
+        pos: int = next(
+            (i + 1 for i, (name, _) in enumerate(sections) if name == HEAD), 0
+        )
+        sections[pos:pos] = news
+
+    writer = io.StringIO(newline="")
+    writer.write(header)
+    sections_state: dict[str, str] = {}
+    for name, text in sections:
+        if name == HEAD:
+            write_group_log(
+                writer,
+                get_range_group_logs(
+                    (
+                        f"{ranges[0][1].rpartition('..')[2]}..{HEAD}"
+                        if ranges
+                        else HEAD
+                    ),
+                    is_dt=is_dt,
+                ),
+                tag_value="Latest Changes",
+            )
+        elif name in tag_ranges:
+            sections_state[name] = tag_ranges[name]
+            if text and rendered.get(name) == tag_ranges[name]:
+                writer.write(text)
+            else:
+                write_group_log(
+                    writer,
+                    get_range_group_logs(tag_ranges[name], is_dt=is_dt),
+                    tag_value=name,
+                )
+        else:
+            writer.write(text)
+
+    with phase("changelog.write"):
+        write_changed(file, writer.getvalue())
 
-            if not skip_line:
-                writer.write(line + LINESEP)
+    state[key] = {"config": cf_hash, "sections": sections_state}
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    write_changed(state_file, json.dumps(state, indent=2, sort_keys=True))
 
 
 def write_bump_file(
@@ -231,6 +488,111 @@ def write_bump_file(
             f.write(f"\n[bumpversion:file:{file}]\n")
 
 
+def bump_version(
+    action: str,
+    file: str,
+    changelog_file: str,
+    changelog_ignore: bool = False,
+    dry_run: bool = False,
+    version: int = 1,
+    *,
+    is_dt: bool = False,
+) -> str:
+    """Bump version in process with the version configs that build from the
+    version config, so it does not write any bump config file. It applies the
+    changelog and the version edits in memory, writes the changed files, and
+    makes only one commit of them.
+
+    :param action: A part of version that want to bump.
+    :param file: A version file path.
+    :param changelog_file: A changelog file path.
+    :param changelog_ignore: A flag that skip writing the changelog logs.
+    :param dry_run: A flag that does not write or commit anything.
+    :param version: A version of the bump config.
+    :param is_dt: A datetime mode flag
+
+    :rtype: str
+    :return: A new version.
+    """
+    version_conf, changelog_conf = get_bump_configs(version, is_dt=is_dt)
+    current: str = current_version(file, is_dt=is_dt)
+    context: dict[str, Any] = assemble_context()
+    if is_dt:
+        new: str = BumpVerConf.get_dt_version(action, current)
+    else:
+        _, _, new = bump_version_by_part_or_literal(
+            version_conf, current, action, None, context
+        )
+
+    files: list[ConfFile] = [ConfFile(file, version_conf)]
+    files.extend(
+        ConfFile(f, version_conf)
+        for f in load_config().get("version", {}).get("files", [])
+    )
+    changelog: ConfFile = ConfFile(changelog_file, changelog_conf)
+
+    # NOTE: Apply all edits in memory first, so a file that does not contain
+    #   the current version stops the bump before anything was written.
+    texts: dict[Path, str] = {}
+    originals: dict[Path, Optional[str]] = {}
+    if not changelog_ignore:
+        with phase("bump.changelog"):
+            try:
+                originals[changelog.path] = changelog.path.read_text(UTF8)
+            except FileNotFoundError:
+                originals[changelog.path] = None
+            texts[changelog.path] = render_changelog(changelog.path)
+    with phase("bump.bump"):
+        plan = plan_version_edits(
+            [changelog, *files], current, new, context, texts=texts
+        )
+
+    click.echo(f"Bump version {current} -> {new}")
+    with phase("bump.write"):
+        changed: list[Path] = write_version_edits(plan, dry_run=dry_run)
+    if dry_run:
+        for path in changed:
+            click.echo(f"Would update {path}")
+        return new
+
+    paths: list[str] = list(map(str, changed))
+    with phase("bump.commit"):
+        try:
+            runner.check(["git", "add", "--", *paths], stderr=subprocess.STDOUT)
+            runner.check(
+                [
+                    "git",
+                    "commit",
+                    "-m",
+                    BumpVerConf.msg.format(
+                        current_version=current, new_version=new
+                    ),
+                    "--no-verify",
+                ],
+                stderr=subprocess.STDOUT,
+            )
+        except subprocess.CalledProcessError as err:
+            # NOTE: Unstage and restore the written files, so the failed commit
+            #   does not leave the new version on the working tree.
+            runner.run(
+                ["git", "reset", "-q", "--", *paths],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            kept: list[Path] = restore_version_edits(plan, changed, originals)
+            raise click.ClickException(
+                f"Failed to commit the bump {current} -> {new}:\n"
+                f"{err.output.decode(UTF8, 'replace').strip()}\n"
+                + (
+                    "These files still have the new version: "
+                    f"{', '.join(map(str, kept))}"
+                    if kept
+                    else "All files were restored."
+                )
+            ) from err
+    return new
+
+
 def bump2version(
     action: str,
     file: str,
@@ -262,32 +624,35 @@ def bump2version(
 
     # Start writing ``.bump2version.cfg`` file on current path.
     click.echo("Start write '.bump2version.cfg' config file ...")
-    write_bump_file(
-        param={
-            "changelog": changelog_file,
-            "version": current_version(file, is_dt=is_dt),
-            "action": action,
-            "file": file,
-        },
-        version=version,
-        is_dt=is_dt,
-    )
+    with phase("bump.config"):
+        write_bump_file(
+            param={
+                "changelog": changelog_file,
+                "version": current_version(file, is_dt=is_dt),
+                "action": action,
+                "file": file,
+            },
+            version=version,
+            is_dt=is_dt,
+        )
 
     if not changelog_ignore:
-        create_changelog(file=changelog_file)
+        with phase("bump.changelog"):
+            create_changelog(file=changelog_file)
 
     # COMMIT: commit add config and edit changelog file.
-    subprocess.run(["git", "add", "-A"])
-    subprocess.run(
-        [
-            "git",
-            "commit",
-            "-m",
-            "build: add bump2version config file",
-            "--no-verify",
-        ],
-        stdout=subprocess.DEVNULL,
-    )
+    with phase("bump.commit"):
+        runner.run(["git", "add", "-A"])
+        runner.run(
+            [
+                "git",
+                "commit",
+                "-m",
+                "build: add bump2version config file",
+                "--no-verify",
+            ],
+            stdout=subprocess.DEVNULL,
+        )
 
     click.echo("Running the `bump2version` cli with that config file ...")
     # ARCHIVE: Keep the old code version.
@@ -302,15 +667,16 @@ def bump2version(
 
     try:
         ctx = click.get_current_context()
-        ctx.invoke(
-            bump_cli,
-            part=action,
-            dry_run=dry_run,
-            commit_args="--no-verify",
-            allow_dirty=True,
-        )
+        with phase("bump.bump"):
+            ctx.invoke(
+                bump_cli,
+                part=action,
+                dry_run=dry_run,
+                commit_args="--no-verify",
+                allow_dirty=True,
+            )
     except Exception as err:
-        subprocess.run(
+        runner.run(
             ["git", "reset", "--hard", "HEAD~1"], stdout=subprocess.DEVNULL
         )
         logging.error(f"Raise error from click.invoke: {err}")
@@ -325,7 +691,7 @@ def bump2version(
     #     + (["--list", "--dry-run"] if dry_run else [])
     # )
 
-    subprocess.run(
+    runner.run(
         [
             "git",
             "reset",
@@ -343,33 +709,51 @@ def bump2version(
     with Path(".git/COMMIT_EDITMSG").open(encoding=UTF8) as f_msg:
         raw_msg = f_msg.read().splitlines()
 
-    subprocess.run(["git", "add", "-A"], stderr=subprocess.DEVNULL)
-    subprocess.run(
-        [
-            "git",
-            "commit",
-            "--amend",
-            "-m",
-            raw_msg[0],
-            "--no-verify",
-        ],
-        stderr=subprocess.DEVNULL,
-    )
+    with phase("bump.amend"):
+        runner.run(["git", "add", "-A"], stderr=subprocess.DEVNULL)
+        runner.run(
+            [
+                "git",
+                "commit",
+                "--amend",
+                "-m",
+                raw_msg[0],
+                "--no-verify",
+            ],
+            stderr=subprocess.DEVNULL,
+        )
 
 
-def current_version(file: str, *, is_dt: bool = False) -> str:
+def current_version(
+    file: str,
+    *,
+    is_dt: bool = False,
+    ref: Optional[str] = None,
+) -> str:
     """Return the current version.
 
     :param file:
     :param is_dt:
+    :param ref: A git revision that want to read the file at, like ``HEAD~1``
+        or a tag. It reads the file from the working tree if it does not set.
 
     :rtype: str
     """
-    with Path(file).open(encoding=UTF8) as f:
-        if is_dt and (search_dt := re.search(BumpVerConf.regex_dt, f.read())):
-            return search_dt[0]
-        elif search := re.search(BumpVerConf.regex, f.read()):
-            return search[0]
+    if ref:
+        from ..runner import get_cat_file
+
+        name: str = file if file.startswith(("./", "../")) else f"./{file}"
+        if (obj := get_cat_file().get(f"{ref}:{name}")) is None:
+            raise FileNotFoundError(f"{file} does not exist at {ref}.")
+        content: str = obj.text(UTF8)
+    else:
+        with Path(file).open(encoding=UTF8) as f:
+            content = f.read()
+
+    if is_dt and (search_dt := re.search(BumpVerConf.regex_dt, content)):
+        return search_dt[0]
+    elif search := re.search(BumpVerConf.regex, content):
+        return search[0]
     raise NotImplementedError(f"{file} does not implement version value.")
 
 
@@ -382,9 +766,19 @@ def cli_vs():
 @cli_vs.command()
 @click.option("-f", "--file", type=click.Path(exists=True))
 @click.option("-n", "--new", is_flag=True)
+@click.option(
+    "-i",
+    "--incremental",
+    is_flag=True,
+    help=(
+        "If True, it will re-render only the latest changes and the tag "
+        "sections that changed since the previous run."
+    ),
+)
 def changelog(
     file: Optional[str],
     new: bool = False,
+    incremental: bool = False,
 ) -> NoReturn:  # pragma: no cov
     """Make a changelog file that generate form previous commits."""
     if not file:
@@ -392,6 +786,9 @@ def changelog(
             load_config().get("version", {}).get("changelog", None)
             or "CHANGELOG.md"
         )
+    if incremental:
+        create_changelog(file, refresh=new, incremental=True)
+        sys.exit(0)
     if new:
         create_changelog(file, all_tags=True, refresh=new)
         sys.exit(0)
@@ -403,17 +800,33 @@ def changelog(
 @click.option(
     "-f",
     "--file",
-    type=click.Path(exists=True),
+    type=click.Path(),
     help="The contain version file that able to search with regex.",
 )
-def current(file: str) -> NoReturn:  # pragma: no cov
+@click.option(
+    "-r",
+    "--ref",
+    type=click.STRING,
+    default=None,
+    help="A git revision that want to read the version file at.",
+)
+def current(
+    file: str,
+    ref: Optional[str] = None,
+) -> NoReturn:  # pragma: no cov
     """Return Current Version that read from ``__about__`` by default."""
     if not file:
         file: str = load_config().get("version", {}).get("version", None) or (
             f"./{load_config().get('project', {}).get('name', 'unknown')}"
             f"/__about__.py"
         )
-    click.echo(current_version(file))
+    try:
+        click.echo(current_version(file, ref=ref))
+    except FileNotFoundError as err:
+        raise click.BadParameter(
+            f"{file} does not exist{f' at {ref}' if ref else ''}.",
+            param_hint="'-f' / '--file'",
+        ) from err
     sys.exit(0)
 
 
@@ -459,6 +872,14 @@ def current(file: str) -> NoReturn:  # pragma: no cov
     is_flag=True,
     help="If True, it will pass --dry-run option to bump2version",
 )
+@click.option(
+    "--legacy",
+    is_flag=True,
+    help=(
+        "If True, it will bump with the `.bumpversion.cfg` config file and "
+        "the bump2version cli like the previous versions."
+    ),
+)
 def bump(
     action: str,
     file: Optional[str] = None,
@@ -467,6 +888,7 @@ def bump(
     version: int = 1,
     ignore_changelog: bool = False,
     dry_run: bool = False,
+    legacy: bool = False,
 ) -> NoReturn:  # pragma: no cov
     """Bump package version with a next tag value with an input action.
 
@@ -484,6 +906,8 @@ def bump(
     :type ignore_changelog: boolean
     :param dry_run: Dry run the bumpversion command if set be True.
     :type dry_run: boolean
+    :param legacy: Bump with the bump2version config file if set be True.
+    :type legacy: boolean
     """
     vs_conf: dict[str, Any] = load_config().get("version", {})
     if not file:
@@ -511,7 +935,7 @@ def bump(
             click.echo(make_color(emojize(msg), Level.INFO))
 
     # NOTE: Start bumping version.
-    bump2version(
+    (bump2version if legacy else bump_version)(
         action,
         file,
         changelog_file,
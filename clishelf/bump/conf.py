@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import glob
 import logging
+import os
 import re
+import subprocess
 import warnings
 from configparser import NoOptionError, RawConfigParser
 from pathlib import Path
@@ -33,6 +35,103 @@ RE_DETECT_SECTION_TYPE: Pattern[str] = re.compile(
 )
 
 
+def compile_glob(pattern: str) -> Pattern[str]:
+    """Return the regular expression of a glob pattern with the same rules of
+    the ``glob.glob`` function with the recursive flag, so ``*`` and ``?`` do
+    not match the separator or the leading dot of a name, and the ``**``
+    component matches any number of directories.
+
+    :param pattern: A glob pattern with the ``/`` separators.
+
+    :rtype: Pattern[str]
+    """
+    parts: list[str] = []
+    names: list[str] = pattern.split("/")
+    for i, name in enumerate(names):
+        last: bool = i == len(names) - 1
+        if name == "**":
+            parts.append(r"(?:(?!\.)[^/]+/)*")
+            if last:
+                parts.append(r"(?!\.)[^/]+")
+            continue
+        regex: str = "" if name.startswith(".") else r"(?!\.)"
+        j: int = 0
+        while j < len(name):
+            c: str = name[j]
+            j += 1
+            if c == "*":
+                regex += "[^/]*"
+            elif c == "?":
+                regex += "[^/]"
+            elif c == "[" and (end := name.find("]", j + 1)) != -1:
+                chars: str = name[j:end].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                elif chars.startswith("^"):
+                    chars = "\\" + chars
+                regex += f"[{chars}]"
+                j = end + 1
+            else:
+                regex += re.escape(c)
+        parts.append(regex if last else f"{regex}/")
+    return re.compile("".join(parts) + r"\Z")
+
+
+def get_tracked_files() -> list[str]:
+    """Return the tracked file paths under the current directory from one
+    ``git ls-files`` command. The output is memoised on the runner session,
+    so all glob sections of a config share the listing.
+
+    :raise CalledProcessError: If the current directory is not in a git
+        repository.
+
+    :rtype: list[str]
+    """
+    from ..runner import runner
+
+    output: bytes = runner.output(
+        ["git", "ls-files", "-z"], cache=True, stderr=subprocess.DEVNULL
+    )
+    return [os.fsdecode(path) for path in output.split(b"\0") if path]
+
+
+def expand_glob(pattern: str, tracked: list[str] | None = None) -> list[str]:
+    """Return the file paths that match a glob pattern. It matches the pattern
+    against the tracked files of the repository instead of walking the working
+    tree, and it walks the file system only outside a repository or for the
+    pattern that points out of the current directory. So, the untracked files
+    and the files inside the submodules do not match inside a repository.
+
+    :param pattern: A glob pattern.
+    :param tracked: A list of the tracked file paths.
+
+    :rtype: list[str]
+    """
+    norm: str = pattern.replace(os.sep, "/")
+    if tracked is None or os.path.isabs(pattern) or ".." in norm.split("/"):
+        return glob.glob(pattern, recursive=True)
+
+    matcher: Pattern[str] = compile_glob(norm.removeprefix("./"))
+    rs: list[str] = [
+        path for path in tracked if matcher.match(path) and os.path.isfile(path)
+    ]
+    # NOTE: The untracked files and the files inside the submodules are not
+    #   matched, so it counts them only if the debug log was enabled because
+    #   it walks the working tree.
+    if logger.isEnabledFor(logging.DEBUG):
+        matched: set[str] = {os.path.normpath(path) for path in rs}
+        if skipped := [
+            path
+            for path in glob.glob(pattern, recursive=True)
+            if os.path.isfile(path) and os.path.normpath(path) not in matched
+        ]:
+            logger.debug(
+                f"Glob {pattern!r} skipped {len(skipped)} untracked files, "
+                f"like {skipped[0]!r}."
+            )
+    return rs
+
+
 def _read_toml_file(path: Path) -> dict[str, Any]:
     with path.open("rb") as f:
         return tomllib.load(f)
@@ -183,6 +282,8 @@ def load_config(
     # NOTE: build part_configs and files
     part_configs: dict[str, Any] = {}
     files: list[ConfFile] = []
+    tracked: list[str] | None = None
+    listed: bool = False
 
     # iterate sections in raw data (toml keys or legacy-named sections)
     for section_key, section_value in raw.items():
@@ -244,7 +345,13 @@ def load_config(
 
             version_config = VersionConfig(**section_config)
             if gd.get("file") == "glob":
-                for fn in glob.glob(filename, recursive=True):
+                if not listed:
+                    listed = True
+                    try:
+                        tracked = get_tracked_files()
+                    except (subprocess.CalledProcessError, OSError):
+                        logger.info("Fall back to glob the working tree.")
+                for fn in expand_glob(filename, tracked):
                     files.append(ConfFile(fn, version_config))
             else:
                 files.append(ConfFile(filename, version_config))
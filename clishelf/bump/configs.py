@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from ..settings import BumpVerConf
+from .version_part import ConfiguredPartConf, PartConf, VersionConfig
+
+
+def get_part_configs(is_dt: bool = False) -> dict[str, PartConf]:
+    """Return the part configs of the configured parts, like the pre-release
+    kind. The datetime mode does not have any configured part.
+
+    :param is_dt: A datetime mode flag.
+
+    :rtype: dict[str, PartConf]
+    """
+    if is_dt:
+        return {}
+    return {
+        part: ConfiguredPartConf(
+            values=list(values),
+            optional_value="_",
+            optional_last=part in BumpVerConf.release_parts,
+            aliases=BumpVerConf.part_aliases.get(part),
+        )
+        for part, values in BumpVerConf.part_values.items()
+    }
+
+
+def get_bump_configs(
+    version: int = 1,
+    *,
+    is_dt: bool = False,
+) -> tuple[VersionConfig, VersionConfig]:
+    """Return the version configs of the version file and the changelog file
+    that are the same with the ``.bumpversion.cfg`` config file that the
+    ``write_bump_file`` function writes.
+
+    :param version: A version of the bump config.
+    :param is_dt: A datetime mode flag.
+
+    :rtype: tuple[VersionConfig, VersionConfig]
+    """
+    part_configs: dict[str, PartConf] = get_part_configs(is_dt)
+    parse: str = f"^{BumpVerConf.get_regex(is_dt)}"
+    serialize: list[str] = list(
+        BumpVerConf.serialize_dt if is_dt else BumpVerConf.serialize
+    )
+    return (
+        VersionConfig(
+            parse=parse,
+            serialize=serialize,
+            search="{current_version}",
+            replace="{new_version}",
+            part_configs=part_configs,
+        ),
+        VersionConfig(
+            parse=parse,
+            serialize=serialize,
+            search=BumpVerConf.changelog_search,
+            replace=BumpVerConf.get_changelog_replace(version),
+            part_configs=part_configs,
+        ),
+    )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from datetime import datetime
 from re import Match, Pattern
 
@@ -22,6 +22,10 @@ class PartIncrementer:
             "Part function should implement the bump method."
         )
 
+    def sort_key(self, value: str) -> tuple[int, str]:
+        """Return the key that order the values of this part."""
+        return 0, str(value)
+
 
 class IndependentIncrementer(PartIncrementer):
     """This is a class that provides an independent function for version parts.
@@ -130,6 +134,14 @@ class NumericIncrementer(PartIncrementer):
         bumped_numeric: str = str(int(numeric) + 1)
         return f"{prefix}{bumped_numeric}{suffix}"
 
+    def sort_key(self, value: str) -> tuple[int, str]:
+        """Return the key that order the values by their numeric portion, so
+        ``r10`` is greater than ``r9``.
+        """
+        if match := self.FIRST_NUMERIC.search(value):
+            return int(match.group(2)), value
+        return -1, value
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(first_value={self.first_value!r})"
 
@@ -143,6 +155,12 @@ class ValuesIncrementer(PartIncrementer):
         optional_value (str | int):
             The optional fallback value (defaults to the first value).
         first_value: The starting value.
+        optional_last (bool, default False):
+            A flag that sorts the optional value after all the values, like
+            a release after its pre-release kinds.
+        aliases (Mapping[str, str] | None):
+            The mapping of the other spellings of the values that the parse
+            regex accepts, like ``alpha`` for ``a``, to their values.
 
     Raises:
         ValueError: If any provided value is invalid or missing from the list.
@@ -163,11 +181,16 @@ class ValuesIncrementer(PartIncrementer):
         optional_value: str | int | None = None,
         first_value: str | int | None = None,
         independent: bool = False,
+        optional_last: bool = False,
+        aliases: Mapping[str, str] | None = None,
     ) -> None:
         if not values:
             raise ValueError("Version part values cannot be empty.")
 
         self._values: list[str] = list(values)
+        self._index: dict[str, int] = {
+            str(v): i for i, v in reversed(list(enumerate(self._values)))
+        }
 
         if optional_value is None:
             optional_value = values[0]
@@ -188,6 +211,8 @@ class ValuesIncrementer(PartIncrementer):
 
         self.independent = independent
         self.always_increment = False
+        self.optional_last: bool = optional_last
+        self.aliases: dict[str, str] = dict(aliases or {})
 
     def bump(self, value: str | int) -> str | int:
         """Advance to the next value in the list.
@@ -195,6 +220,7 @@ class ValuesIncrementer(PartIncrementer):
         Args:
             value (str | int): A string or integer value.
         """
+        value = self.aliases.get(str(value), value)
         try:
             return self._values[self._values.index(value) + 1]
         except IndexError as e:
@@ -203,6 +229,17 @@ class ValuesIncrementer(PartIncrementer):
                 f"{self._values} and cannot be bumped."
             ) from e
 
+    def sort_key(self, value: str | int) -> tuple[int, str]:
+        """Return the key that order the values by their position on the list,
+        and the aliases like their values. The unknown values
+        sort before all of them, and if the optional last flag is set, the
+        optional value sorts after all of them.
+        """
+        name: str = self.aliases.get(str(value), str(value))
+        if self.optional_last and name == str(self.optional_value):
+            return len(self._values), name
+        return self._index.get(name, -1), name
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}(values={self._values!r}, "
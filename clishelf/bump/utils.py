@@ -1,17 +1,25 @@
 from __future__ import annotations
 
 import logging
+import mmap
 import os
+import shutil
+import tempfile
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, BinaryIO
 
 if TYPE_CHECKING:
     from .version_part import VersionConfig
 
 logger = logging.getLogger(__name__)
 
+# NOTE: A file size that the configured file streams its content through mmap
+#   instead of reading it as a text, like the generated lock files.
+STREAM_THRESHOLD: int = 64 * 1024 * 1024
+STREAM_CHUNK: int = 1024 * 1024
+
 
 @dataclass
 class ConfFile:
@@ -50,24 +58,76 @@ class ConfFile:
                 f"Configured file '{self.path}' does not exist"
             )
 
+        if is_large(self.path):
+            search: str = self.format_search(current_version, context)
+            if not find_bytes(self.path, [search.encode("utf-8")])[0]:
+                raise self._missing(search)
+            return
+
         text: str = self.path.read_text(encoding="utf-8")
+        self.check_text(text, current_version, context)
+
+    def format_search(
+        self,
+        current_version: str,
+        context: dict[str, Any],
+    ) -> str:
+        """Return the search string of the current version."""
         search_template = self.version_config.search
 
         try:
             _ctx = context.copy() | {"current_version": current_version}
-            search = search_template.format(**_ctx)
+            return search_template.format(**_ctx)
         except Exception as err:
             logger.warning(f"Fallback search: {err}")
             # NOTE: fallback: try replacing {current_version} only
-            search = search_template.replace(
+            return search_template.replace(
                 "{current_version}", str(current_version)
             )
 
-        if search not in text:
-            raise ValueError(
-                f"File {self.path} does not contain expected search pattern: "
-                f"{search}"
+    def format_templates(
+        self,
+        current_version: str,
+        new_version: str,
+        context: dict[str, Any],
+    ) -> tuple[str, str]:
+        """Return the search and replace strings of the versions."""
+        search_template = self.version_config.search
+        replace_template = self.version_config.replace
+
+        try:
+            _ctx = context.copy() | {"current_version": current_version}
+            search = search_template.format(**_ctx)
+
+            _ctx = context.copy() | {"new_version": new_version}
+            replace = replace_template.format(**_ctx)
+        except Exception:
+            # NOTE: best-effort fallback
+            search = search_template.replace(
+                "{current_version}", current_version
             )
+            replace = replace_template.replace("{new_version}", new_version)
+        return search, replace
+
+    def _missing(self, search: str) -> ValueError:
+        return ValueError(
+            f"File {self.path} does not contain expected search pattern: "
+            f"{search}"
+        )
+
+    def check_text(
+        self,
+        text: str,
+        current_version: str,
+        context: dict[str, Any],
+    ) -> None:
+        """Confirm that the content of this file contains the templated search
+        string for current_version without reading the file.
+
+        Raises ValueError if not found.
+        """
+        if (search := self.format_search(current_version, context)) not in text:
+            raise self._missing(search)
 
     def replace(
         self,
@@ -83,49 +143,215 @@ class ConfFile:
           - Build `search` template from version_config.search.format(current_version=..., **context)
           - Build `replace` template from version_config.replace.format(new_version=..., **context)
           - Replace all occurrences (str.replace) in the file text.
+          - Stream the file through mmap if it is larger than the threshold.
         """
         if not self.path.exists():
             raise FileNotFoundError(
                 f"Configured file '{self.path}' does not exist"
             )
 
+        if is_large(self.path):
+            search, replace = self.format_templates(
+                current_version, new_version, context
+            )
+            if search == replace:
+                return
+            pairs = [(search.encode("utf-8"), replace.encode("utf-8"))]
+            if not find_bytes(self.path, [pairs[0][0]])[0]:
+                raise ValueError(
+                    f"File {self.path} does not contain search text '{search}'"
+                )
+            if not dry_run:
+                stream_replace(self.path, pairs)
+            return
+
         text = self.path.read_text(encoding="utf-8")
-        search_template = self.version_config.search
-        replace_template = self.version_config.replace
+        new_text = self.replace_text(
+            text, current_version, new_version, context
+        )
+        if new_text == text:
+            return
 
-        try:
-            _ctx = context.copy() | {"current_version": current_version}
-            search = search_template.format(**_ctx)
+        if dry_run:
+            logger.debug(f"[{self.path}] Dry run enabled; not writing file.")
+            return
 
-            _ctx = context.copy() | {"new_version": new_version}
-            replace = replace_template.format(**_ctx)
-        except Exception:
-            # NOTE: best-effort fallback
-            search = search_template.replace(
-                "{current_version}", current_version
-            )
-            replace = replace_template.replace("{new_version}", new_version)
+        self.path.write_text(new_text, encoding="utf-8")
+        logger.debug(f"[{self.path}] Wrote updated content")
+
+    def replace_text(
+        self,
+        text: str,
+        current_version: str,
+        new_version: str,
+        context: dict[str, Any],
+    ) -> str:
+        """Return the content of this file with the replaced version, so the
+        caller is able to apply the edit in memory before writing it.
+
+        Raises ValueError if the content does not contain the search text.
+        """
+        search, replace = self.format_templates(
+            current_version, new_version, context
+        )
 
         if search == replace:
             logger.debug(
                 f"[{self.path}] search == replace ({search}); skipping"
             )
-            return
+            return text
 
         if search not in text:
             raise ValueError(
                 f"File {self.path} does not contain search text '{search}'"
             )
 
-        new_text = text.replace(search, replace)
         logger.info(f"[{self.path}] Replace: {search} → {replace}")
+        return text.replace(search, replace)
 
-        if dry_run:
-            logger.debug(f"[{self.path}] Dry run enabled; not writing file.")
-            return
 
-        self.path.write_text(new_text, encoding="utf-8")
-        logger.debug(f"[{self.path}] Wrote updated content")
+def write_atomic(path: Path, text: str) -> None:
+    """Write a content to the temporary file on the same directory and rename
+    it to the path, so the reader never sees a half-written file. It keeps the
+    permission bits of the existing file, and it writes the target of a
+    symlink instead of replacing the link.
+
+    :param path: A file path that want to write.
+    :param text: A content string that want to write.
+    """
+    path = path.resolve()
+    fd, tmp = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    try:
+        with os.fdopen(fd, mode="w", encoding="utf-8") as f:
+            f.write(text)
+        if path.exists():
+            shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@dataclass(frozen=True)
+class StreamEdit:
+    """Stream Edit of a large file that keeps the encoded search and replace
+    strings of its sections instead of its contents.
+    """
+
+    pairs: tuple[tuple[bytes, bytes], ...]
+
+    @property
+    def changed(self) -> bool:
+        return any(search != replace for search, replace in self.pairs)
+
+
+def is_large(path: Path) -> bool:
+    """Return True if a file is large enough to stream its content instead of
+    reading it as a text.
+
+    :rtype: bool
+    """
+    return path.stat().st_size >= STREAM_THRESHOLD
+
+
+def find_bytes(path: Path, needles: list[bytes]) -> list[bool]:
+    """Return the flags that each needle exists in a file. It maps the file
+    to the memory, so the file content is not decoded or copied.
+
+    :param path: A file path.
+    :param needles: A list of the encoded search strings.
+
+    :rtype: list[bool]
+    """
+    with path.open("rb") as f:
+        if not path.stat().st_size:
+            return [not needle for needle in needles]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [mm.find(needle) != -1 for needle in needles]
+
+
+def overlaps(a: bytes, b: bytes) -> bool:
+    """Return True if two byte strings can share any byte of a text, so one
+    contains the other, or the end of one is the start of the other.
+
+    :param a: A first byte string.
+    :param b: A second byte string.
+
+    :rtype: bool
+    """
+    if a in b or b in a:
+        return True
+    return any(
+        a.endswith(b[:i]) or b.endswith(a[:i])
+        for i in range(1, min(len(a), len(b)))
+    )
+
+
+def _stream_pass(
+    src: Path, dst: BinaryIO, search: bytes, replace: bytes
+) -> int:
+    """Write a file content to the output with the replaced search bytes and
+    return the number of replacements. The search runs on the whole mapping,
+    so the occurrence that spans two chunks of the output is found too.
+    """
+    if not search:
+        raise ValueError("The search text of the stream replace is empty.")
+    count: int = 0
+    with src.open("rb") as f:
+        if not src.stat().st_size:
+            return count
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos: int = 0
+            while True:
+                hit: int = mm.find(search, pos)
+                end: int = len(mm) if hit == -1 else hit
+                for start in range(pos, end, STREAM_CHUNK):
+                    dst.write(mm[start : min(start + STREAM_CHUNK, end)])
+                if hit == -1:
+                    return count
+                dst.write(replace)
+                count += 1
+                pos = hit + len(search)
+
+
+def stream_replace(path: Path, pairs: list[tuple[bytes, bytes]]) -> None:
+    """Replace the search bytes of each pair in a file one pair after another
+    like ``str.replace``, and rename the last temporary file to the path, so
+    the file is replaced only once and atomically.
+
+    :param path: A file path that want to replace.
+    :param pairs: A list of the encoded search and replace strings.
+
+    :raise ValueError: If the search bytes of a pair do not exist after the
+        previous pairs were replaced.
+    """
+    # NOTE: It renames over the target of a symlink, so the link is kept.
+    path = path.resolve()
+    temps: list[str] = []
+    src: Path = path
+    try:
+        for search, replace in pairs:
+            if search == replace:
+                continue
+            fd, tmp = tempfile.mkstemp(
+                prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+            )
+            temps.append(tmp)
+            with os.fdopen(fd, mode="wb") as f:
+                if not _stream_pass(src, f, search, replace):
+                    raise ValueError(
+                        f"File {path} does not contain search text "
+                        f"'{search.decode('utf-8')}'"
+                    )
+            src = Path(tmp)
+        if temps:
+            shutil.copymode(path, temps[-1])
+            os.replace(temps.pop(), path)
+    finally:
+        for tmp in temps:
+            os.unlink(tmp)
 
 
 def kv_str(d: Any) -> str:
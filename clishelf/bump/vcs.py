@@ -8,48 +8,68 @@ from ..errors import (
     MercurialDoesNotSupportSignedTagsException,
     WorkingDirectoryIsDirtyException,
 )
+from ..runner import runner
 
 logger = logging.getLogger(__name__)
 
+# NOTE: A number of dirty paths that the dirty error reports.
+DIRTY_PATHS_LIMIT = 20
+DIRTY_CHUNK = 64 * 1024
+
 
 class BaseVCS:
 
     _TEST_USABLE_COMMAND = None
     _COMMIT_COMMAND = None
+    # NOTE: A message file argument of the commit command that reads the
+    #   message from the stdin, so it does not write a temporary file.
+    _COMMIT_STDIN = None
 
     @classmethod
     def commit(cls, message, context, extra_args=None):
         extra_args = extra_args or []
+        env = runner.env(
+            HGENCODING="utf-8",
+            **{
+                str("BUMPVERSION_" + key.upper()): str(context[key])
+                for key in ("current_version", "new_version")
+            },
+        )
+        if cls._COMMIT_STDIN is not None:
+            cls._commit(
+                cls._COMMIT_COMMAND + [cls._COMMIT_STDIN] + extra_args,
+                env=env,
+                input=message.encode("utf-8"),
+            )
+            return
+
         with NamedTemporaryFile("wb", delete=False) as f:
             f.write(message.encode("utf-8"))
-        env = os.environ.copy()
-        env["HGENCODING"] = "utf-8"
-        for key in ("current_version", "new_version"):
-            env[str("BUMPVERSION_" + key.upper())] = str(context[key])
         try:
-            subprocess.check_output(
-                cls._COMMIT_COMMAND + [f.name] + extra_args, env=env
-            )
+            cls._commit(cls._COMMIT_COMMAND + [f.name] + extra_args, env=env)
+        finally:
+            os.unlink(f.name)
+
+    @classmethod
+    def _commit(cls, command, **kwargs):
+        try:
+            runner.check(command, **kwargs)
         except subprocess.CalledProcessError as exc:
             err_msg = "Failed to run {}: return code {}, output: {}".format(
                 exc.cmd, exc.returncode, exc.output
             )
             logger.exception(err_msg)
             raise exc
-        finally:
-            os.unlink(f.name)
+
+    @classmethod
+    def add_paths(cls, paths):
+        for path in paths:
+            cls.add_path(path)
 
     @classmethod
     def is_usable(cls):
         try:
-            return (
-                subprocess.call(
-                    cls._TEST_USABLE_COMMAND,
-                    stderr=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                )
-                == 0
-            )
+            return runner.call(cls._TEST_USABLE_COMMAND, cache=True) == 0
         except OSError as e:
             if e.errno in (errno.ENOENT, errno.EACCES, errno.ENOTDIR):
                 return False
@@ -60,66 +80,150 @@ class Git(BaseVCS):
 
     _TEST_USABLE_COMMAND = ["git", "rev-parse", "--git-dir"]
     _COMMIT_COMMAND = ["git", "commit", "-F"]
+    _COMMIT_STDIN = "-"
 
     @classmethod
-    def assert_nondirty(cls):
-        lines = [
-            line.strip()
-            for line in subprocess.check_output(
-                ["git", "status", "--porcelain"]
-            ).splitlines()
-            if not line.strip().startswith(b"??")
+    def is_dirty(cls):
+        """Return True if the index or the working tree has any change of the
+        tracked files. It does not scan the untracked files, and each diff
+        exits on its first change. The porcelain diff refreshes the index in
+        memory, so it uses the fsmonitor of the repository if it was set.
+        """
+        staged = runner.call(["git", "diff", "--quiet", "--cached", "HEAD"])
+        if staged == 0:
+            return runner.call(["git", "diff", "--quiet"]) != 0
+        elif staged == 1:
+            return True
+        # NOTE: The HEAD does not exist yet, so any path on the index is new.
+        return bool(cls.dirty_paths(limit=1))
+
+    @classmethod
+    def dirty_paths(cls, limit=DIRTY_PATHS_LIMIT):
+        """Return the status lines of the changed tracked files, like
+        ``M file.txt``. It stops reading the status after the limit lines.
+        """
+        cmd = ["git", "status", "--porcelain", "-z", "--untracked-files=no"]
+        lines = []
+        remain = b""
+        orig = False
+        with runner.popen(cmd, stdout=subprocess.PIPE) as proc:
+            try:
+                for chunk in iter(lambda: proc.stdout.read1(DIRTY_CHUNK), b""):
+                    entries = (remain + chunk).split(b"\0")
+                    remain = entries.pop()
+                    for entry in entries:
+                        if orig:
+                            # NOTE: The renamed or copied entry has its source
+                            #   path on the next entry.
+                            lines[-1] = b"%s%s -> %s" % (
+                                lines[-1][:3],
+                                entry,
+                                lines[-1][3:],
+                            )
+                            orig = False
+                        elif entry:
+                            lines.append(entry)
+                            orig = bool(set(entry[:2].decode()) & {"R", "C"})
+                    if len(lines) > limit:
+                        break
+            finally:
+                if proc.poll() is None:
+                    proc.terminate()
+        return [
+            line.strip().decode("utf-8", "replace") for line in lines[:limit]
         ]
 
-        if lines:
-            raise WorkingDirectoryIsDirtyException(
-                "Git working directory is not clean:\n{}".format(
-                    b"\n".join(lines).decode()
-                )
-            )
+    @classmethod
+    def assert_nondirty(cls):
+        if not cls.is_dirty():
+            return
+
+        lines = cls.dirty_paths(limit=DIRTY_PATHS_LIMIT + 1)
+        if len(lines) > DIRTY_PATHS_LIMIT:
+            lines[DIRTY_PATHS_LIMIT:] = ["..."]
+        raise WorkingDirectoryIsDirtyException(
+            "Git working directory is not clean:\n{}".format("\n".join(lines))
+        )
 
     @classmethod
-    def latest_tag_info(cls):
+    def describe(cls):
+        """Return the nearest ``v*`` tag, its distance, and the HEAD commit
+        from the commit-graph, or fall back to ``git describe`` if the
+        commit-graph was not written or it is not supported.
+        """
+        from ..graph import describe_head
+        from ..objects import UnsupportedObject
+
         try:
-            # git-describe doesn't update the git-index, so we do that
-            subprocess.check_output(["git", "update-index", "--refresh"])
-
-            # get info about the latest tag in git
-            describe_out = (
-                subprocess.check_output(
-                    [
-                        "git",
-                        "describe",
-                        "--dirty",
-                        "--tags",
-                        "--long",
-                        "--abbrev=40",
-                        "--match=v*",
-                    ],
-                    stderr=subprocess.STDOUT,
-                )
-                .decode()
-                .split("-")
+            return describe_head("v*")
+        except (UnsupportedObject, OSError, ValueError):
+            logger.debug("Fall back to git describe")
+
+        describe_out = (
+            runner.output(
+                [
+                    "git",
+                    "describe",
+                    "--tags",
+                    "--long",
+                    "--abbrev=40",
+                    "--match=v*",
+                ],
+                cache=True,
+                stderr=subprocess.STDOUT,
             )
+            .decode()
+            .strip()
+            .split("-")
+        )
+        commit_sha = describe_out.pop().lstrip("g")
+        distance = int(describe_out.pop())
+        return "-".join(describe_out), distance, commit_sha
+
+    @classmethod
+    def latest_tag_info(cls, dirty=False):
+        """Return the latest tag information. The dirty flag runs the separate
+        dirtiness check, so the callers that do not commit or tag do not pay
+        for refreshing the index.
+        """
+        try:
+            if (described := cls.describe()) is None:
+                return {}
+            info = {}
+            if dirty and cls.is_dirty():
+                info["dirty"] = True
         except subprocess.CalledProcessError:
             logger.debug("Error when running git describe")
             return {}
 
-        info = {}
-
-        if describe_out[-1].strip() == "dirty":
-            info["dirty"] = True
-            describe_out.pop()
-
-        info["commit_sha"] = describe_out.pop().lstrip("g")
-        info["distance_to_latest_tag"] = int(describe_out.pop())
-        info["current_version"] = "-".join(describe_out).lstrip("v")
-
+        tag, distance, commit_sha = described
+        info["commit_sha"] = commit_sha
+        info["distance_to_latest_tag"] = distance
+        info["current_version"] = tag.lstrip("v")
         return info
 
     @classmethod
     def add_path(cls, path):
-        subprocess.check_output(["git", "add", "--update", path])
+        runner.check(["git", "add", "--update", path])
+
+    @classmethod
+    def add_paths(cls, paths):
+        """Stage the changes of all paths with one ``git add`` command that
+        reads the NUL separated paths from the stdin, so a long list of paths
+        does not hit the limit of the command line.
+        """
+        if not paths:
+            return
+        runner.check(
+            [
+                "git",
+                "add",
+                "--update",
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+            ],
+            input=b"\0".join(os.fsencode(path) for path in paths),
+        )
 
     @classmethod
     def tag(cls, sign, name, message):
@@ -134,7 +238,7 @@ class Git(BaseVCS):
             command += ["--sign"]
         if message:
             command += ["--message", message]
-        subprocess.check_output(command)
+        runner.check(command)
 
 
 class Mercurial(BaseVCS):
@@ -143,16 +247,14 @@ class Mercurial(BaseVCS):
     _COMMIT_COMMAND = ["hg", "commit", "--logfile"]
 
     @classmethod
-    def latest_tag_info(cls):
+    def latest_tag_info(cls, dirty=False):
         return {}
 
     @classmethod
     def assert_nondirty(cls):
         lines = [
             line.strip()
-            for line in subprocess.check_output(
-                ["hg", "status", "-mard"]
-            ).splitlines()
+            for line in runner.output(["hg", "status", "-mard"]).splitlines()
             if not line.strip().startswith(b"??")
         ]
 
@@ -176,4 +278,4 @@ class Mercurial(BaseVCS):
             )
         if message:
             command += ["--message", message]
-        subprocess.check_output(command)
+        runner.check(command)
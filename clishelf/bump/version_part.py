@@ -3,7 +3,8 @@ from __future__ import annotations
 import logging
 import re
 import string
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache, total_ordering
 from re import Pattern
 from typing import Any
 
@@ -21,6 +22,10 @@ from .incremeters import NumericIncrementer, ValuesIncrementer
 
 logger = logging.getLogger(__name__)
 
+# NOTE: A number of parsed versions that each version config keeps, like the
+#   release tags of a large repository.
+PARSE_CACHE_SIZE: int = 8192
+
 
 class PartConf:
     """Base class for version part behavior configuration."""
@@ -46,6 +51,10 @@ class PartConf:
         """Increment or otherwise transform the given version value."""
         return self.function.bump(value)
 
+    def sort_key(self, value: str) -> tuple[int, str]:
+        """Return the key that order the given version values."""
+        return self.function.sort_key(value)
+
 
 class ConfiguredPartConf(PartConf):
     """Configuration using a predefined set of values."""
@@ -103,43 +112,100 @@ class VersionPart:
             return False
         return self.value == other.value
 
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def sort_key(self) -> tuple[int, str]:
+        return self.config.sort_key(self.value)
+
     def __format__(self, format_spec: str) -> str:
         return self.value
 
 
+@total_ordering
 class Version:
-    """Represents an entire version composed of multiple parts."""
+    """Represents an entire version composed of multiple parts. It is an
+    immutable value that keeps its labels and parts on tuples, so it is
+    hashable and ordered by the sort keys of its parts, like the numeric parts
+    by their numbers and the configured parts by their positions.
+    """
+
+    __slots__ = ("labels", "parts", "original", "_key")
 
     def __init__(
         self,
-        values: dict[str, VersionPart],
+        values: Mapping[str, VersionPart],
         original: str | None = None,
     ):
-        self.values: dict[str, VersionPart] = dict(values)
-        self.original: str | None = original
+        object.__setattr__(self, "labels", tuple(values))
+        object.__setattr__(self, "parts", tuple(values.values()))
+        object.__setattr__(self, "original", original)
+        object.__setattr__(self, "_key", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    @property
+    def values(self) -> dict[str, VersionPart]:
+        """Return a new mapping of the labels and their parts."""
+        return dict(zip(self.labels, self.parts, strict=True))
 
     def __getitem__(self, key: str) -> VersionPart:
-        return self.values[key]
+        try:
+            return self.parts[self.labels.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
 
     def __len__(self) -> int:
-        return len(self.values)
+        return len(self.labels)
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self.values)
+        return iter(self.labels)
 
     def __repr__(self) -> str:
         return f"<Version {kv_str(self.values)}>"
 
-    def bump(self, part_name: str, order: Iterator[str] | list[str]) -> Self:
+    def sort_key(self) -> tuple[tuple[int, str], ...]:
+        """Return the sort keys of the parts, and keep them on this version
+        because it does not change.
+        """
+        if self._key is None:
+            object.__setattr__(
+                self, "_key", tuple(part.sort_key() for part in self.parts)
+            )
+        return self._key
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.labels == other.labels and (
+            self.sort_key() == other.sort_key()
+        )
+
+    def __lt__(self, other: Any) -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return (self.labels, self.sort_key()) < (
+            other.labels,
+            other.sort_key(),
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.labels, self.sort_key()))
+
+    def bump(self, part_name: str, order: Iterable[str]) -> Self:
         """Return a new Version with the specified part bumped."""
         bumped: bool = False
         new_values: dict[str, VersionPart] = {}
 
         for label in order:
-            if label not in self.values:
+            if label not in self.labels:
                 continue
 
-            part = self.values[label]
+            part = self[label]
             if label == part_name:
                 new_values[label] = part.bump()
                 bumped = True
@@ -168,6 +234,37 @@ def labels_for_format(serialize_format: str) -> list[str]:
     ]
 
 
+class SerializePlan:
+    """Serialize Plan that compile a serialize format once, and keep its
+    labels in order and as a set, so choosing the format is a set check and
+    does not parse or format it again.
+    """
+
+    __slots__ = ("format", "order", "labels", "specs")
+
+    def __init__(self, serialize_format: str) -> None:
+        self.format: str = serialize_format
+        self.order: tuple[str, ...] = tuple(labels_for_format(serialize_format))
+        self.labels: frozenset[str] = frozenset(self.order)
+
+        # NOTE: The labels with the format spec or the conversion render from
+        #   the version part objects, and the others from their values.
+        self.specs: frozenset[str] = frozenset(
+            label
+            for _, label, spec, conversion in string.Formatter().parse(
+                serialize_format
+            )
+            if label and (spec or conversion)
+        )
+
+    def __repr__(self) -> str:
+        return f"<SerializePlan {self.format!r}>"
+
+    def render(self, values: dict[str, Any]) -> str:
+        """Return the format string with the values."""
+        return self.format.format_map(values)
+
+
 class VersionConfig:
     """Holds a complete representation of a version string and its behavior."""
 
@@ -187,6 +284,12 @@ class VersionConfig:
             raise err
 
         self.serialize_formats: list[str] = serialize
+        self._parse_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(
+            self._parse_version
+        )
+        self.plans: tuple[SerializePlan, ...] = tuple(
+            SerializePlan(fmt) for fmt in serialize
+        )
         self.part_configs: dict[str, PartConf] = part_configs or {}
         self.search: str = search
         self.replace: str = replace
@@ -201,17 +304,23 @@ class VersionConfig:
             f")"
         )
 
-    def order(self) -> list[str]:
+    def order(self) -> tuple[str, ...]:
         """Return the order of version labels based on the first serialize
         format.
 
         Returns:
-            list[str]: A result for a labels_for_format function.
+            tuple[str, ...]: A result for a labels_for_format function that
+                is shared by all callers, so it is immutable.
         """
-        return labels_for_format(self.serialize_formats[0])
+        return self.plans[0].order
 
     def parse(self, version_string: str) -> Version | None:
-        """Parse a version string into VersionParts."""
+        """Parse a version string into VersionParts. The versions are cached
+        on this config, so parsing the same tags again is free.
+        """
+        return self._parse_cached(version_string)
+
+    def _parse_version(self, version_string: str) -> Version | None:
         if not version_string:
             return None
 
@@ -227,53 +336,51 @@ class VersionConfig:
         logger.debug(f"Parsed version: {kv_str(version.values)}")
         return version
 
-    def _serialize(
+    def choose_plan(
         self,
         version: Version,
-        serialize_format: str,
         context: dict[str, Any],
-        raise_if_incomplete: bool = False,
-    ) -> str:
-        """Serialize the given version using the specified format."""
-        values = {**context, **version.values}
-
-        try:
-            serialized = serialize_format.format(**values)
-        except KeyError as e:
-            raise MissingValueForSerializationException(
-                f"Missing key {e.args[0]!r} while serializing {version!r}"
-            ) from e
-
-        if raise_if_incomplete:
-            required_labels = set(labels_for_format(serialize_format))
-            present_labels = {
-                k
-                for k, v in values.items()
-                if isinstance(v, VersionPart) and v.value != "_"
-            }
-            missing = required_labels - present_labels
-            if missing:
-                raise IncompleteVersionRepresentationException(
-                    f"Could not represent {missing} in format {serialize_format}"
-                )
-
-        return serialized
-
-    def _choose_serialize_format(
-        self, version: Version, context: dict[str, Any]
-    ) -> str:
-        """Select the most appropriate serialization format."""
-        for fmt in self.serialize_formats:
-            try:
-                self._serialize(version, fmt, context, raise_if_incomplete=True)
-                return fmt
-            except IncompleteVersionRepresentationException:
-                continue
-        raise KeyError("No valid serialization format found")
+    ) -> SerializePlan:
+        """Select the first serialize plan that all its labels are the parts
+        of the version that are not optional. The numeric parts are always
+        present, and the configured parts are optional if their values are
+        their optional values.
+
+        Raises MissingValueForSerializationException if a label of the plan
+        before the chosen one is neither a part nor a context value, and
+        IncompleteVersionRepresentationException if no plan is able to
+        represent the version.
+        """
+        present: set[str] = {
+            label
+            for label, part in zip(version.labels, version.parts, strict=True)
+            if not (
+                isinstance(part.config, ConfiguredPartConf)
+                and part.is_optional()
+            )
+        }
+        for plan in self.plans:
+            if plan.labels <= present:
+                return plan
+            for label in plan.order:
+                if label not in version.labels and label not in context:
+                    raise MissingValueForSerializationException(
+                        f"Missing key {label!r} while serializing {version!r}"
+                    )
+        raise IncompleteVersionRepresentationException(
+            f"Could not represent {version!r} in any serialize format"
+        )
 
     def serialize(self, version: Version, context: dict[str, Any]) -> str:
         """Serialize the version into a string."""
-        fmt: str = self._choose_serialize_format(version, context)
-        serialized = self._serialize(version, fmt, context)
+        plan: SerializePlan = self.choose_plan(version, context)
+        parts: dict[str, str] = {
+            k: v.value
+            for k, v in zip(version.labels, version.parts, strict=True)
+        }
+        values: dict[str, Any] = {**context, **parts}
+        for label in plan.specs & parts.keys():
+            values[label] = version[label]
+        serialized = plan.render(values)
         logger.debug("Serialized version to '%s'", serialized)
         return serialized
@@ -9,23 +9,116 @@ import json
 import re
 import subprocess
 import sys
+from importlib import import_module
 from pathlib import Path
-from typing import NoReturn, Optional
+from typing import Any, Final, NoReturn, Optional
 
 import click
 
-from .bump.cli import cli_vs
-from .emoji import cli_emoji
-from .git import cli_git
-from .utils import load_config
+from .utils import Level, load_config, make_color
 
 cli: click.Command
 
+# NOTE: The static metadata of the sub-command groups that load lazily. It
+#   maps a command name to its module, the attribute name of its group, and
+#   its short help that shows on the help message without importing it.
+LAZY_COMMANDS: Final[dict[str, tuple[str, str, str]]] = {
+    "git": ("clishelf.git", "cli_git", "The Extended Git commands"),
+    "vs": ("clishelf.bump.cli", "cli_vs", "The Versioning commands."),
+    "emoji": ("clishelf.emoji", "cli_emoji", "The Emoji commands"),
+}
 
-@click.group()
-def cli():
-    """The Main Shelf commands."""
-    pass  # pragma: no cov
+
+class LazyGroup(click.Group):
+    """Lazy Group object that import the module of a sub-command only when it
+    is dispatched, so the command like ``shelf git cm`` that run as a git hook
+    does not pay the import time of the other sub-commands.
+
+    :param lazy_commands: A mapping of a command name and its module, the
+        attribute name of the command, and its short help.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        lazy_commands: Optional[dict[str, tuple[str, str, str]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands: dict[str, tuple[str, str, str]] = (
+            lazy_commands or {}
+        )
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted({*super().list_commands(ctx), *self.lazy_commands})
+
+    def get_command(
+        self,
+        ctx: click.Context,
+        cmd_name: str,
+    ) -> Optional[click.Command]:
+        if cmd_name not in self.commands and cmd_name in self.lazy_commands:
+            module, attr, _ = self.lazy_commands[cmd_name]
+            self.add_command(
+                getattr(import_module(module), attr), name=cmd_name
+            )
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self,
+        ctx: click.Context,
+        formatter: click.HelpFormatter,
+    ) -> None:
+        """Write all the commands into the formatter with the short help of the
+        lazy commands from its static metadata instead of importing them.
+        """
+        rows: list[tuple[str, str]] = []
+        for name in self.list_commands(ctx):
+            if name not in self.commands and name in self.lazy_commands:
+                rows.append((name, self.lazy_commands[name][2]))
+                continue
+
+            cmd: Optional[click.Command] = self.get_command(ctx, name)
+            if cmd is None or cmd.hidden:
+                continue
+            rows.append(
+                (name, cmd.get_short_help_str(formatter.width - 6 - len(name)))
+            )
+
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
+@click.option(
+    "--profile",
+    "profile_path",
+    type=click.Path(dir_okay=False),
+    envvar="CLISHELF_PROFILE",
+    default=None,
+    help=(
+        "A report file path that want to profile the command. It writes the "
+        "JSON timing report if it ends with `.json`, otherwise the pstats file."
+    ),
+)
+@click.pass_context
+def cli(ctx: click.Context, profile_path: Optional[str] = None):
+    """The Main Shelf commands.
+
+    \f
+    :param ctx: A click context object.
+    :param profile_path: A report file path of the profiling.
+    """
+    if profile_path:
+        from .profiling import profile
+
+        ctx.with_resource(profile(profile_path))
+
+    from .runner import runner
+
+    # NOTE: Memoise the read-only git commands for this invocation.
+    ctx.with_resource(runner.session())
 
 
 @cli.command()
@@ -172,11 +265,107 @@ def dep(
                 f.write("\n")
 
 
+@cli.group(name="daemon")
+def cli_daemon():
+    """The Commit Message Daemon commands."""
+    pass  # pragma: no cov
+
+
+@cli_daemon.command(name="start")
+@click.option(
+    "-s",
+    "--socket",
+    "socket_path",
+    type=click.Path(),
+    default=None,
+    help="A Unix socket path that the daemon listens.",
+)
+@click.option(
+    "-t",
+    "--timeout",
+    type=click.FLOAT,
+    default=None,
+    help="An idle timeout in seconds that the daemon will stop itself.",
+)
+@click.option(
+    "-d",
+    "--detach",
+    is_flag=True,
+    help="If True, it will start the daemon on the background process.",
+)
+def daemon_start(
+    socket_path: Optional[str] = None,
+    timeout: Optional[float] = None,
+    detach: bool = False,
+) -> NoReturn:  # pragma: no cov
+    """Start the commit message daemon that keep the config, emoji data, and
+    commit prefixes warm for the ``shelf-cm`` client.
+
+    \f
+    :param socket_path: A Unix socket path that the daemon listens.
+    :param timeout: An idle timeout in seconds.
+    :param detach: A detach flag that start the daemon on background.
+    """
+    import time
+
+    from .daemon import DAEMON_TIMEOUT, get_socket_path, request, serve
+
+    path: Path = Path(socket_path) if socket_path else get_socket_path()
+    if not detach:
+        click.echo(make_color(f"Start the daemon on {path}", Level.INFO))
+        serve(path, idle_timeout=timeout)
+        sys.exit(0)
+
+    subprocess.Popen(
+        [sys.executable, "-m", "clishelf", "daemon", "start", "-s", str(path)]
+        + (["-t", str(timeout)] if timeout else []),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline: float = time.monotonic() + DAEMON_TIMEOUT
+    while time.monotonic() < deadline:
+        if request({"cmd": "ping"}, socket_path=path) is not None:
+            click.echo(make_color(f"Start the daemon on {path}", Level.OK))
+            sys.exit(0)
+        time.sleep(0.05)
+    click.echo(make_color("The daemon does not start.", Level.ERROR))
+    sys.exit(1)
+
+
+@cli_daemon.command(name="stop")
+@click.option("-s", "--socket", "socket_path", type=click.Path(), default=None)
+def daemon_stop(socket_path: Optional[str] = None) -> NoReturn:
+    """Stop the commit message daemon."""
+    from .daemon import request
+
+    if request(
+        {"cmd": "stop"}, socket_path=Path(socket_path) if socket_path else None
+    ):
+        click.echo(make_color("Stop the daemon.", Level.OK))
+    else:
+        click.echo(make_color("The daemon does not run.", Level.INFO))
+    sys.exit(0)
+
+
+@cli_daemon.command(name="status")
+@click.option("-s", "--socket", "socket_path", type=click.Path(), default=None)
+def daemon_status(socket_path: Optional[str] = None) -> NoReturn:
+    """Show the status of the commit message daemon."""
+    from .daemon import request
+
+    if rs := request(
+        {"cmd": "ping"}, socket_path=Path(socket_path) if socket_path else None
+    ):
+        click.echo(make_color(f"The daemon runs on pid {rs['pid']}.", Level.OK))
+    else:
+        click.echo(make_color("The daemon does not run.", Level.INFO))
+    sys.exit(0)
+
+
 def main() -> NoReturn:
     """Make cli main object."""
-    cli.add_command(cli_git)
-    cli.add_command(cli_vs)
-    cli.add_command(cli_emoji)
     cli.main()
 
 
@@ -0,0 +1,325 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import re
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Final, NoReturn, Optional
+
+from .__about__ import __version__
+
+# NOTE: This module imports only the standard library at the module level, so
+#   the thin client of the commit message daemon able to start without the
+#   cost of importing the whole package.
+
+# NOTE: A client waits the daemon only a short time before it falls back to
+#   run in-process.
+DAEMON_TIMEOUT: Final[float] = 2.0
+ANSI_ESCAPE: Final[re.Pattern[str]] = re.compile(r"\x1b\[[0-9;]*m")
+
+
+def get_socket_path() -> Path:
+    """Return the per-user Unix socket path of the daemon. The socket lives on
+    a private directory of the user under the runtime directory if it was set,
+    otherwise the temporary directory, so the other users are not able to
+    create it first.
+
+    :rtype: Path
+    """
+    return (
+        Path(os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir())
+        / f"clishelf-{os.getuid()}"
+        / "daemon.sock"
+    )
+
+
+def is_private_dir(path: Path) -> bool:
+    """Return True if a directory is not a symlink, it is owned by the current
+    user, and only that user is able to access it.
+
+    :param path: A directory path.
+
+    :rtype: bool
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & 0o077
+    )
+
+
+def make_private_dir(path: Path) -> None:
+    """Create the private directory of the socket if it does not exist.
+
+    :param path: A directory path.
+
+    :raise RuntimeError: If the directory exists, but it is not private.
+    """
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    if not is_private_dir(path):
+        raise RuntimeError(
+            f"The daemon directory {path} is not private to the current user."
+        )
+
+
+def get_peer_uid(sock: socket.socket) -> Optional[int]:
+    """Return the user id of the process on the other side of a Unix socket,
+    or None if the platform does not support the peer credentials.
+
+    :param sock: A connected Unix socket.
+
+    :rtype: Optional[int]
+    """
+    if not hasattr(socket, "SO_PEERCRED"):  # pragma: no cov
+        return None
+    cred: bytes = sock.getsockopt(
+        socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+    )
+    return struct.unpack("3i", cred)[1]
+
+
+def request(
+    payload: dict[str, Any],
+    socket_path: Optional[Path] = None,
+    timeout: float = DAEMON_TIMEOUT,
+) -> Optional[dict[str, Any]]:
+    """Send a request to the daemon and return its response, or None if the
+    daemon does not run or it returns an error.
+
+    :param payload: A mapping of request that want to send.
+    :param socket_path: A socket path of the daemon.
+    :param timeout: A timeout in seconds of the socket operations.
+
+    :rtype: Optional[dict[str, Any]]
+    """
+    path: Path = socket_path or get_socket_path()
+    try:
+        # NOTE: It does not trust the socket that another user was able to
+        #   create or to listen on.
+        if not is_private_dir(path.parent):
+            return None
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            if (uid := get_peer_uid(sock)) is None:
+                uid = os.stat(path).st_uid
+            if uid != os.getuid():
+                return None
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                rs: dict[str, Any] = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if "error" in rs or rs.get("version") != __version__:
+        return None
+    return rs
+
+
+def handle_cm(payload: dict[str, Any]) -> dict[str, Any]:
+    """Validate and prepare a commit message file like the ``shelf git cm``
+    command.
+
+    :param payload: A mapping of request that has the file, edit, and
+        output_file keys.
+
+    :rtype: dict[str, Any]
+    :return: A mapping of the colored output and the exit code.
+    """
+    from .git import check_commit_msg
+    from .utils import Level, make_color
+
+    file: Path = Path(payload["file"])
+    with file.open(encoding="utf-8") as f_msg:
+        raw_msg: list[str] = f_msg.read().splitlines()
+
+    lines, rss, level = check_commit_msg(
+        raw_msg, edit=payload.get("edit", False)
+    )
+    output: list[str] = [make_color(rs, level) for rs in rss]
+    if level not in (Level.OK, Level.WARNING):
+        return {"output": "\n".join(output), "code": 1}
+
+    if payload.get("output_file"):
+        with file.open(mode="w", encoding="utf-8", newline="") as f_msg:
+            f_msg.write(f"{os.linesep}".join(lines))
+    output.append(make_color("\n".join(lines), level=Level.OK))
+    return {"output": "\n".join(output), "code": 0}
+
+
+def handle(payload: dict[str, Any]) -> dict[str, Any]:
+    """Return the response of a request. It changes the current directory to
+    the directory of the client while handling, so the config file of that
+    repository will be loaded, and it reloads when its mtime was changed.
+
+    :param payload: A mapping of request that has the cmd key.
+
+    :rtype: dict[str, Any]
+    """
+    cmd: Optional[str] = payload.get("cmd")
+    if cmd == "ping":
+        return {"pid": os.getpid()}
+    elif cmd != "cm":
+        raise ValueError(f"Command {cmd!r} does not support on the daemon.")
+
+    from .runner import runner
+
+    cwd: str = os.getcwd()
+    os.chdir(payload["cwd"])
+    try:
+        with runner.session():
+            return handle_cm(payload)
+    finally:
+        os.chdir(cwd)
+
+
+class DaemonHandler(socketserver.StreamRequestHandler):
+    """Daemon Handler object that read one JSON line request and write one JSON
+    line response on each connection.
+    """
+
+    def handle(self) -> None:
+        try:
+            if get_peer_uid(self.request) not in (None, os.getuid()):
+                raise PermissionError("The client is not the daemon owner.")
+            payload: dict[str, Any] = json.loads(self.rfile.readline())
+            if payload.get("cmd") == "stop":
+                self.server.stopped = True
+                rs: dict[str, Any] = {}
+            else:
+                rs = handle(payload)
+        except Exception as err:  # pragma: no cov
+            rs = {"error": f"{err.__class__.__name__}: {err}"}
+        rs["version"] = __version__
+        self.wfile.write(json.dumps(rs).encode("utf-8") + b"\n")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Daemon Server object that handle requests one by one because the
+    handler changes the current directory of the process.
+    """
+
+    stopped: bool = False
+
+    def handle_timeout(self) -> None:
+        self.stopped = True
+
+
+def warm() -> None:
+    """Load the emoji data, the emoji matcher, and the commit prefix tables
+    before receiving the first request.
+    """
+    from .emoji import get_emoji_matcher
+    from .git import get_commit_prefix_group, get_git_emojis
+
+    get_emoji_matcher()
+    get_git_emojis()
+    get_commit_prefix_group()
+
+
+def serve(
+    socket_path: Optional[Path] = None,
+    idle_timeout: Optional[float] = None,
+) -> None:
+    """Start the daemon on a Unix socket until it receives the stop request or
+    it idles longer than the timeout.
+
+    :param socket_path: A socket path that want to listen.
+    :param idle_timeout: An idle timeout in seconds, or None for no timeout.
+    """
+    path: Path = socket_path or get_socket_path()
+    make_private_dir(path.parent)
+    if path.exists():
+        if request({"cmd": "ping"}, socket_path=path) is not None:
+            raise RuntimeError(f"The daemon already runs on {path}.")
+        path.unlink()
+
+    # NOTE: Only the owner able to connect to the socket.
+    umask: int = os.umask(0o177)
+    try:
+        server = DaemonServer(str(path), DaemonHandler)
+    finally:
+        os.umask(umask)
+
+    server.timeout = idle_timeout
+    warm()
+    try:
+        while not server.stopped:
+            server.handle_request()
+    finally:
+        server.server_close()
+        path.unlink(missing_ok=True)
+
+
+def request_cm(args: list[str]) -> Optional[dict[str, Any]]:
+    """Send the arguments of the ``shelf git cm`` command to the daemon. It
+    returns None for the arguments that the daemon does not support.
+
+    :param args: A list of arguments of the ``shelf git cm`` command.
+
+    :rtype: Optional[dict[str, Any]]
+    """
+    flags: dict[str, str] = {
+        "-e": "edit",
+        "--edit": "edit",
+        "-o": "output_file",
+        "--output-file": "output_file",
+    }
+    payload: dict[str, Any] = {
+        "cmd": "cm",
+        "cwd": os.getcwd(),
+        "file": ".git/COMMIT_EDITMSG",
+    }
+    files: list[str] = []
+    for arg in args:
+        if arg in flags:
+            payload[flags[arg]] = True
+        elif arg.startswith("-"):
+            return None
+        else:
+            files.append(arg)
+    if len(files) > 1:
+        return None
+    payload["file"] = os.path.abspath(files[0] if files else payload["file"])
+    return request(payload)
+
+
+def client_main(argv: Optional[list[str]] = None) -> NoReturn:
+    """Run the ``shelf git cm`` command on the daemon if it runs, otherwise it
+    falls back to run it in-process.
+
+    :param argv: A list of arguments of the ``shelf git cm`` command.
+    """
+    args: list[str] = sys.argv[1:] if argv is None else argv
+    if (rs := request_cm(args)) is not None:
+        output: str = rs["output"]
+        if not sys.stdout.isatty():
+            output = ANSI_ESCAPE.sub("", output)
+        if output:
+            sys.stdout.write(f"{output}\n")
+        sys.exit(rs["code"])
+
+    from .cli import cli
+
+    cli.main(["git", "cm", *args], prog_name="shelf")
+
+
+if __name__ == "__main__":
+    client_main()
@@ -5,20 +5,23 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+import hashlib
 import json
-from collections.abc import Iterator
+import marshal
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Final, Optional, Union
+from re import Match, Pattern
+from types import ModuleType
+from typing import Any, Final, Optional, Union
 
 import click
 
-try:
-    import requests
-except ImportError:  # pragma: no cov
-    requests = None
-
 DictStr = dict[str, str]
+EmojiPairs = tuple[tuple[str, str], ...]
 cli_emoji: click.Command
 
 
@@ -30,16 +33,251 @@ GH_EMOJI_URL: Final[str] = (
 )
 
 
+# NOTE: A version of the compact emoji sidecar format that keep next to the
+#   emoji json file. It should increase when the marshal payload was changed.
+EMOJI_SIDECAR_VERSION: Final[int] = 1
+
+
+@dataclass(frozen=True)
+class EmojiData:
+    """Emoji Data dataclass that keep the parallel tuples of Unicode emoji and
+    its alias with the prebuilt lookup tables of both directions.
+    """
+
+    emojis: tuple[str, ...]
+    aliases: tuple[str, ...]
+    to_alias: DictStr
+    to_emoji: DictStr
+
+    @classmethod
+    def from_records(cls, records: Iterable[DictStr]) -> EmojiData:
+        """Construct the emoji data from the records of the emoji json file.
+
+        :param records: An iterable of mapping of emoji values.
+
+        :rtype: EmojiData
+        """
+        pairs: EmojiPairs = tuple((r["emoji"], r["alias"]) for r in records)
+        to_alias: DictStr = {}
+        to_emoji: DictStr = {}
+        for emoji, alias in pairs:
+            to_alias.setdefault(emoji, alias)
+            to_emoji.setdefault(alias, emoji)
+        return cls(
+            emojis=tuple(p[0] for p in pairs),
+            aliases=tuple(p[1] for p in pairs),
+            to_alias=to_alias,
+            to_emoji=to_emoji,
+        )
+
+
+def _import_requests() -> Optional[ModuleType]:
+    """Return the requests module if it was installed. It imports lazily
+    because only the fetch command uses it, and it is slow to import.
+
+    :rtype: Optional[ModuleType]
+    """
+    try:
+        import requests
+    except ImportError:  # pragma: no cov
+        return None
+    return requests
+
+
+def __getattr__(name: str) -> Any:
+    # NOTE: Keep the ``requests`` attribute of this module for backward
+    #   compatible without importing it at the module import time.
+    if name == "requests":
+        return _import_requests()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def dump_emoji_sidecar(content: bytes, file: Path) -> None:
+    """Write the compact emoji sidecar file from the content of emoji json file.
+
+    :param content: A bytes content of the emoji json file.
+    :param file: A sidecar file path that want to write.
+    """
+    data: EmojiData = EmojiData.from_records(json.loads(content))
+    file.write_bytes(
+        marshal.dumps(
+            (
+                EMOJI_SIDECAR_VERSION,
+                _digest(content),
+                data.emojis,
+                data.aliases,
+                data.to_alias,
+                data.to_emoji,
+            )
+        )
+    )
+
+
+def load_emoji_sidecar(content: bytes, file: Path) -> Optional[EmojiData]:
+    """Load the compact emoji sidecar file if it exists and it was generated
+    from the same content of emoji json file.
+
+    :param content: A bytes content of the emoji json file.
+    :param file: A sidecar file path that want to load.
+
+    :rtype: Optional[EmojiData]
+    """
+    try:
+        payload = marshal.loads(file.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        not isinstance(payload, tuple)
+        or len(payload) != 6
+        or payload[0] != EMOJI_SIDECAR_VERSION
+        or payload[1] != _digest(content)
+    ):
+        return None
+    return EmojiData(*payload[2:])
+
+
+@lru_cache(maxsize=1)
+def load_emoji_data() -> EmojiData:
+    """Return the emoji data that load only once per process. It uses the
+    compact sidecar file if it is valid, otherwise it falls back to parse the
+    emoji json file.
+
+    :rtype: EmojiData
+    """
+    file: Path = Path(__file__).parent / "assets/emoji.json"
+    content: bytes = file.read_bytes()
+    if data := load_emoji_sidecar(content, file.with_suffix(".marshal")):
+        return data
+    return EmojiData.from_records(json.loads(content))
+
+
 def get_emojis() -> Iterator[DictStr]:
     """Get the iterator of the emoji data that already loading to assets path.
-    This function use iterator for returning step because I do not want to keep
-    all emoji data in memory.
 
     :rtype: Iterator[DictStr]
     """
-    file = Path(__file__).parent / "assets/emoji.json"
-    with file.open(encoding="utf-8") as f:
-        yield from iter(json.load(f))
+    data: EmojiData = load_emoji_data()
+    for emoji, alias in zip(data.emojis, data.aliases, strict=True):
+        yield {"emoji": emoji, "alias": alias}
+
+
+class EmojiMatcher:
+    """Emoji Matcher object that precompile the emoji dataset for replacing
+    a Unicode emoji and an emoji string in a single pass of message.
+
+    :param pairs: An iterable of pair of Unicode emoji and its alias.
+    """
+
+    # NOTE: An alias of the GitHub dataset able to have `+` and `-` characters
+    #   such as `:+1:` or `:t-rex:`. The trailing colon is a lookahead because
+    #   it can be the leading colon of the next alias.
+    ALIAS_TOKEN: Pattern[str] = re.compile(r":([\w+\-]+)(?=:)")
+
+    __slots__ = ("to_alias", "to_emoji", "pattern")
+
+    def __init__(self, pairs: Iterable[tuple[str, str]]) -> None:
+        self.to_alias: DictStr = {}
+        self.to_emoji: DictStr = {}
+        for emoji, alias in pairs:
+            self.to_alias.setdefault(emoji, alias)
+            self.to_emoji.setdefault(alias, emoji)
+        self.pattern: Optional[Pattern[str]] = self._compile(self.to_alias)
+
+    @classmethod
+    def from_data(cls, data: EmojiData) -> EmojiMatcher:
+        """Construct the matcher from the prebuilt lookup tables of emoji data.
+
+        :param data: An EmojiData object.
+
+        :rtype: EmojiMatcher
+        """
+        matcher: EmojiMatcher = cls.__new__(cls)
+        matcher.to_alias = data.to_alias
+        matcher.to_emoji = data.to_emoji
+        matcher.pattern = cls._compile(data.to_alias)
+        return matcher
+
+    @staticmethod
+    def _compile(to_alias: DictStr) -> Optional[Pattern[str]]:
+        if not to_alias:
+            return None
+
+        # NOTE: Sort the alternation with the longest emoji first because some
+        #   emoji is a prefix of a ZWJ sequence, like `😶` and `😶‍🌫️`.
+        return re.compile(
+            "|".join(
+                re.escape(e) for e in sorted(to_alias, key=len, reverse=True)
+            )
+        )
+
+    def _replace_alias(self, match: Match[str]) -> str:
+        return f":{self.to_alias[match.group(0)]}:"
+
+    def demojize(self, msg: str) -> str:
+        """Replace all Unicode emoji to an emoji string in a message.
+
+        :param msg: A message string that want to search Unicode emoji.
+
+        :rtype: str
+        """
+        if msg.isascii() or self.pattern is None:
+            return msg
+        return self.pattern.sub(self._replace_alias, msg)
+
+    def emojize(self, msg: str) -> str:
+        """Replace all emoji strings to a Unicode emoji in a message.
+
+        :param msg: A message string that want to search emoji string.
+
+        :rtype: str
+        """
+        if ":" not in msg:
+            return msg
+
+        rs: list[str] = []
+        pos: int = 0
+        for match in self.ALIAS_TOKEN.finditer(msg):
+            # NOTE: Skip the token that start at the trailing colon of the
+            #   previous replaced alias.
+            if match.start() < pos:
+                continue
+            if (emoji := self.to_emoji.get(match.group(1))) is None:
+                continue
+            rs.append(msg[pos : match.start()])
+            rs.append(emoji)
+            pos = match.end() + 1
+        if not rs:
+            return msg
+        rs.append(msg[pos:])
+        return "".join(rs)
+
+
+@lru_cache(maxsize=32)
+def _compile_matcher(pairs: EmojiPairs) -> EmojiMatcher:
+    return EmojiMatcher(pairs)
+
+
+@lru_cache(maxsize=1)
+def get_emoji_matcher() -> EmojiMatcher:
+    """Return the emoji matcher of all emoji data on the assets path that
+    compile only once per process.
+
+    :rtype: EmojiMatcher
+    """
+    return EmojiMatcher.from_data(load_emoji_data())
+
+
+def _matcher(
+    emojis: Optional[Union[Iterator[DictStr], list[DictStr]]] = None,
+) -> EmojiMatcher:
+    if emojis is None:
+        return get_emoji_matcher()
+    return _compile_matcher(tuple((e["emoji"], e["alias"]) for e in emojis))
 
 
 def demojize(
@@ -54,11 +292,9 @@ def demojize(
 
     :rtype: str
     """
-    emojis: Iterator[DictStr] = get_emojis() if emojis is None else emojis
-    for emoji in emojis:
-        if (e := emoji["emoji"]) in msg:
-            msg = msg.replace(e, f':{emoji["alias"]}:')
-    return msg
+    if msg.isascii():
+        return msg
+    return _matcher(emojis).demojize(msg)
 
 
 def emojize(
@@ -73,11 +309,9 @@ def emojize(
 
     :rtype: str
     """
-    emojis: Iterator[DictStr] = get_emojis() if emojis is None else emojis
-    for emoji in emojis:
-        if (alias := f':{emoji["alias"]}:') in msg:
-            msg = msg.replace(alias, emoji["emoji"])
-    return msg
+    if ":" not in msg:
+        return msg
+    return _matcher(emojis).emojize(msg)
 
 
 @click.group(name="emoji")
@@ -89,13 +323,14 @@ def cli_emoji():
 @cli_emoji.command()
 @click.option("-b", "--backup", is_flag=True)
 def fetch(backup: bool = False) -> None:
-    """Refresh emoji metadata file on the assets folder, `./asserts`.
+    """Refresh emoji metadata file and its compact sidecar file on the assets
+    folder, `./asserts`.
 
     :param backup: A backup flag for rename the previous file with backup suffix
         if this value set to True.
     :type backup: bool (=False)
     """
-    if requests is None:  # pragma: no cov
+    if (requests := _import_requests()) is None:  # pragma: no cov
         raise ImportError(
             "fetch command want the request package for getting the emoji "
             "metadata from the GitHub repository. Please install with: "
@@ -118,6 +353,12 @@ def fetch(backup: bool = False) -> None:
             indent=2,
         )
 
+    # NOTE: Write the compact sidecar that validate by the content hash of the
+    #   emoji json file.
+    dump_emoji_sidecar(file.read_bytes(), file.with_suffix(".marshal"))
+    load_emoji_data.cache_clear()
+    get_emoji_matcher.cache_clear()
+
 
 if __name__ == "__main__":
     cli_emoji.main()
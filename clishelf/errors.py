@@ -1,7 +1,11 @@
 class BumpException(Exception): ...
 
 
-class IncompleteVersionRepresentationException(BumpException): ...
+class IncompleteVersionRepresentationException(BumpException, KeyError):
+    """Raise when no serialize format is able to represent all the parts of a
+    version that are not optional. It is a KeyError like the previous error
+    of the serialize method.
+    """
 
 
 class MissingValueForSerializationException(BumpException): ...
@@ -11,3 +15,13 @@ class WorkingDirectoryIsDirtyException(BumpException): ...
 
 
 class MercurialDoesNotSupportSignedTagsException(BumpException): ...
+
+
+class VersionFilesException(BumpException, ValueError):
+    """Raise when more than one configured file failed, so it reports all of
+    them instead of the first one.
+    """
+
+    def __init__(self, errors: list[Exception]) -> None:
+        self.errors: list[Exception] = errors
+        super().__init__("\n".join(str(err) for err in errors))
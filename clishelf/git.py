@@ -9,16 +9,17 @@ import os
 import re
 import subprocess
 import sys
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 from dataclasses import InitVar, dataclass, field
-from datetime import date, datetime
+from datetime import date, datetime, timedelta, timezone
 from functools import lru_cache
 from pathlib import Path
 from typing import NoReturn, Optional, Union
 
 import click
 
-from .emoji import demojize, get_emojis
+from .emoji import demojize, get_emojis, load_emoji_data
+from .runner import get_cat_file, runner
 from .settings import GitConf
 from .utils import (
     Level,
@@ -32,11 +33,38 @@ TupleStr = tuple[str, ...]
 
 cli_git: click.Command
 
-GIT_LOG_FORMAT: str = "%h|%D|%cI|%cn|%ce%n%s%n%b%-C()%n(END)"
+# NOTE: The fields of a commit record are separated by the ASCII record
+#   separator, and the records are terminated by NUL with the `-z` option, so
+#   a commit body can keep any text. The commit date is the unix timestamp with
+#   its UTC offset that was formatted by ``--date=format:%z``.
+GIT_LOG_FORMAT: str = "%H%x1e%h%x1e%D%x1e%ct%x1e%cd%x1e%cn%x1e%ce%x1e%s%x1e%b"
+GIT_LOG_FIELDS: int = 9
+GIT_LOG_CHUNK: int = 64 * 1024
 DEFAULT_TAG: str = "v0.0.0"
 ALL_CHAR: str = r"[\u0000-\uFFFF]"
 
 
+def get_git_dir() -> Path:
+    """Return the git directory of the current repository. It does not call
+    the git command if the current path is the root of a normal repository.
+
+    :raise CalledProcessError: If the current path is not in a git repository.
+
+    :rtype: Path
+    """
+    if (git_dir := Path(".git")).is_dir():
+        return git_dir
+    return Path(
+        runner.output(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            cache=True,
+            stderr=subprocess.DEVNULL,
+        )
+        .decode("utf-8")
+        .strip()
+    )
+
+
 def get_git_local_conf(key: str) -> Optional[str]:
     """Get Git config on the local scope with an input specific key.
 
@@ -47,7 +75,7 @@ def get_git_local_conf(key: str) -> Optional[str]:
     """
     try:
         return (
-            subprocess.check_output(["git", "config", "--local", key])
+            runner.output(["git", "config", "--local", key], cache=True)
             .decode(sys.stdout.encoding)
             .strip()
         )
@@ -153,13 +181,18 @@ def get_commit_prefix_group() -> tuple[CommitPrefixGroup, ...]:
     )
 
 
-@lru_cache
 def get_git_emojis() -> list[dict[str, str]]:
     """Return the list of mapping of Git emoji values.
 
     :rtype: list[dict[str, str]]
     """
-    prefix: TupleStr = tuple(p.emoji.strip(":") for p in get_commit_prefix())
+    return _git_emojis(tuple(p.emoji.strip(":") for p in get_commit_prefix()))
+
+
+@lru_cache(maxsize=32)
+def _git_emojis(prefix: TupleStr) -> list[dict[str, str]]:
+    # NOTE: Cache on the emoji prefixes instead of nothing because the commit
+    #   prefixes able to change from the config file on a long-running process.
     return [emojis for emojis in get_emojis() if emojis["alias"] in prefix]
 
 
@@ -294,6 +327,29 @@ class CommitMsg:
         else:
             self.mtype: str = mtype
 
+    @classmethod
+    def from_subject(
+        cls,
+        subject: CommitSub,
+        mtype: str,
+        body: Optional[str] = None,
+    ) -> CommitMsg:
+        """Construct the commit message from a subject that was already
+        extracted, like from the commit index, without parsing it again.
+
+        :param subject: A CommitSub dataclass object.
+        :param mtype: A message type or the commit prefix group name.
+        :param body: A body of commit message that mark new-line with ``|``.
+
+        :rtype: CommitMsg
+        """
+        msg: CommitMsg = cls.__new__(cls)
+        msg.body = body
+        msg.subject = subject
+        msg.content = cls.__prepare_content(subject)
+        msg.mtype = mtype
+        return msg
+
     @staticmethod
     def __prepare_mtype(prefix: str) -> str:
         """Return a message type that getting from the regex.
@@ -422,18 +478,57 @@ def validate_commit_msg(lines: list[str]) -> tuple[list[str], Level]:
     return rs, Level.WARNING
 
 
-def get_latest_tag(default: bool = True) -> Optional[str]:
+def get_latest_tag(
+    default: bool = True,
+    *,
+    is_dt: bool = False,
+) -> Optional[str]:
     """Return the latest tag if it exists, otherwise it will v0.0.0 tag.
 
     :param default: A default flag that use DEFAULT_TAG value instead if it
         raises any error from subprocess process.
+    :param is_dt: A datetime mode flag of the version tags.
 
     :rtype: Optional[str]
     """
+    from .refs import read_refs
+    from .tags import get_tag_index, get_tag_pattern
+
+    # NOTE: The HEAD that has only one version tag, and it is the highest
+    #   version of all tags, is its latest tag, so it reads only the refs
+    #   files without any git command.
+    try:
+        refs = read_refs()
+    except subprocess.CalledProcessError:
+        refs = None
+    if refs is not None:
+        pattern = get_tag_pattern(is_dt)
+        tags: list[str] = [
+            tag
+            for tag in refs.tags_at(refs.head_commit)
+            if pattern.fullmatch(tag)
+        ]
+        if (
+            len(tags) == 1
+            and (latest := get_tag_index(is_dt).latest()) is not None
+            and latest.name == tags[0]
+        ):
+            return tags[0]
+
+    # NOTE: The latest tag is the highest version tag that the HEAD reaches,
+    #   so the tags that were created out of order or on the backport branches
+    #   do not shadow it.
+    try:
+        if latest := get_tag_index(is_dt, merged="HEAD").latest():
+            return latest.name
+    except subprocess.CalledProcessError:
+        pass
+
     try:
         return (
-            subprocess.check_output(
+            runner.output(
                 ["git", "describe", "--tags", "--abbrev=0"],
+                cache=True,
                 stderr=subprocess.DEVNULL,
             )
             .decode(sys.stdout.encoding)
@@ -443,36 +538,188 @@ def get_latest_tag(default: bool = True) -> Optional[str]:
         return DEFAULT_TAG if default else None
 
 
-def gen_commit_logs(tag2head: str) -> Iterator[list[str]]:  # pragma: no cov
-    """Prepare contents logs to List of commit log.
+@lru_cache(maxsize=None)
+def _git_tz(offset: bytes) -> timezone:
+    """Return the timezone object from an UTC offset bytes, like ``b"+0700"``.
+
+    :param offset: An UTC offset bytes that formatted by ``%z``.
+
+    :rtype: timezone
+    """
+    sign: int = -1 if offset[:1] == b"-" else 1
+    return timezone(
+        sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CommitRecord:
+    """Commit Record dataclass that keep the raw bytes fields of a commit from
+    the `git log` record format and decode them as UTF-8 only when they are
+    used.
+    """
+
+    fields: tuple[bytes, ...]
+
+    @classmethod
+    def parse(cls, record: bytes) -> CommitRecord:
+        """Split a record bytes to its fields. The body is the last field, so
+        it does not split by any separator that it keeps.
+
+        :param record: A record bytes without the NUL terminator.
+
+        :rtype: CommitRecord
+        """
+        fields: list[bytes] = record.split(b"\x1e", GIT_LOG_FIELDS - 1)
+        if len(fields) != GIT_LOG_FIELDS:
+            raise ValueError(f"The commit record does not valid, {record!r}.")
+        return cls(tuple(fields))
+
+    @property
+    def hash_full(self) -> str:
+        return self.fields[0].decode("utf-8")
+
+    @property
+    def hash(self) -> str:
+        return self.fields[1].decode("utf-8")
+
+    @property
+    def refs(self) -> str:
+        return self.fields[2].decode("utf-8", "replace")
+
+    @property
+    def timestamp(self) -> int:
+        return int(self.fields[3])
+
+    @property
+    def offset(self) -> str:
+        return self.fields[4].decode("utf-8")
+
+    @property
+    def date(self) -> datetime:
+        return datetime.fromtimestamp(
+            int(self.fields[3]), _git_tz(self.fields[4])
+        )
+
+    @property
+    def author(self) -> Profile:
+        return Profile(
+            self.fields[5].decode("utf-8", "replace"),
+            self.fields[6].decode("utf-8", "replace"),
+        )
+
+    @property
+    def subject(self) -> str:
+        return self.fields[7].decode("utf-8", "replace")
+
+    @property
+    def body(self) -> str:
+        """Return the body of commit message that mark new-line with ``|``."""
+        if not (body := self.fields[8].rstrip(b"\r\n")):
+            return ""
+        return (
+            body.decode("utf-8", "replace")
+            .replace("\r\n", "\n")
+            .replace("\n", "|")
+        )
+
+    def commit_msg(self) -> CommitMsg:
+        """Return the CommitMsg object that parse from the subject and body of
+        this commit record.
+
+        :rtype: CommitMsg
+        """
+        return CommitMsg(content=self.subject, body=self.body)
+
+
+def parse_commit_records(chunks: Iterable[bytes]) -> Iterator[CommitRecord]:
+    """Parse the NUL terminated commit records from chunks of the `git log`
+    output bytes.
+
+    :param chunks: An iterable of bytes chunk that does not align with records.
+
+    :rtype: Iterator[CommitRecord]
+    """
+    remain: bytes = b""
+    for chunk in chunks:
+        records: list[bytes] = (remain + chunk).split(b"\0")
+        remain = records.pop()
+        for record in records:
+            yield CommitRecord.parse(record)
+
+    if remain:
+        yield CommitRecord.parse(remain)
+
+
+def gen_commit_logs(tag2head: str) -> Iterator[CommitRecord]:
+    """Prepare contents logs to CommitRecord objects. It reads the commit
+    objects natively if the ``git.native_log`` config was enabled, and falls
+    back to `git log` whenever the native reader meets anything that it does
+    not support.
 
     :param tag2head: A length of log format string that want to get log from git
         log cli.
 
-    :rtype: Iterator[list[str]]
+    :rtype: Iterator[CommitRecord]
     """
-    prepare: list[str] = []
-    for line in (
-        subprocess.check_output(
-            [
-                "git",
-                "log",
-                tag2head,
-                f"--pretty=format:{GIT_LOG_FORMAT}",
-                "--date=iso8601-strict",
-            ]
-        )
-        .decode(sys.stdout.encoding)
-        .strip()
-        .splitlines()
-    ):
-        # NOTE: Release log data if it found end line marking.
-        if line == "(END)":
-            yield prepare
-            prepare = []
-            continue
+    if not load_config().get("git", {}).get("native_log", False):
+        yield from gen_commit_logs_git(tag2head)
+        return
+
+    from .objects import UnsupportedObject, walk_commit_records
+
+    yielded: set[str] = set()
+    try:
+        for record in walk_commit_records(tag2head):
+            yield record
+            yielded.add(record.hash_full)
+        return
+    except (UnsupportedObject, subprocess.CalledProcessError):
+        pass
+
+    # NOTE: The order of the commits with the same dates may differ between
+    #   both paths, so it skips the commits that the native reader already
+    #   yielded by their hashes.
+    for record in gen_commit_logs_git(tag2head):
+        if record.hash_full not in yielded:
+            yield record
+
+
+def gen_commit_logs_git(tag2head: str) -> Iterator[CommitRecord]:
+    """Prepare contents logs to CommitRecord objects from `git log`. It reads
+    the output from a live pipe, so each commit log is yielded as soon as git
+    writes it, and the git process is terminated if this generator was closed
+    before the end of its output.
+
+    :param tag2head: A revision range that want to get the commit logs.
+
+    :rtype: Iterator[CommitRecord]
+    """
+    cmd: list[str] = [
+        "git",
+        "log",
+        "-z",
+        tag2head,
+        f"--pretty=tformat:{GIT_LOG_FORMAT}",
+        "--date=format:%z",
+        # NOTE: The consumers read only the tag decorations.
+        "--decorate-refs=refs/tags/",
+    ]
+    with runner.popen(cmd, stdout=subprocess.PIPE) as proc:
+        finished: bool = False
+        try:
+            yield from parse_commit_records(
+                iter(lambda: proc.stdout.read1(GIT_LOG_CHUNK), b"")
+            )
+            finished = True
+        finally:
+            # NOTE: Terminate the git process if the consumer stop reading
+            #   before the end of its output.
+            if not finished and proc.poll() is None:
+                proc.terminate()
 
-        prepare.append(line)
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
 
 
 def get_commit_logs(
@@ -481,6 +728,7 @@ def get_commit_logs(
     all_logs: bool = False,
     excluded: Optional[list[str]] = None,
     is_dt: bool = False,
+    rev_range: Optional[str] = None,
 ) -> Iterator[CommitLog]:  # pragma: no cov
     """Return a list of message that getting from commit log command.
 
@@ -492,49 +740,51 @@ def get_commit_logs(
     :type excluded: Optional[list[str]] (=None)
     :param is_dt: A datetime mode flag.
     :type is_dt: bool(=False)
+    :param rev_range: A revision range that override the tag and all_logs
+        values, like ``v0.0.1..v0.0.2``.
+    :type rev_range: Optional[str] (=None)
 
     :rtype: Iterator[CommitLog]
     """
-    from .settings import BumpVerConf
-
     # NOTE: Prepare tag to head value for getting Git logs.
-    if tag:
-        tag2head: str = f"{tag}..HEAD"
-    elif all_logs or not (tag := get_latest_tag(default=False)):
+    if rev_range:
+        tag2head: str = rev_range
+    elif tag:
+        tag2head = f"{tag}..HEAD"
+    elif all_logs or not (tag := get_latest_tag(default=False, is_dt=is_dt)):
         tag2head = "HEAD"
     else:
         tag2head = f"{tag}..HEAD"
 
-    refs: str = "HEAD"
-    for logs in gen_commit_logs(tag2head):
+    from .index import CommitIndex
+    from .tags import Tag, get_tag_index
+
+    # NOTE: Read the parsed commits from the commit index if it was built and
+    #   it is still fresh.
+    records: Iterator[CommitRecord] = (
+        index.gen_commit_logs(tag2head)
+        if (index := CommitIndex.open_fresh())
+        else gen_commit_logs(tag2head)
+    )
 
+    tagged: dict[str, Tag] = get_tag_index(is_dt).by_commit
+    refs: str = "HEAD"
+    for record in records:
+        subject: str = record.subject
         if any(
-            re.search(s, logs[1]) is not None for s in (excluded or [r"^Merge"])
+            re.search(s, subject) is not None for s in (excluded or [r"^Merge"])
         ):
             continue
 
-        header: list[str] = logs[0].split("|")
-        if ref_tag := [
-            ref.strip() for ref in header[1].strip().split(",") if "tag:" in ref
-        ]:
-            if search := re.search(
-                rf"tag:\sv?(?P<version>{BumpVerConf.get_regex(is_dt)})",
-                ref_tag[0],
-            ):
-                refs = search.groupdict()["version"]
+        if (tag_ref := tagged.get(record.hash_full)) is not None:
+            refs = tag_ref.version
 
         yield CommitLog(
-            hash=header[0],
+            hash=record.hash,
             refs=refs,
-            date=datetime.fromisoformat(header[2]),
-            msg=CommitMsg(
-                content=logs[1],
-                body="|".join(logs[2:]),
-            ),
-            author=Profile(
-                name=header[3],
-                email=header[4],
-            ),
+            date=record.date,
+            msg=record.commit_msg(),
+            author=record.author,
         )
 
 
@@ -542,12 +792,37 @@ def merge2latest_commit(no_verify: bool = False) -> None:  # pragma: no cov
     """Merge all stage changes to the previous commit with the same commit
     message.
     """
-    subprocess.run(
+    runner.run(
         ["git", "commit", "--amend", "--no-edit", "-a"]
         + (["--no-verify"] if no_verify else [])
     )
 
 
+def check_commit_msg(
+    raw_msg: list[str],
+    edit: bool = False,
+) -> tuple[list[str], list[str], Level]:
+    """Return the lines of commit message without the comment lines, and its
+    validation messages and level. The first line will be prepared with the
+    emoji prefix if the edit flag was set and the message was valid.
+
+    :param raw_msg: A list of line from commit message.
+    :param edit: An edit flag that prepare the first line of commit message.
+
+    :rtype: tuple[list[str], list[str], Level]
+    """
+    lines: list[str] = [
+        msg for msg in raw_msg if not msg.strip().startswith("#")
+    ]
+    if lines[-1] != "":
+        lines += [""]  # Add end-of-file line
+
+    rss, level = validate_commit_msg(lines)
+    if edit and level in (Level.OK, Level.WARNING):
+        lines[0] = CommitMsg(content=lines[0]).content
+    return lines, rss, level
+
+
 def get_latest_commit(
     file: Optional[str] = None,
     edit: bool = False,
@@ -564,30 +839,23 @@ def get_latest_commit(
     if file:
         with Path(file).open(encoding="utf-8") as f_msg:
             raw_msg = f_msg.read().splitlines()
+    elif obj := get_cat_file().get("HEAD"):
+        raw_msg = obj.message().strip().splitlines()
     else:
         raw_msg = (
-            subprocess.check_output(
-                ["git", "log", "HEAD^..HEAD", "--pretty=format:%B"]
+            runner.output(
+                ["git", "log", "HEAD^..HEAD", "--pretty=format:%B"], cache=True
             )
             .decode(sys.stdout.encoding)
             .strip()
             .splitlines()
         )
-    lines: list[str] = [
-        msg for msg in raw_msg if not msg.strip().startswith("#")
-    ]
-    if lines[-1] != "":
-        lines += [""]  # Add end-of-file line
-
-    rss, level = validate_commit_msg(lines)
+    lines, rss, level = check_commit_msg(raw_msg, edit=edit)
     for rs in rss:
         click.echo(make_color(rs, level))
     if level not in (Level.OK, Level.WARNING):
         sys.exit(1)
 
-    if edit:
-        lines[0] = CommitMsg(content=lines[0]).content
-
     if file and output_file:
         with Path(file).open(mode="w", encoding="utf-8", newline="") as f_msg:
             f_msg.write(f"{os.linesep}".join(lines))
@@ -634,7 +902,7 @@ def cm(
     else:
         edit: bool = True
         _cm_msg: str = "\n".join(get_latest_commit(file, edit, output_file))
-        subprocess.run(
+        runner.run(
             [
                 "git",
                 "commit",
@@ -685,10 +953,10 @@ def cm_revert(force: bool, number: int = 1) -> None:  # pragma: no cov
     :param force: A force flag that restore and clean all stage after reset.
     :param number: A number of commit that want to revert from the HEAD.
     """
-    subprocess.run(["git", "reset", f"HEAD~{number}"])
+    runner.run(["git", "reset", f"HEAD~{number}"])
     if force:
-        subprocess.run(["git", "restore", "."])
-        subprocess.run(["git", "clean", "-f"])
+        runner.run(["git", "restore", "."])
+        runner.run(["git", "clean", "-f"])
     sys.exit(0)
 
 
@@ -738,7 +1006,7 @@ def mg(
         strategy = "ours"
     else:
         strategy = "theirs"
-    subprocess.run(
+    runner.run(
         [
             "git",
             "merge",
@@ -755,26 +1023,21 @@ def mg(
 @cli_git.command()
 def bn_clear() -> NoReturn:  # pragma: no cov
     """Clear Local Branches that sync from the Remote repository."""
-    subprocess.run(
+    runner.run(
         ["git", "checkout", "main"],
         stderr=subprocess.DEVNULL,
         stdout=subprocess.DEVNULL,
     )
-    subprocess.run(
+    runner.run(
         # Or, use ``git remote prune origin``.
         ["git", "remote", "update", "origin", "--prune"],
         stdout=subprocess.DEVNULL,
     )
-    branches = (
-        subprocess.check_output(["git", "branch", "-vv"])
-        .decode(sys.stdout.encoding)
-        .strip()
-        .splitlines()
-    )
-    for branch in branches:
-        if ": gone]" in branch:
-            subprocess.run(["git", "branch", "-D", branch.strip().split()[0]])
-    subprocess.run(["git", "checkout", "-"])
+    from .refs import get_gone_branches
+
+    for branch in get_gone_branches():
+        runner.run(["git", "branch", "-D", branch])
+    runner.run(["git", "checkout", "-"])
     sys.exit(0)
 
 
@@ -792,34 +1055,99 @@ def tg_bump(push: bool = False) -> None:  # pragma: no cov
     :param push: A push flag that will push a tag to remote if it set to True.
     """
     latest_tag: str = get_latest_tag(default=False)
-    subprocess.run(
+    runner.run(
         ["git", "tag", "-d", f"{latest_tag}"],
         stderr=subprocess.DEVNULL,
     )
-    subprocess.run(
+    runner.run(
         ["git", "fetch", "--prune", "--prune-tags"],
         stdout=subprocess.DEVNULL,
     )
-    subprocess.run(["git", "tag", f"{latest_tag}"])
+    runner.run(["git", "tag", f"{latest_tag}"])
     if push:
-        subprocess.run(["git", "push", f"{latest_tag}", "--tags"])
+        runner.run(["git", "push", f"{latest_tag}", "--tags"])
     sys.exit(0)
 
 
 @cli_git.command()
 def tg_clear() -> None:  # pragma: no cov
     """Clear Local Tags that sync from the Remote repository."""
-    subprocess.run(
+    runner.run(
         ["git", "fetch", "--prune", "--prune-tags"],
         stdout=subprocess.DEVNULL,
     )
     sys.exit(0)
 
 
+@cli_git.group(name="index")
+def cli_index():
+    """The Commit Index commands"""
+    pass  # pragma: no cov
+
+
+@cli_index.command(name="build")
+@click.option(
+    "-f",
+    "--force",
+    is_flag=True,
+    help="If True, it will rebuild all commits of the index.",
+)
+def index_build(force: bool = False) -> NoReturn:  # pragma: no cov
+    """Build or update the commit index from the last indexed commit to HEAD.
+
+    \f
+    :param force: A force flag that rebuild all commits of the index.
+    """
+    from .index import CommitIndex
+
+    count: int = CommitIndex.from_repo().build(force=force)
+    click.echo(make_color(f"Indexed {count} new commits.", Level.OK))
+    sys.exit(0)
+
+
+@cli_index.command(name="status")
+def index_status() -> NoReturn:  # pragma: no cov
+    """Show the status of the commit index."""
+    from .index import CommitIndex
+
+    index = CommitIndex.from_repo()
+    status = index.status()
+    if not status.exists:
+        click.echo(
+            make_color(f"Index does not exist: {index.path}", Level.INFO)
+        )
+        sys.exit(0)
+
+    click.echo(f"path:    {index.path}")
+    click.echo(f"commits: {status.count}")
+    click.echo(f"tip:     {status.tip or '-'}")
+    click.echo(f"head:    {status.head or '-'}")
+    click.echo(f"config:  {'ok' if status.config else 'changed'}")
+    click.echo(f"tags:    {'ok' if status.tags else 'changed'}")
+    click.echo(
+        make_color("fresh", Level.OK)
+        if status.fresh
+        else make_color("stale", Level.WARNING)
+    )
+    sys.exit(0)
+
+
+@cli_index.command(name="drop")
+def index_drop() -> NoReturn:  # pragma: no cov
+    """Remove the commit index file."""
+    from .index import CommitIndex
+
+    if CommitIndex.from_repo().drop():
+        click.echo(make_color("Dropped the commit index.", Level.OK))
+    else:
+        click.echo(make_color("Index does not exist.", Level.INFO))
+    sys.exit(0)
+
+
 @cli_git.command()
 def cm_prefix() -> None:  # pragma: no cov
     """Show the commit prefix that setting in current config."""
-    emojis = {e["alias"]: e["emoji"] for e in get_emojis()}
+    emojis: dict[str, str] = load_emoji_data().to_emoji
     rs: dict[str, dict[str, Union[list[str], str]]] = {}
     rs_not_found = []
     for cp in get_commit_prefix():
@@ -0,0 +1,359 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import heapq
+import mmap
+import struct
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Final, Optional
+
+from .objects import Commit, ObjectStore, UnsupportedObject
+from .refs import Refs, get_common_dir, read_refs
+
+GRAPH_MAGIC: Final[bytes] = b"CGPH"
+GRAPH_NO_PARENT: Final[int] = 0x70000000
+GRAPH_EXTRA_EDGES: Final[int] = 0x80000000
+GRAPH_LAST_EDGE: Final[int] = 0x80000000
+
+# NOTE: A number of commits that are not in the commit-graph file, like the new
+#   commits after the last ``git gc``, that it reads from the object store
+#   before it gives up.
+MAX_UNGRAPHED: Final[int] = 10_000
+
+REACHED: Final[int] = 1
+EXCLUDED: Final[int] = 2
+
+
+class CommitGraph:
+    """Commit Graph object that read the parents and the generation numbers of
+    the commits from the ``objects/info/commit-graph`` file through ``mmap``.
+    It supports only the single file of the SHA-1 repository, not the split
+    commit-graph chain.
+
+    :param path: A commit-graph file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self.mm: mmap.mmap = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        try:
+            self.chunks: dict[bytes, int] = self._read_chunks()
+            if any(c not in self.chunks for c in (b"OIDF", b"OIDL", b"CDAT")):
+                raise UnsupportedObject("The commit-graph chunks are missing.")
+        except BaseException:
+            self.mm.close()
+            raise
+        self.fanout: tuple[int, ...] = struct.unpack_from(
+            ">256I", self.mm, self.chunks[b"OIDF"]
+        )
+        self.count: int = self.fanout[255]
+
+    def _read_chunks(self) -> dict[bytes, int]:
+        magic, version, hash_version, count, bases = struct.unpack_from(
+            ">4sBBBB", self.mm, 0
+        )
+        if magic != GRAPH_MAGIC or version != 1 or hash_version != 1:
+            raise UnsupportedObject(
+                "The commit-graph version does not support."
+            )
+        if bases:
+            raise UnsupportedObject("The commit-graph chain does not support.")
+        return dict(
+            struct.unpack_from(">4sQ", self.mm, 8 + i * 12)
+            for i in range(count)
+        )
+
+    @classmethod
+    def open(cls, git_dir: Path) -> Optional[CommitGraph]:
+        """Return the commit-graph of a repository or None if it was not
+        written.
+
+        :param git_dir: A git directory path.
+
+        :rtype: Optional[CommitGraph]
+        """
+        info: Path = get_common_dir(git_dir) / "objects" / "info"
+        if (info / "commit-graphs").is_dir():
+            raise UnsupportedObject("The commit-graph chain does not support.")
+        if not (path := info / "commit-graph").exists():
+            return None
+        return cls(path)
+
+    def __enter__(self) -> CommitGraph:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def oid(self, pos: int) -> str:
+        start: int = self.chunks[b"OIDL"] + pos * 20
+        return self.mm[start : start + 20].hex()
+
+    def find(self, oid: str) -> Optional[int]:
+        """Return the position of a commit or None if it is not in this graph.
+
+        :param oid: A full commit hash.
+
+        :rtype: Optional[int]
+        """
+        name: bytes = bytes.fromhex(oid)
+        lo: int = self.fanout[name[0] - 1] if name[0] else 0
+        hi: int = self.fanout[name[0]]
+        base: int = self.chunks[b"OIDL"]
+        while lo < hi:
+            mid: int = (lo + hi) // 2
+            current: bytes = self.mm[base + mid * 20 : base + mid * 20 + 20]
+            if current == name:
+                return mid
+            elif current < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def commit(self, pos: int) -> tuple[tuple[str, ...], int]:
+        """Return the parents and the topological generation number of a
+        commit at a position.
+
+        :param pos: A position of the commit.
+
+        :rtype: tuple[tuple[str, ...], int]
+        """
+        start: int = self.chunks[b"CDAT"] + pos * 36 + 20
+        first, second, high, _ = struct.unpack_from(">IIII", self.mm, start)
+        generation: int = high >> 2
+        if generation == 0:
+            raise UnsupportedObject("The commit-graph has no generations.")
+
+        parents: list[int] = []
+        if first != GRAPH_NO_PARENT:
+            parents.append(first)
+        if second & GRAPH_EXTRA_EDGES:
+            if (edges := self.chunks.get(b"EDGE")) is None:
+                raise UnsupportedObject("The commit-graph edges are missing.")
+            i: int = second & ~GRAPH_EXTRA_EDGES
+            while True:
+                edge: int = struct.unpack_from(">I", self.mm, edges + i * 4)[0]
+                parents.append(edge & ~GRAPH_LAST_EDGE)
+                if edge & GRAPH_LAST_EDGE:
+                    break
+                i += 1
+        elif second != GRAPH_NO_PARENT:
+            parents.append(second)
+        return tuple(self.oid(p) for p in parents), generation
+
+    def close(self) -> None:
+        self.mm.close()
+
+
+class Ancestry:
+    """Ancestry object that answer the reachability queries of the commits by
+    walking them in the order of their generation numbers. A commit always has
+    a greater generation than its parents, so the walk is able to stop as soon
+    as the remaining commits can not change the answer.
+
+    :param graph: A commit-graph of the repository.
+    :param store: An object store that read the commits that are not in the
+        commit-graph.
+    """
+
+    def __init__(self, graph: CommitGraph, store: ObjectStore) -> None:
+        self.graph: CommitGraph = graph
+        self.store: ObjectStore = store
+        self._nodes: dict[str, tuple[tuple[str, ...], int]] = {}
+
+    def node(self, oid: str) -> tuple[tuple[str, ...], int]:
+        """Return the parents and the generation number of a commit. The
+        generation of a commit that is not in the commit-graph is computed
+        from its parents.
+
+        :param oid: A full commit hash.
+
+        :rtype: tuple[tuple[str, ...], int]
+        """
+        if (hit := self._nodes.get(oid)) is not None:
+            return hit
+
+        stack: list[str] = [oid]
+        pending: dict[str, tuple[str, ...]] = {}
+        while stack:
+            current: str = stack[-1]
+            if current in self._nodes:
+                stack.pop()
+                continue
+            if (pos := self.graph.find(current)) is not None:
+                self._nodes[current] = self.graph.commit(pos)
+                stack.pop()
+                continue
+            if (parents := pending.get(current)) is None:
+                if len(pending) >= MAX_UNGRAPHED:
+                    raise UnsupportedObject("Too many commits are not graphed.")
+                kind, data = self.store.read(current)
+                if kind != "commit":
+                    raise UnsupportedObject(
+                        f"Object {current} is not a commit."
+                    )
+                parents = pending[current] = Commit.parse(current, data).parents
+            if missing := [p for p in parents if p not in self._nodes]:
+                stack.extend(missing)
+                continue
+            self._nodes[current] = (
+                parents,
+                1 + max((self._nodes[p][1] for p in parents), default=0),
+            )
+            stack.pop()
+        return self._nodes[oid]
+
+    def generation(self, oid: str) -> int:
+        return self.node(oid)[1]
+
+    def is_ancestor(self, ancestor: str, commit: str) -> bool:
+        """Return True if a commit reaches the ancestor commit. It does not
+        walk the commits that have a lower generation than the ancestor.
+
+        :param ancestor: A full commit hash of the ancestor.
+        :param commit: A full commit hash.
+
+        :rtype: bool
+        """
+        floor: int = self.generation(ancestor)
+        seen: set[str] = {commit}
+        stack: list[str] = [commit]
+        while stack:
+            if (current := stack.pop()) == ancestor:
+                return True
+            for parent in self.node(current)[0]:
+                if parent not in seen and self.generation(parent) >= floor:
+                    seen.add(parent)
+                    stack.append(parent)
+        return False
+
+    def distance(self, head: str, base: str) -> int:
+        """Return the number of commits that reach from the head but not from
+        the base, like the ``git rev-list --count base..head`` command.
+
+        :param head: A full commit hash of the head.
+        :param base: A full commit hash of the base.
+
+        :rtype: int
+        """
+        flags: dict[str, int] = {head: REACHED}
+        flags[base] = flags.get(base, 0) | EXCLUDED
+        queue: list[tuple[int, str]] = [
+            (-self.generation(oid), oid) for oid in flags
+        ]
+        heapq.heapify(queue)
+        # NOTE: The walk stops when all queued commits reach from the base.
+        pending: int = sum(not f & EXCLUDED for f in flags.values())
+        count: int = 0
+        while pending:
+            _, oid = heapq.heappop(queue)
+            flag: int = flags[oid]
+            if not flag & EXCLUDED:
+                pending -= 1
+                count += 1
+            for parent in self.node(oid)[0]:
+                if (current := flags.get(parent)) is None:
+                    flags[parent] = flag
+                    heapq.heappush(queue, (-self.generation(parent), parent))
+                    if not flag & EXCLUDED:
+                        pending += 1
+                elif current | flag != current:
+                    flags[parent] = current | flag
+                    if not current & EXCLUDED and flag & EXCLUDED:
+                        pending -= 1
+        return count
+
+    def describe(
+        self,
+        head: str,
+        tagged: dict[str, list[str]],
+    ) -> Optional[tuple[str, int]]:
+        """Return the tag that has the fewest commits on top of it and that
+        number, like the ``git describe --tags --long`` command. It walks from
+        the head by the generation, and a commit that pops after ``n`` commits
+        has at least ``n`` commits on top of it, so it stops when no later tag
+        is able to be nearer.
+
+        :param head: A full commit hash of the head.
+        :param tagged: A mapping of commits and their tag names.
+
+        :raise UnsupportedObject: If more than one tag has the fewest commits,
+            so the choice depends on the tag dates.
+
+        :rtype: Optional[tuple[str, int]]
+        :return: A pair of tag name and distance, or None if no tag reaches.
+        """
+        best: Optional[tuple[list[str], int]] = None
+        tie: bool = False
+        seen: set[str] = {head}
+        queue: list[tuple[int, str]] = [(-self.generation(head), head)]
+        popped: int = 0
+        while queue:
+            if best is not None and popped > best[1]:
+                break
+            _, oid = heapq.heappop(queue)
+            if (names := tagged.get(oid)) is not None:
+                depth: int = self.distance(head, oid)
+                if best is None or depth < best[1]:
+                    best, tie = (names, depth), False
+                elif depth == best[1]:
+                    tie = True
+            popped += 1
+            for parent in self.node(oid)[0]:
+                if parent not in seen:
+                    seen.add(parent)
+                    heapq.heappush(queue, (-self.generation(parent), parent))
+
+        if best is None:
+            return None
+        if tie or len(best[0]) > 1:
+            raise UnsupportedObject("More than one tag has the same distance.")
+        return best[0][0], best[1]
+
+
+def describe_head(
+    pattern: str = "*",
+    git_dir: Optional[Path] = None,
+) -> Optional[tuple[str, int, str]]:
+    """Return the nearest tag that matches a pattern, its distance to the HEAD,
+    and the HEAD commit hash from the commit-graph without any subprocess.
+
+    :param pattern: A glob pattern of the tag names, like ``v*``.
+    :param git_dir: A git directory path.
+
+    :raise UnsupportedObject: If the commit-graph was not written or it meets
+        anything that it does not support, so the caller should fall back to
+        the ``git describe`` command.
+
+    :rtype: Optional[tuple[str, int, str]]
+    """
+    if git_dir is None:
+        from .git import get_git_dir
+
+        git_dir = get_git_dir()
+
+    refs: Refs = read_refs(git_dir)
+    if refs.head_commit is None:
+        raise UnsupportedObject("HEAD does not have any commit.")
+
+    tagged: dict[str, list[str]] = {}
+    for tag, commit in refs.tags.items():
+        if fnmatchcase(tag, pattern):
+            tagged.setdefault(commit, []).append(tag)
+
+    if (graph := CommitGraph.open(git_dir)) is None:
+        raise UnsupportedObject("The commit-graph was not written.")
+    with graph, ObjectStore(git_dir) as store:
+        if (
+            rs := Ancestry(graph, store).describe(refs.head_commit, tagged)
+        ) is None:
+            return None
+        return rs[0], rs[1], refs.head_commit
@@ -0,0 +1,390 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import subprocess
+from collections.abc import Iterator
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Final, Optional
+
+from .__about__ import __version__
+from .git import (
+    CommitMsg,
+    CommitRecord,
+    CommitSub,
+    _git_tz,
+    gen_commit_logs,
+    get_git_dir,
+)
+from .refs import read_refs
+from .runner import get_cat_file, runner
+from .utils import Profile, load_config
+
+INDEX_VERSION: Final[int] = 1
+INDEX_FILE: Final[str] = "clishelf/index.sqlite"
+
+# NOTE: SQLite limits the number of host parameters of a single statement.
+INDEX_CHUNK: Final[int] = 500
+
+INDEX_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS meta (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS commits (
+    hash            TEXT PRIMARY KEY,
+    short           TEXT NOT NULL,
+    raw_subject     TEXT NOT NULL,
+    body            TEXT NOT NULL,
+    prefix          TEXT,
+    mtype           TEXT,
+    emoji           TEXT,
+    subject         TEXT,
+    author_name     TEXT NOT NULL,
+    author_email    TEXT NOT NULL,
+    timestamp       INTEGER NOT NULL,
+    tz              TEXT NOT NULL,
+    tag             TEXT NOT NULL DEFAULT ''
+);
+"""
+
+
+def config_hash() -> str:
+    """Return the hash of config values that the parsed commit rows depend on.
+    The clishelf version is included because the default commit prefixes and
+    the emoji dataset ship with the package.
+
+    :rtype: str
+    """
+    return hashlib.sha1(
+        json.dumps(
+            {
+                "index": INDEX_VERSION,
+                "version": __version__,
+                "git": load_config().get("git", {}),
+            },
+            sort_keys=True,
+            default=str,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def get_head() -> Optional[str]:
+    """Return the full commit hash of the HEAD or None if it does not exist.
+
+    :rtype: Optional[str]
+    """
+    return read_refs().head_commit
+
+
+def get_tag_refs() -> dict[str, str]:
+    """Return the mapping of a commit hash and its tag decoration, like the
+    tag part of the `%D` format of git log, from the refs files.
+
+    :rtype: dict[str, str]
+    """
+    return read_refs().tag_refs()
+
+
+def tags_hash(tag_refs: dict[str, str]) -> str:
+    return hashlib.sha1(
+        json.dumps(tag_refs, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+@dataclass(frozen=True)
+class IndexStatus:
+    """Index Status dataclass that keep the state of the commit index compare
+    with the current repository.
+    """
+
+    exists: bool
+    head: Optional[str]
+    tip: Optional[str] = None
+    count: int = 0
+    config: bool = False
+    tags: bool = False
+
+    @property
+    def fresh(self) -> bool:
+        return (
+            self.exists
+            and self.head is not None
+            and self.tip == self.head
+            and self.config
+            and self.tags
+        )
+
+
+@dataclass(frozen=True)
+class IndexedCommit:
+    """Indexed Commit dataclass that keep a row of the commit index. It has the
+    same reading interface with the CommitRecord object.
+    """
+
+    hash_full: str
+    hash: str
+    raw_subject: str
+    body: str
+    prefix: Optional[str]
+    mtype: Optional[str]
+    emoji: Optional[str]
+    parsed_subject: Optional[str]
+    author_name: str
+    author_email: str
+    timestamp: int
+    tz: str
+    refs: str
+
+    @property
+    def date(self) -> datetime:
+        return datetime.fromtimestamp(
+            self.timestamp, _git_tz(self.tz.encode("utf-8"))
+        )
+
+    @property
+    def author(self) -> Profile:
+        return Profile(self.author_name, self.author_email)
+
+    @property
+    def subject(self) -> str:
+        return self.raw_subject
+
+    def commit_msg(self) -> CommitMsg:
+        """Return the CommitMsg object from the parsed columns. It parses the
+        subject again if it could not parse at the indexing time, so it raises
+        the same error with the `git log` path.
+
+        :rtype: CommitMsg
+        """
+        if self.prefix is None:
+            return CommitMsg(content=self.raw_subject, body=self.body)
+        return CommitMsg.from_subject(
+            CommitSub(
+                emoji=self.emoji,
+                prefix=self.prefix,
+                subject=self.parsed_subject,
+            ),
+            mtype=self.mtype,
+            body=self.body,
+        )
+
+
+class CommitIndex:
+    """Commit Index object that keep one row per commit with its parsed commit
+    message on a SQLite file under the git directory, `.git/clishelf/`.
+
+    :param path: A SQLite file path of this index.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+
+    @classmethod
+    def from_repo(cls) -> CommitIndex:
+        """Construct the commit index of the current repository.
+
+        :rtype: CommitIndex
+        """
+        return cls(get_git_dir() / INDEX_FILE)
+
+    @classmethod
+    def open_fresh(cls) -> Optional[CommitIndex]:
+        """Return the commit index of the current repository only if it was
+        built and still fresh, otherwise return None.
+
+        :rtype: Optional[CommitIndex]
+        """
+        try:
+            index: CommitIndex = cls.from_repo()
+        except subprocess.CalledProcessError:
+            return None
+        if not index.path.exists() or not index.status().fresh:
+            return None
+        return index
+
+    def connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn: sqlite3.Connection = sqlite3.connect(self.path)
+        conn.executescript(INDEX_SCHEMA)
+        return conn
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection) -> dict[str, str]:
+        return dict(conn.execute("SELECT key, value FROM meta").fetchall())
+
+    def status(self) -> IndexStatus:
+        """Return the status of this index compare with the current HEAD,
+        config, and tags.
+
+        :rtype: IndexStatus
+        """
+        head: Optional[str] = get_head()
+        if not self.path.exists():
+            return IndexStatus(exists=False, head=head)
+
+        with closing(self.connect()) as conn:
+            meta: dict[str, str] = self._meta(conn)
+            count: int = conn.execute(
+                "SELECT COUNT(*) FROM commits"
+            ).fetchone()[0]
+        return IndexStatus(
+            exists=True,
+            head=head,
+            tip=meta.get("tip"),
+            count=count,
+            config=(
+                meta.get("version") == str(INDEX_VERSION)
+                and meta.get("config") == config_hash()
+            ),
+            tags=meta.get("tags") == tags_hash(get_tag_refs()),
+        )
+
+    @staticmethod
+    def _row(record: CommitRecord) -> tuple[Any, ...]:
+        try:
+            msg: Optional[CommitMsg] = record.commit_msg()
+        except ValueError:
+            msg = None
+        return (
+            record.hash_full,
+            record.hash,
+            record.subject,
+            record.body,
+            msg and msg.subject.prefix,
+            msg and msg.mtype,
+            msg and msg.subject.emoji,
+            msg and msg.subject.subject,
+            (author := record.author).name,
+            author.email,
+            record.timestamp,
+            record.offset,
+        )
+
+    def build(self, force: bool = False) -> int:
+        """Add the new commits from the last indexed tip to the HEAD. It
+        rebuilds all rows if the config hash was changed or the tip does not
+        exist anymore.
+
+        :param force: A force flag that rebuild all rows of this index.
+
+        :rtype: int
+        :return: A number of commits that was added to this index.
+        """
+        head: Optional[str] = get_head()
+        tag_refs: dict[str, str] = get_tag_refs()
+        cf_hash: str = config_hash()
+        with closing(self.connect()) as conn, conn:
+            meta: dict[str, str] = self._meta(conn)
+            tip: Optional[str] = meta.get("tip")
+            if (
+                force
+                or meta.get("version") != str(INDEX_VERSION)
+                or meta.get("config") != cf_hash
+                or (tip and not _commit_exists(tip))
+            ):
+                conn.execute("DELETE FROM commits")
+                tip = None
+
+            rows: list[tuple[Any, ...]] = []
+            if head is not None and head != tip:
+                rows = [
+                    self._row(record)
+                    for record in gen_commit_logs(
+                        f"{tip}..HEAD" if tip else "HEAD"
+                    )
+                ]
+                conn.executemany(
+                    "INSERT OR REPLACE INTO commits VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '')",
+                    rows,
+                )
+
+            # NOTE: Tags able to be added to or removed from the commits that
+            #   were already indexed, so it refreshes all of them.
+            conn.execute("UPDATE commits SET tag = '' WHERE tag != ''")
+            conn.executemany(
+                "UPDATE commits SET tag = ? WHERE hash = ?",
+                [(refs, commit) for commit, refs in tag_refs.items()],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                [
+                    ("version", str(INDEX_VERSION)),
+                    ("config", cf_hash),
+                    ("tags", tags_hash(tag_refs)),
+                    ("tip", head or ""),
+                ],
+            )
+        return len(rows)
+
+    def drop(self) -> bool:
+        """Remove the SQLite file of this index.
+
+        :rtype: bool
+        :return: True if the index file was removed.
+        """
+        if not self.path.exists():
+            return False
+        self.path.unlink()
+        return True
+
+    def gen_commit_logs(self, tag2head: str) -> Iterator[IndexedCommit]:
+        """Return the indexed commits of a revision range with the same order
+        of the `git log` command.
+
+        :param tag2head: A revision range that want to get the commit logs.
+
+        :rtype: Iterator[IndexedCommit]
+        """
+        # NOTE: Stream the hashes of the range, so only one chunk of them is
+        #   kept on the memory instead of the whole history.
+        cmd: list[str] = ["git", "rev-list", tag2head]
+        with (
+            runner.popen(cmd, stdout=subprocess.PIPE) as proc,
+            closing(self.connect()) as conn,
+        ):
+            finished: bool = False
+            try:
+                while chunk := [
+                    line.decode("utf-8").strip()
+                    for line in islice(proc.stdout, INDEX_CHUNK)
+                ]:
+                    rows: dict[str, IndexedCommit] = {
+                        row[0]: IndexedCommit(*row)
+                        for row in conn.execute(
+                            f"SELECT * FROM commits WHERE hash IN "
+                            f"({', '.join('?' * len(chunk))})",
+                            chunk,
+                        )
+                    }
+                    for commit in chunk:
+                        if (row := rows.get(commit)) is None:
+                            raise LookupError(
+                                f"The commit {commit} does not exist on the "
+                                f"commit index, please rebuild it."
+                            )
+                        yield row
+                finished = True
+            finally:
+                # NOTE: Terminate the git process if the consumer stop reading
+                #   before the end of its output.
+                if not finished and proc.poll() is None:
+                    proc.terminate()
+
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def _commit_exists(commit: str) -> bool:
+    return get_cat_file().check_many([f"{commit}^{{commit}}"])[0] is not None
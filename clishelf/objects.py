@@ -0,0 +1,707 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final, Optional
+
+from .git import CommitRecord
+from .refs import (
+    HEX_DIGITS,
+    Refs,
+    UnsupportedRefs,
+    get_common_dir,
+    read_config,
+    read_refs,
+)
+
+OBJECT_TYPES: Final[dict[int, str]] = {
+    1: "commit",
+    2: "tree",
+    3: "blob",
+    4: "tag",
+}
+OFS_DELTA: Final[int] = 6
+REF_DELTA: Final[int] = 7
+IDX_MAGIC: Final[bytes] = b"\xfftOc"
+IDX_HEADER: Final[int] = 8 + 256 * 4
+
+# NOTE: A number of base objects of the pack deltas that keep in memory. The
+#   delta chains of the commits are short, so it does not need a large cache.
+DELTA_BASE_CACHE: Final[int] = 256
+INFLATE_CHUNK: Final[int] = 64 * 1024
+DEFAULT_ABBREV: Final[int] = 7
+
+# NOTE: The config keys that change the output of ``git log``, so the native
+#   walker does not support them.
+UNSUPPORTED_CONFIG: Final[tuple[tuple[str, str], ...]] = (
+    ("core", "abbrev"),
+    ("i18n", "logoutputencoding"),
+    ("log", "showsignature"),
+    ("log", "excludedecoration"),
+)
+UNSUPPORTED_ENV: Final[tuple[str, ...]] = (
+    "GIT_DIR",
+    "GIT_OBJECT_DIRECTORY",
+    "GIT_ALTERNATE_OBJECT_DIRECTORIES",
+    "GIT_CONFIG_PARAMETERS",
+    "GIT_CONFIG_COUNT",
+)
+
+
+class UnsupportedObject(Exception):
+    """Unsupported Object error that raises when the native reader meets an
+    object, a repository layout, or a config that it does not support.
+    """
+
+
+def _hex_prefix(a: bytes, b: bytes) -> int:
+    """Return the length of the common hex prefix of two binary names."""
+    for i, (x, y) in enumerate(zip(a, b, strict=False)):
+        if x != y:
+            return i * 2 + ((x >> 4) == (y >> 4))
+    return min(len(a), len(b)) * 2
+
+
+def _varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Return the size varint of a delta and the position after it."""
+    rs: int = 0
+    shift: int = 0
+    while True:
+        c: int = data[pos]
+        pos += 1
+        rs |= (c & 0x7F) << shift
+        shift += 7
+        if not c & 0x80:
+            return rs, pos
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Return the object that rebuild from a base object and a pack delta.
+
+    :param base: A base object content.
+    :param delta: A delta data of the pack entry.
+
+    :rtype: bytes
+    """
+    size, pos = _varint(delta, 0)
+    if size != len(base):
+        raise UnsupportedObject("The delta base size does not match.")
+    size, pos = _varint(delta, pos)
+    out: bytearray = bytearray()
+    end: int = len(delta)
+    while pos < end:
+        op: int = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset: int = 0
+            length: int = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    length |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (length or 0x10000)]
+        elif op:
+            out += delta[pos : pos + op]
+            pos += op
+        else:
+            raise UnsupportedObject("The delta opcode 0 is reserved.")
+    if len(out) != size:
+        raise UnsupportedObject("The delta result size does not match.")
+    return bytes(out)
+
+
+class PackIndex:
+    """Pack Index object that binary-search the object names of a version 2
+    ``.idx`` file through ``mmap``.
+
+    :param path: A pack index file path.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self.mm: mmap.mmap = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        if self.mm[:4] != IDX_MAGIC or self.mm[4:8] != b"\x00\x00\x00\x02":
+            self.mm.close()
+            raise UnsupportedObject(f"Pack index {path} is not version 2.")
+        self.fanout: tuple[int, ...] = struct.unpack_from(">256I", self.mm, 8)
+        self.count: int = self.fanout[255]
+
+    def _name(self, i: int) -> bytes:
+        start: int = IDX_HEADER + i * 20
+        return self.mm[start : start + 20]
+
+    def _bisect(self, name: bytes) -> tuple[int, int, int]:
+        """Return the insertion position of a name inside its fanout bucket,
+        and the bucket range.
+        """
+        lo: int = self.fanout[name[0] - 1] if name[0] else 0
+        start, hi = lo, self.fanout[name[0]]
+        end: int = hi
+        while lo < hi:
+            mid: int = (lo + hi) // 2
+            if self._name(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo, start, end
+
+    def find(self, name: bytes) -> Optional[int]:
+        """Return the pack offset of an object or None if it does not exist.
+
+        :param name: A binary object name.
+
+        :rtype: Optional[int]
+        """
+        i, _, end = self._bisect(name)
+        if i == end or self._name(i) != name:
+            return None
+        pos: int = IDX_HEADER + self.count * 24 + i * 4
+        offset: int = struct.unpack_from(">I", self.mm, pos)[0]
+        if offset & 0x80000000:
+            pos = IDX_HEADER + self.count * 28 + (offset & 0x7FFFFFFF) * 8
+            offset = struct.unpack_from(">Q", self.mm, pos)[0]
+        return offset
+
+    def common_prefix(self, name: bytes) -> int:
+        """Return the longest common hex prefix of a name with the other
+        objects of this index.
+
+        :param name: A binary object name.
+
+        :rtype: int
+        """
+        i, start, end = self._bisect(name)
+        rs: int = 0
+        if i > start:
+            rs = _hex_prefix(name, self._name(i - 1))
+        if i < end and self._name(i) == name:
+            i += 1
+        if i < end:
+            rs = max(rs, _hex_prefix(name, self._name(i)))
+        return rs
+
+    def close(self) -> None:
+        self.mm.close()
+
+
+class Pack:
+    """Pack object that read the objects of a packfile through ``mmap`` and
+    resolve their OFS and REF deltas.
+
+    :param idx: A pack index of this pack.
+    :param path: A packfile path.
+    :param store: An object store that resolve the REF delta bases.
+    """
+
+    def __init__(self, idx: PackIndex, path: Path, store: ObjectStore) -> None:
+        self.idx: PackIndex = idx
+        self.store: ObjectStore = store
+        with path.open("rb") as f:
+            self.mm: mmap.mmap = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        if self.mm[:4] != b"PACK":
+            self.mm.close()
+            idx.close()
+            raise UnsupportedObject(f"Packfile {path} is invalid.")
+        self._bases: dict[int, tuple[str, bytes]] = {}
+
+    def _inflate(self, pos: int, size: int) -> bytes:
+        d = zlib.decompressobj()
+        out: list[bytes] = []
+        while not d.eof:
+            if pos >= len(self.mm):
+                raise UnsupportedObject("The pack entry was truncated.")
+            out.append(d.decompress(self.mm[pos : pos + INFLATE_CHUNK]))
+            pos += INFLATE_CHUNK
+        data: bytes = b"".join(out)
+        if len(data) != size:
+            raise UnsupportedObject("The pack entry size does not match.")
+        return data
+
+    def read(self, offset: int) -> tuple[str, bytes]:
+        """Return the type and content of an object at a pack offset.
+
+        :param offset: A pack offset of the object.
+
+        :rtype: tuple[str, bytes]
+        """
+        if (hit := self._bases.get(offset)) is not None:
+            return hit
+
+        mm: mmap.mmap = self.mm
+        c: int = mm[offset]
+        kind: int = (c >> 4) & 7
+        size: int = c & 15
+        shift: int = 4
+        pos: int = offset + 1
+        while c & 0x80:
+            c = mm[pos]
+            pos += 1
+            size |= (c & 0x7F) << shift
+            shift += 7
+
+        if kind in OBJECT_TYPES:
+            rs: tuple[str, bytes] = (
+                OBJECT_TYPES[kind],
+                self._inflate(pos, size),
+            )
+        elif kind == OFS_DELTA:
+            c = mm[pos]
+            pos += 1
+            back: int = c & 0x7F
+            while c & 0x80:
+                c = mm[pos]
+                pos += 1
+                back = ((back + 1) << 7) | (c & 0x7F)
+            base_kind, base = self.read(offset - back)
+            rs = (base_kind, apply_delta(base, self._inflate(pos, size)))
+        elif kind == REF_DELTA:
+            base_kind, base = self.store.read(mm[pos : pos + 20].hex())
+            rs = (base_kind, apply_delta(base, self._inflate(pos + 20, size)))
+        else:
+            raise UnsupportedObject(f"The pack entry type {kind} is invalid.")
+
+        if len(self._bases) >= DELTA_BASE_CACHE:
+            self._bases.pop(next(iter(self._bases)))
+        self._bases[offset] = rs
+        return rs
+
+    def close(self) -> None:
+        self.mm.close()
+        self.idx.close()
+
+
+class ObjectStore:
+    """Object Store object that read the loose objects and the packed objects
+    of a repository without any subprocess. It raises the UnsupportedObject
+    error for the layouts that it does not support, like the alternates, the
+    multi-pack index, or the SHA-256 repository.
+
+    :param git_dir: A git directory path.
+    """
+
+    def __init__(self, git_dir: Path) -> None:
+        self.path: Path = get_common_dir(git_dir) / "objects"
+        if (self.path / "info" / "alternates").exists():
+            raise UnsupportedObject("The alternates do not support.")
+        if (self.path / "pack" / "multi-pack-index").exists():
+            raise UnsupportedObject("The multi-pack index does not support.")
+
+        self.packs: list[Pack] = []
+        self._loose: dict[str, list[bytes]] = {}
+        try:
+            for idx in sorted((self.path / "pack").glob("pack-*.idx")):
+                self.packs.append(
+                    Pack(PackIndex(idx), idx.with_suffix(".pack"), self)
+                )
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> ObjectStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def read(self, oid: str) -> tuple[str, bytes]:
+        """Return the type and content of an object.
+
+        :param oid: A full object name.
+
+        :raise UnsupportedObject: If the object does not exist.
+
+        :rtype: tuple[str, bytes]
+        """
+        if len(oid) != 40:
+            raise UnsupportedObject(f"Object name {oid!r} does not support.")
+        name: bytes = bytes.fromhex(oid)
+        for pack in self.packs:
+            if (offset := pack.idx.find(name)) is not None:
+                return pack.read(offset)
+        try:
+            with (self.path / oid[:2] / oid[2:]).open("rb") as f:
+                data: bytes = zlib.decompress(f.read())
+        except FileNotFoundError as err:
+            raise UnsupportedObject(f"Object {oid} does not exist.") from err
+        header, _, content = data.partition(b"\x00")
+        kind, _, size = header.decode("utf-8").partition(" ")
+        if int(size) != len(content):
+            raise UnsupportedObject(f"Object {oid} was corrupted.")
+        return kind, content
+
+    def abbrev_len(self) -> int:
+        """Return the default abbreviated length of this repository, like the
+        ``auto`` value of ``core.abbrev`` that grows with the packed objects.
+
+        :rtype: int
+        """
+        count: int = sum(pack.idx.count for pack in self.packs)
+        return max(DEFAULT_ABBREV, (count.bit_length() + 1) // 2)
+
+    def abbrev(self, oid: str, length: int) -> str:
+        """Return the shortest unique abbreviation of an object name that is
+        not shorter than a length.
+
+        :param oid: A full object name.
+        :param length: A minimum length of the abbreviation.
+
+        :rtype: str
+        """
+        name: bytes = bytes.fromhex(oid)
+        common: int = max(
+            (pack.idx.common_prefix(name) for pack in self.packs), default=0
+        )
+        if (loose := self._loose.get(oid[:2])) is None:
+            try:
+                loose = self._loose[oid[:2]] = [
+                    bytes.fromhex(oid[:2] + file)
+                    for file in os.listdir(self.path / oid[:2])
+                    if len(file) == 38
+                ]
+            except FileNotFoundError:
+                loose = self._loose[oid[:2]] = []
+        for other in loose:
+            if other != name:
+                common = max(common, _hex_prefix(name, other))
+        return oid[: max(length, common + 1)]
+
+    def close(self) -> None:
+        for pack in self.packs:
+            pack.close()
+        self.packs = []
+
+
+@dataclass(frozen=True, slots=True)
+class Commit:
+    """Commit dataclass that keep the parsed headers and the raw message of a
+    commit object.
+    """
+
+    oid: str
+    parents: tuple[str, ...]
+    committer: bytes
+    timestamp: int
+    message: bytes
+
+    @classmethod
+    def parse(cls, oid: str, data: bytes) -> Commit:
+        """Parse the content of a commit object.
+
+        :param oid: A full commit hash.
+        :param data: A content of the commit object.
+
+        :rtype: Commit
+        """
+        header, _, message = data.partition(b"\n\n")
+        parents: list[str] = []
+        committer: Optional[bytes] = None
+        for line in header.split(b"\n"):
+            if line.startswith(b"parent "):
+                parents.append(line[7:].decode("utf-8"))
+            elif line.startswith(b"committer "):
+                committer = line[10:]
+            elif line.startswith(b"encoding ") and line[9:].lower() not in (
+                b"utf-8",
+                b"utf8",
+            ):
+                raise UnsupportedObject(f"Commit {oid} has other encoding.")
+        if committer is None or b">" not in committer:
+            raise UnsupportedObject(f"Commit {oid} does not have committer.")
+        date: list[bytes] = committer[committer.rindex(b">") + 1 :].split()
+        if not date or not date[0].isdigit():
+            raise UnsupportedObject(f"Commit {oid} has an invalid date.")
+        return cls(oid, tuple(parents), committer, int(date[0]), message)
+
+    def record(self, short: str, refs: bytes) -> CommitRecord:
+        """Return the CommitRecord object with the same fields that the `git
+        log` record format writes.
+
+        :param short: An abbreviated commit hash.
+        :param refs: A decoration of this commit.
+
+        :rtype: CommitRecord
+        """
+        ident: bytes = self.committer
+        mail_begin: int = ident.find(b"<") + 1
+        mail_end: int = ident.find(b">", mail_begin)
+        date: list[bytes] = ident[ident.rindex(b">") + 1 :].split()
+        tz: int = int(date[1]) if len(date) > 1 else 0
+        subject, body = split_message(self.message)
+        return CommitRecord(
+            (
+                self.oid.encode("utf-8"),
+                short.encode("utf-8"),
+                refs,
+                date[0],
+                f"{tz:+05d}".encode("utf-8"),
+                ident[: mail_begin - 1].rstrip(b" \t\n\r"),
+                ident[mail_begin:mail_end],
+                subject,
+                body,
+            )
+        )
+
+
+def _blank(line: bytes) -> bool:
+    return not line.rstrip(b" \t\n\r")
+
+
+def split_message(message: bytes) -> tuple[bytes, bytes]:
+    """Return the subject and the body of a commit message like the ``%s`` and
+    ``%b`` formats of git. The subject joins the lines of the first paragraph
+    with a space.
+
+    :param message: A raw commit message.
+
+    :rtype: tuple[bytes, bytes]
+    """
+    lines: list[bytes] = message.splitlines(keepends=True)
+    i: int = 0
+    while i < len(lines) and _blank(lines[i]):
+        i += 1
+    subject: list[bytes] = []
+    while i < len(lines) and not _blank(lines[i]):
+        subject.append(lines[i].rstrip(b" \t\n\r"))
+        i += 1
+    while i < len(lines) and _blank(lines[i]):
+        i += 1
+    return b" ".join(subject), b"".join(lines[i:])
+
+
+def check_support(git_dir: Path) -> None:
+    """Raise the UnsupportedObject error if the repository or the environment
+    has any setting that changes the commits or the output of ``git log``.
+
+    :param git_dir: A git directory path.
+    """
+    if any(env in os.environ for env in UNSUPPORTED_ENV):
+        raise UnsupportedObject("The git environment variables do not support.")
+
+    common: Path = get_common_dir(git_dir)
+    if (
+        (common / "shallow").exists()
+        or (common / "info" / "grafts").exists()
+        or (common / "refs" / "replace").is_dir()
+    ):
+        raise UnsupportedObject(
+            "The shallow or replaced commits do not support."
+        )
+    try:
+        if "refs/replace/" in (common / "packed-refs").read_text("utf-8"):
+            raise UnsupportedObject("The replaced commits do not support.")
+    except FileNotFoundError:
+        pass
+
+    home: Path = Path.home()
+    xdg: Path = Path(os.environ.get("XDG_CONFIG_HOME") or home / ".config")
+    for path in (
+        Path(os.environ.get("GIT_CONFIG_SYSTEM") or "/etc/gitconfig"),
+        xdg / "git" / "config",
+        Path(os.environ.get("GIT_CONFIG_GLOBAL") or home / ".gitconfig"),
+        common / "config",
+    ):
+        try:
+            sections = read_config(path)
+        except FileNotFoundError:
+            continue
+        except (OSError, UnicodeDecodeError, UnsupportedRefs) as err:
+            raise UnsupportedObject(f"Config {path} does not support.") from err
+        for section, key in UNSUPPORTED_CONFIG:
+            if key in sections.get((section, ""), {}):
+                raise UnsupportedObject(
+                    f"Config {section}.{key} does not support."
+                )
+
+
+def resolve(name: str, refs: Refs, store: ObjectStore) -> str:
+    """Return the commit hash of a revision name. It supports the ``HEAD``, the
+    full object names, and the tag, branch, and remote names.
+
+    :param name: A revision name.
+    :param refs: A refs of the repository.
+    :param store: An object store of the repository.
+
+    :rtype: str
+    """
+    oid: Optional[str] = None
+    mappings: tuple[tuple[str, dict[str, str]], ...] = (
+        ("refs/tags/", refs.tags),
+        ("refs/heads/", refs.branches),
+        ("refs/remotes/", refs.remotes),
+    )
+    if name == "HEAD":
+        oid = refs.head_commit
+    elif len(name) == 40 and HEX_DIGITS.issuperset(name):
+        oid = name
+    elif name.startswith("refs/"):
+        for prefix, mapping in mappings:
+            if name.startswith(prefix):
+                oid = mapping.get(name.removeprefix(prefix))
+                break
+    else:
+        for _, mapping in mappings:
+            if (oid := mapping.get(name)) is not None:
+                break
+    if oid is None:
+        raise UnsupportedObject(f"Revision {name!r} does not support.")
+
+    kind, data = store.read(oid)
+    while kind == "tag":
+        oid = data.partition(b"\n")[0].removeprefix(b"object ").decode("utf-8")
+        kind, data = store.read(oid)
+    if kind != "commit":
+        raise UnsupportedObject(f"Revision {name!r} is not a commit.")
+    return oid
+
+
+class CommitWalk:
+    """Commit Walk object that walk the commits from the newest committer date
+    like the default order of ``git log``. The commits that reach from the
+    uninteresting bottom are excluded.
+
+    :param store: An object store of the repository.
+    :param refs: A refs of the repository for the tag decorations.
+    """
+
+    def __init__(self, store: ObjectStore, refs: Refs) -> None:
+        self.store: ObjectStore = store
+        self.seen: dict[str, Commit] = {}
+        self.uninteresting: set[str] = set()
+        self.queue: list[tuple[int, int, str]] = []
+        # NOTE: The commits on the queue and the number of them that are not
+        #   uninteresting, so the limited walk checks its end in O(1).
+        self.queued: set[str] = set()
+        self.interesting: int = 0
+        self.length: int = store.abbrev_len()
+        self.tags: dict[str, list[str]] = {}
+        for tag in sorted(refs.tags, reverse=True):
+            self.tags.setdefault(refs.tags[tag], []).append(f"tag: {tag}")
+
+    def push(self, oid: str) -> None:
+        """Add a commit to the queue if it was not seen."""
+        if oid in self.seen:
+            return
+        kind, data = self.store.read(oid)
+        if kind != "commit":
+            raise UnsupportedObject(f"Object {oid} is not a commit.")
+        self.seen[oid] = commit = Commit.parse(oid, data)
+        heapq.heappush(self.queue, (-commit.timestamp, len(self.seen), oid))
+        self.queued.add(oid)
+        if oid not in self.uninteresting:
+            self.interesting += 1
+
+    def pop(self) -> Commit:
+        oid: str = heapq.heappop(self.queue)[2]
+        self.queued.discard(oid)
+        if oid not in self.uninteresting:
+            self.interesting -= 1
+        return self.seen[oid]
+
+    def mark(self, oid: str) -> None:
+        """Mark a commit and its seen ancestors as uninteresting."""
+        stack: list[str] = [oid]
+        while stack:
+            if (current := stack.pop()) in self.uninteresting:
+                continue
+            self.uninteresting.add(current)
+            if current in self.queued:
+                self.interesting -= 1
+            if (commit := self.seen.get(current)) is not None:
+                stack.extend(commit.parents)
+
+    def record(self, commit: Commit) -> CommitRecord:
+        return commit.record(
+            self.store.abbrev(commit.oid, self.length),
+            ", ".join(self.tags.get(commit.oid, [])).encode("utf-8"),
+        )
+
+    def walk(self, head: str) -> Iterator[CommitRecord]:
+        """Yield each commit as soon as it pops from the queue."""
+        self.push(head)
+        while self.queue:
+            commit: Commit = self.pop()
+            for parent in commit.parents:
+                self.push(parent)
+            yield self.record(commit)
+
+    def walk_range(self, bottom: str, head: str) -> Iterator[CommitRecord]:
+        """Yield the commits that reach from the head but not from the bottom.
+        It walks until all commits on the queue are uninteresting before it
+        yields, like the limited walk of git.
+        """
+        self.mark(bottom)
+        self.push(bottom)
+        self.push(head)
+        output: list[Commit] = []
+        while self.interesting:
+            commit: Commit = self.pop()
+            if commit.oid in self.uninteresting:
+                for parent in commit.parents:
+                    self.mark(parent)
+                    self.push(parent)
+            else:
+                output.append(commit)
+                for parent in commit.parents:
+                    self.push(parent)
+        for commit in output:
+            if commit.oid not in self.uninteresting:
+                yield self.record(commit)
+
+
+def walk_commit_records(
+    rev_range: str,
+    git_dir: Optional[Path] = None,
+) -> Iterator[CommitRecord]:
+    """Walk the commits of a revision range, like ``HEAD`` or ``v0.0.1..HEAD``,
+    with the same order and record fields of the ``gen_commit_logs`` function
+    without any subprocess. The decoration field keeps only the tags.
+
+    :param rev_range: A revision range that has one or two revision names.
+    :param git_dir: A git directory path.
+
+    :raise UnsupportedObject: If it meets anything that it does not support,
+        so the caller should fall back to the ``git log`` command.
+
+    :rtype: Iterator[CommitRecord]
+    """
+    if git_dir is None:
+        from .git import get_git_dir
+
+        git_dir = get_git_dir()
+
+    if "..." in rev_range or rev_range.startswith("^"):
+        raise UnsupportedObject(
+            f"Revision range {rev_range!r} does not support."
+        )
+
+    check_support(git_dir)
+    refs: Refs = read_refs(git_dir)
+    with ObjectStore(git_dir) as store:
+        walk: CommitWalk = CommitWalk(store, refs)
+        start, sep, end = rev_range.partition("..")
+        if sep:
+            yield from walk.walk_range(
+                resolve(start or "HEAD", refs, store),
+                resolve(end or "HEAD", refs, store),
+            )
+        else:
+            yield from walk.walk(resolve(rev_range, refs, store))
@@ -0,0 +1,188 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Final, Optional, Union
+
+_NULL: Final[nullcontext] = nullcontext()
+_PROFILER: Optional[Profiler] = None
+
+
+class Profiler:
+    """Profiler object that keep the phase timings, and the count and duration
+    of every git subprocess of the runner and ``load_config`` call of a
+    command.
+    """
+
+    def __init__(self) -> None:
+        self.start: float = perf_counter()
+        self.phases: dict[str, list[float]] = {}
+        self.calls: dict[str, list[float]] = {}
+        self.subprocesses: list[dict[str, Any]] = []
+
+    def record(self, kind: str, seconds: float, args: Any = None) -> None:
+        """Record a duration of a call.
+
+        :param kind: A kind of call, like ``git`` or ``load_config``.
+        :param seconds: A duration of this call in seconds.
+        :param args: An argument of the subprocess call.
+        """
+        self.calls.setdefault(kind, []).append(seconds)
+        if args is not None:
+            self.subprocesses.append(
+                {
+                    "args": (
+                        [str(a) for a in args]
+                        if isinstance(args, (list, tuple))
+                        else str(args)
+                    ),
+                    "seconds": seconds,
+                }
+            )
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.setdefault(name, []).append(perf_counter() - start)
+
+    def report(self) -> dict[str, Any]:
+        """Return the timing report of this profiler.
+
+        :rtype: dict[str, Any]
+        """
+        return {
+            "command": sys.argv,
+            "seconds": perf_counter() - self.start,
+            "phases": {
+                name: {"count": len(ts), "seconds": sum(ts)}
+                for name, ts in self.phases.items()
+            },
+            "calls": {
+                kind: {"count": len(ts), "seconds": sum(ts)}
+                for kind, ts in self.calls.items()
+            },
+            "subprocesses": self.subprocesses,
+        }
+
+
+class TimedPopen(subprocess.Popen):
+    """Timed Popen object that records the duration from its start until its
+    first wait was finished to the current profiler. The runner uses it for
+    its streaming commands only while profiling, so it does not replace the
+    Popen class of the other code.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._shelf_start: float = perf_counter()
+        self._shelf_recorded: bool = False
+        super().__init__(*args, **kwargs)
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        rs: int = super().wait(timeout)
+        if not self._shelf_recorded:
+            self._shelf_recorded = True
+            if _PROFILER is not None:
+                _PROFILER.record(
+                    "git",
+                    perf_counter() - self._shelf_start,
+                    args=self.args,
+                )
+        return rs
+
+
+def timed(kind: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Return the decorator that records the duration of a function of this
+    package to the current profiler. It only checks the profiler if profiling
+    is disabled.
+
+    :param kind: A kind of this call.
+
+    :rtype: Callable[[Callable[..., Any]], Callable[..., Any]]
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _PROFILER is None:
+                return func(*args, **kwargs)
+            start: float = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if _PROFILER is not None:
+                    _PROFILER.record(kind, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def get_profiler() -> Optional[Profiler]:
+    return _PROFILER
+
+
+def phase(name: str) -> AbstractContextManager:
+    """Return the context manager that records a phase timing of the current
+    profiler. It returns the shared null context if profiling is disabled, so
+    it does not cost anything.
+
+    :param name: A phase name.
+
+    :rtype: AbstractContextManager
+    """
+    if _PROFILER is None:
+        return _NULL
+    return _PROFILER.phase(name)
+
+
+@contextmanager
+def profile(path: Union[str, Path]) -> Iterator[Profiler]:
+    """Profile all calls inside this context and write the report to a path.
+    It writes the JSON timing report if the path ends with ``.json``,
+    otherwise it writes the pstats file of the cProfile profiler.
+
+    :param path: A report file path.
+
+    :rtype: Iterator[Profiler]
+    """
+    global _PROFILER
+
+    path: Path = Path(path)
+    profiler: Profiler = Profiler()
+    cprofile = None
+    if path.suffix != ".json":
+        import cProfile
+
+        cprofile = cProfile.Profile()
+
+    _PROFILER = profiler
+    if cprofile is not None:
+        cprofile.enable()
+    try:
+        with profiler.phase("command"):
+            yield profiler
+    finally:
+        if cprofile is not None:
+            cprofile.disable()
+        _PROFILER = None
+
+        if cprofile is not None:
+            cprofile.dump_stats(path)
+        else:
+            path.write_text(
+                json.dumps(profiler.report(), indent=2), encoding="utf-8"
+            )
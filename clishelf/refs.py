@@ -0,0 +1,494 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final, Optional
+
+from .runner import get_cat_file, runner
+
+RefsKey = tuple[tuple[str, int], ...]
+
+# NOTE: The number of nested annotated tags that peels before it gives up.
+MAX_PEEL_DEPTH: Final[int] = 5
+HEX_DIGITS: Final[frozenset[str]] = frozenset("0123456789abcdef")
+
+_REFS: dict[str, tuple[RefsKey, Refs]] = {}
+
+
+class UnsupportedRefs(Exception):
+    """Unsupported Refs error that raises when the refs of a repository do not
+    store on the loose and packed files, like the reftable format.
+    """
+
+
+@dataclass(frozen=True)
+class Refs:
+    """Refs dataclass that keep the HEAD, the local branches, the remote
+    branches, and the tags of a repository. The tags map to their peeled
+    commits, so the annotated tags map to the commits that they point to.
+    """
+
+    head: Optional[str]
+    head_commit: Optional[str]
+    branches: dict[str, str] = field(default_factory=dict)
+    remotes: dict[str, str] = field(default_factory=dict)
+    tags: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def branch(self) -> Optional[str]:
+        """Return the current branch name or None if the HEAD was detached."""
+        if self.head and self.head.startswith("refs/heads/"):
+            return self.head.removeprefix("refs/heads/")
+        return None
+
+    def tags_at(self, commit: Optional[str]) -> list[str]:
+        """Return the sorted list of tag names that point to a commit.
+
+        :param commit: A full commit hash.
+
+        :rtype: list[str]
+        """
+        if commit is None:
+            return []
+        return sorted(t for t, c in self.tags.items() if c == commit)
+
+    def tag_refs(self) -> dict[str, str]:
+        """Return the mapping of a commit hash and its tag decoration, like the
+        tag part of the `%D` format of git log.
+
+        :rtype: dict[str, str]
+        """
+        rs: dict[str, list[str]] = {}
+        for name in sorted(self.tags):
+            rs.setdefault(self.tags[name], []).append(f"tag: {name}")
+        return {commit: ", ".join(tags) for commit, tags in rs.items()}
+
+
+def _is_oid(value: str) -> bool:
+    return len(value) in (40, 64) and HEX_DIGITS.issuperset(value)
+
+
+def get_common_dir(git_dir: Path) -> Path:
+    """Return the common git directory that keep the refs of all worktrees.
+
+    :param git_dir: A git directory path.
+
+    :rtype: Path
+    """
+    try:
+        common: str = (git_dir / "commondir").read_text("utf-8").strip()
+    except OSError:
+        return git_dir
+    return git_dir / common
+
+
+def refs_key(git_dir: Path) -> RefsKey:
+    """Return the key that changes when any ref of a repository was changed.
+    Git writes a loose ref to a lock file and renames it, so the mtime of its
+    directory always changes with it.
+
+    :param git_dir: A git directory path.
+
+    :rtype: RefsKey
+    """
+    common: Path = get_common_dir(git_dir)
+    rs: list[tuple[str, int]] = []
+    for path in (git_dir / "HEAD", common / "packed-refs"):
+        try:
+            rs.append((str(path), path.stat().st_mtime_ns))
+        except OSError:
+            rs.append((str(path), -1))
+    for root, _, _ in os.walk(common / "refs"):
+        rs.append((root, os.stat(root).st_mtime_ns))
+    return tuple(rs)
+
+
+def _read_packed(common: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """Return the mapping of refs and their object names, and the mapping of
+    refs and their peeled objects from the packed-refs file.
+    """
+    refs: dict[str, str] = {}
+    peeled: dict[str, str] = {}
+    try:
+        content: str = (common / "packed-refs").read_text("utf-8")
+    except FileNotFoundError:
+        return refs, peeled
+
+    fully_peeled: bool = False
+    last: Optional[str] = None
+    for line in content.splitlines():
+        if line.startswith("#"):
+            fully_peeled = "fully-peeled" in line.split()
+        elif line.startswith("^"):
+            if last is None or not _is_oid(line[1:]):
+                raise UnsupportedRefs(f"Packed refs line {line!r} is invalid.")
+            peeled[last] = line[1:]
+        elif line:
+            oid, _, name = line.partition(" ")
+            if not _is_oid(oid) or not name:
+                raise UnsupportedRefs(f"Packed refs line {line!r} is invalid.")
+            refs[name] = oid
+            last = name
+            # NOTE: The packed ref that does not have a peeled line is not an
+            #   annotated tag if the file was written with all peeled values.
+            if fully_peeled:
+                peeled[name] = oid
+    return refs, peeled
+
+
+def _read_loose(common: Path) -> dict[str, str]:
+    refs: dict[str, str] = {}
+    for root, _, files in os.walk(common / "refs"):
+        for file in files:
+            path: Path = Path(root) / file
+            name: str = path.relative_to(common).as_posix()
+            if name.endswith(".lock"):
+                continue
+            try:
+                value: str = path.read_text("utf-8").strip()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if _is_oid(value):
+                refs[name] = value
+            elif not value.startswith("ref: "):
+                raise UnsupportedRefs(f"Loose ref {name!r} is invalid.")
+    return refs
+
+
+def _peel_loose(common: Path, oid: str) -> Optional[str]:
+    """Return the commit that an object peels to if all the objects on the way
+    are loose objects, otherwise return None.
+    """
+    for _ in range(MAX_PEEL_DEPTH):
+        path: Path = common / "objects" / oid[:2] / oid[2:]
+        try:
+            with path.open("rb") as f:
+                data: bytes = zlib.decompressobj().decompress(f.read(512), 256)
+        except (OSError, zlib.error):
+            return None
+        header, _, body = data.partition(b"\x00")
+        if not header.startswith(b"tag "):
+            return oid
+        target: bytes = body.partition(b"\n")[0]
+        if not target.startswith(b"object "):
+            return None
+        oid = target[7:].decode("utf-8")
+    return None
+
+
+def _read_head(
+    git_dir: Path,
+    refs: dict[str, str],
+) -> tuple[Optional[str], Optional[str]]:
+    try:
+        value: str = (git_dir / "HEAD").read_text("utf-8").strip()
+    except OSError as err:
+        raise UnsupportedRefs("HEAD does not exist.") from err
+    if _is_oid(value):
+        return None, value
+    if not value.startswith("ref: "):
+        raise UnsupportedRefs(f"HEAD value {value!r} is invalid.")
+    head: str = value[5:]
+    return head, refs.get(head)
+
+
+def read_refs_native(git_dir: Path) -> Refs:
+    """Read the refs of a repository from the HEAD, the loose refs, and the
+    packed-refs files without any subprocess. The loose annotated tags that do
+    not store as loose objects are peeled over the shared cat-file process.
+
+    :param git_dir: A git directory path.
+
+    :raise UnsupportedRefs: If the refs do not store on the loose and packed
+        files.
+
+    :rtype: Refs
+    """
+    common: Path = get_common_dir(git_dir)
+    if (common / "reftable").exists():
+        raise UnsupportedRefs("The reftable format does not support.")
+
+    refs, peeled = _read_packed(common)
+    loose: dict[str, str] = _read_loose(common)
+    for name, oid in loose.items():
+        # NOTE: A loose ref overrides the packed ref that has the same name.
+        if refs.get(name) != oid:
+            peeled.pop(name, None)
+        refs[name] = oid
+
+    head, head_commit = _read_head(git_dir, refs)
+    tags: dict[str, str] = {}
+    pending: dict[str, str] = {}
+    for name, oid in refs.items():
+        if not name.startswith("refs/tags/"):
+            continue
+        tag: str = name.removeprefix("refs/tags/")
+        if (commit := peeled.get(name) or _peel_loose(common, oid)) is None:
+            pending[tag] = oid
+        else:
+            tags[tag] = commit
+
+    if pending:
+        objs = get_cat_file().check_many(
+            f"{oid}^{{commit}}" for oid in pending.values()
+        )
+        for tag, obj in zip(pending, objs, strict=True):
+            if obj is not None:
+                tags[tag] = obj.oid
+
+    return Refs(
+        head=head,
+        head_commit=head_commit,
+        branches={
+            n.removeprefix("refs/heads/"): c
+            for n, c in refs.items()
+            if n.startswith("refs/heads/")
+        },
+        remotes={
+            n.removeprefix("refs/remotes/"): c
+            for n, c in refs.items()
+            if n.startswith("refs/remotes/")
+        },
+        tags=tags,
+    )
+
+
+def read_refs_git() -> Refs:
+    """Read the refs of the current repository with the git commands. It is
+    the fallback of the native reader for the reftable format or the unusual
+    layouts.
+
+    :rtype: Refs
+    """
+    branches: dict[str, str] = {}
+    remotes: dict[str, str] = {}
+    tags: dict[str, str] = {}
+    for line in (
+        runner.output(
+            [
+                "git",
+                "for-each-ref",
+                "--format=%(refname)%00%(objectname)%00%(*objectname)",
+            ],
+            cache=True,
+        )
+        .decode("utf-8")
+        .split("\n")
+    ):
+        if not line:
+            continue
+        name, oid, peeled = line.split("\x00")
+        if name.startswith("refs/heads/"):
+            branches[name.removeprefix("refs/heads/")] = oid
+        elif name.startswith("refs/remotes/"):
+            remotes[name.removeprefix("refs/remotes/")] = oid
+        elif name.startswith("refs/tags/"):
+            tags[name.removeprefix("refs/tags/")] = peeled or oid
+
+    head: Optional[str] = None
+    head_commit: Optional[str] = None
+    try:
+        head = (
+            runner.output(
+                ["git", "symbolic-ref", "-q", "HEAD"],
+                cache=True,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode("utf-8")
+            .strip()
+        ) or None
+    except subprocess.CalledProcessError:
+        pass
+    try:
+        head_commit = (
+            runner.output(
+                ["git", "rev-parse", "--verify", "-q", "HEAD"],
+                cache=True,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode("utf-8")
+            .strip()
+        ) or None
+    except subprocess.CalledProcessError:
+        pass
+    return Refs(
+        head=head,
+        head_commit=head_commit,
+        branches=branches,
+        remotes=remotes,
+        tags=tags,
+    )
+
+
+def read_refs(git_dir: Optional[Path] = None) -> Refs:
+    """Return the refs of the current repository. It reads the files of the git
+    directory and caches the result on the mtimes of the HEAD, the packed-refs
+    file, and the refs directories. It falls back to the git commands if the
+    refs do not store on the loose and packed files.
+
+    :param git_dir: A git directory path.
+
+    :rtype: Refs
+    """
+    if git_dir is None:
+        from .git import get_git_dir
+
+        git_dir = get_git_dir()
+
+    cache_key: str = str(git_dir.absolute())
+    try:
+        key: RefsKey = refs_key(git_dir)
+        if (hit := _REFS.get(cache_key)) is not None and hit[0] == key:
+            return hit[1]
+        refs: Refs = read_refs_native(git_dir)
+    except (UnsupportedRefs, OSError, UnicodeDecodeError):
+        return read_refs_git()
+    _REFS[cache_key] = (key, refs)
+    return refs
+
+
+ConfigSections = dict[tuple[str, str], dict[str, list[str]]]
+
+# NOTE: The plain config lines that git writes. A legacy ``[branch.main]``
+#   header does not match because the dot is not in the section names.
+CONFIG_HEADER: Final[re.Pattern[str]] = re.compile(
+    r'\[(?P<name>[A-Za-z0-9-]+)(?:\s+"(?P<sub>[^"\\]*)")?\]'
+)
+CONFIG_ENTRY: Final[re.Pattern[str]] = re.compile(
+    r"(?P<key>[A-Za-z][A-Za-z0-9-]*)\s*(?:=(?P<value>.*))?"
+)
+CONFIG_SPECIALS: Final[str] = '"\\;#'
+
+
+def read_config(path: Path) -> ConfigSections:
+    """Return the sections of a git config file. The section and key names are
+    lower case, and a key keeps all of its values in order. It reads only the
+    plain lines that git writes itself, so the caller falls back to the git
+    command for anything else.
+
+    :param path: A git config file path.
+
+    :raise UnsupportedRefs: If the config has the include sections, the legacy
+        subsection headers, the inline comments, the quoted or escaped
+        values, or the continuation lines.
+
+    :rtype: ConfigSections
+    """
+    sections: ConfigSections = {}
+    values: dict[str, list[str]] = {}
+    for raw in path.read_text("utf-8").splitlines():
+        line: str = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            if (m := CONFIG_HEADER.fullmatch(line)) is None:
+                raise UnsupportedRefs(
+                    f"Config header {line!r} does not support."
+                )
+            name: str = m.group("name").lower()
+            if name in ("include", "includeif"):
+                raise UnsupportedRefs("The config include does not support.")
+            values = sections.setdefault((name, m.group("sub") or ""), {})
+            continue
+        if (m := CONFIG_ENTRY.fullmatch(line)) is None or any(
+            c in (m.group("value") or "") for c in CONFIG_SPECIALS
+        ):
+            raise UnsupportedRefs(f"Config line {line!r} does not support.")
+        values.setdefault(m.group("key").lower(), []).append(
+            (m.group("value") or "").strip()
+        )
+    return sections
+
+
+def read_upstreams(git_dir: Optional[Path] = None) -> dict[str, str]:
+    """Return the mapping of the local branches and their upstream refs from
+    the local config file, like ``main`` and ``refs/remotes/origin/main``. It
+    supports only the default fetch refspecs.
+
+    :param git_dir: A git directory path.
+
+    :raise UnsupportedRefs: If the config has the include sections or a remote
+        that has the custom fetch refspec.
+
+    :rtype: dict[str, str]
+    """
+    if git_dir is None:
+        from .git import get_git_dir
+
+        git_dir = get_git_dir()
+
+    try:
+        sections: ConfigSections = read_config(
+            get_common_dir(git_dir) / "config"
+        )
+    except OSError as err:
+        raise UnsupportedRefs("The config file does not exist.") from err
+
+    rs: dict[str, str] = {}
+    for (section, branch), opts in sections.items():
+        if section != "branch" or "merge" not in opts or "remote" not in opts:
+            continue
+        remote: str = opts["remote"][-1]
+        merge: str = opts["merge"][-1].removeprefix("refs/heads/")
+        if remote == ".":
+            rs[branch] = f"refs/heads/{merge}"
+            continue
+        fetch: list[str] = sections.get(("remote", remote), {}).get("fetch", [])
+        if fetch != [f"+refs/heads/*:refs/remotes/{remote}/*"]:
+            raise UnsupportedRefs(f"Remote {remote!r} has a custom refspec.")
+        rs[branch] = f"refs/remotes/{remote}/{merge}"
+    return rs
+
+
+def get_gone_branches(git_dir: Optional[Path] = None) -> list[str]:
+    """Return the list of local branches that their upstreams were gone, like
+    the ``[origin/main: gone]`` status of the ``git branch -vv`` command.
+
+    :param git_dir: A git directory path.
+
+    :rtype: list[str]
+    """
+    try:
+        upstreams: dict[str, str] = read_upstreams(git_dir)
+    except UnsupportedRefs:
+        return sorted(
+            branch
+            for branch, _, track in (
+                line.partition("\x00")
+                for line in (
+                    runner.output(
+                        [
+                            "git",
+                            "for-each-ref",
+                            "--format=%(refname:lstrip=2)%00%(upstream:track)",
+                            "refs/heads",
+                        ]
+                    )
+                    .decode("utf-8")
+                    .split("\n")
+                )
+            )
+            if track == "[gone]"
+        )
+
+    refs: Refs = read_refs(git_dir)
+    rs: list[str] = []
+    for branch, upstream in sorted(upstreams.items()):
+        if branch not in refs.branches:
+            continue
+        if upstream.startswith("refs/heads/"):
+            exists: bool = upstream[11:] in refs.branches
+        else:
+            exists = upstream[13:] in refs.remotes
+        if not exists:
+            rs.append(branch)
+    return rs
@@ -0,0 +1,461 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import atexit
+import os
+import subprocess
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Final, Optional
+
+# NOTE: A number of object names that write to the cat-file process before
+#   reading their outputs. It keeps the names smaller than the pipe buffer, so
+#   writing never blocks while git waits for its output to be read.
+CAT_FILE_BATCH: Final[int] = 64
+
+StatKey = Optional[tuple[int, int]]
+TreeKey = tuple[tuple[str, StatKey], ...]
+HeadToken = tuple[bytes, StatKey, StatKey, TreeKey, StatKey, StatKey]
+
+# NOTE: The environment variables that set on all read-only git commands. The
+#   optional locks make commands like ``git status`` write the refreshed index
+#   back to the repository.
+GIT_READ_ENV: Final[dict[str, str]] = {"GIT_OPTIONAL_LOCKS": "0"}
+
+
+def _stat(path: Path) -> StatKey:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _stat_tree(path: Path) -> TreeKey:
+    """Return the stats of a directory and all its sub-directories, so a ref
+    that was added to a nested namespace, like ``refs/tags/release``, changes
+    the key too.
+    """
+    return tuple(
+        (os.path.relpath(root, path), _stat(Path(root)))
+        for root, _, _ in os.walk(path)
+    )
+
+
+def find_git_dir() -> Optional[Path]:
+    """Return the absolute git directory of the current path. It does not
+    spawn the git command if the current path is the root of a normal
+    repository.
+
+    :rtype: Optional[Path]
+    :return: A git directory or None if the current path is not in a git
+        repository.
+    """
+    if (git_dir := Path(".git")).is_dir():
+        return git_dir.absolute()
+    try:
+        out: bytes = subprocess.check_output(
+            ["git", "rev-parse", "--absolute-git-dir"],
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, **GIT_READ_ENV},
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return Path(out.decode("utf-8").strip())
+
+
+def get_head_token(git_dir: Optional[Path] = None) -> Optional[HeadToken]:
+    """Return the token that changes when the HEAD, the tags, the local
+    config, or the index of a repository was changed. The refs and the config
+    of a worktree are read from its common directory.
+
+    :param git_dir: A git directory path, or None for the git directory of
+        the current path.
+
+    :rtype: Optional[HeadToken]
+    :return: A token or None if the current path is not in a git repository.
+    """
+    if git_dir is None and (git_dir := find_git_dir()) is None:
+        return None
+    try:
+        head: bytes = (git_dir / "HEAD").read_bytes()
+    except OSError:
+        return None
+    try:
+        common: Path = git_dir / (
+            (git_dir / "commondir").read_text("utf-8").strip()
+        )
+    except OSError:
+        common = git_dir
+    ref: StatKey = None
+    if head.startswith(b"ref: "):
+        ref = _stat(common / head[5:].strip().decode("utf-8"))
+    return (
+        head,
+        ref,
+        _stat(common / "packed-refs"),
+        _stat_tree(common / "refs" / "tags"),
+        _stat(common / "config"),
+        _stat(git_dir / "index"),
+    )
+
+
+class GitRunner:
+    """Git Runner object that runs all git subprocesses of this package with
+    the cheapest spawn settings. It keeps the environment of the read-only
+    commands in one place, records the duration of every command to the
+    profiler, and memoises the read-only commands inside a session that keys
+    on the HEAD token.
+    """
+
+    def __init__(self) -> None:
+        self._env: Optional[dict[str, str]] = None
+        self._memo: Optional[dict[tuple[str, ...], tuple[Any, bytes]]] = None
+        self._git_dirs: dict[str, Optional[Path]] = {}
+
+    @property
+    def read_env(self) -> dict[str, str]:
+        """Return the environment of the read-only commands. It copies the
+        current environment only once per session.
+
+        :rtype: dict[str, str]
+        """
+        if self._memo is None:
+            return {**os.environ, **GIT_READ_ENV}
+        if self._env is None:
+            self._env = {**os.environ, **GIT_READ_ENV}
+        return self._env
+
+    def env(self, **kwargs: str) -> dict[str, str]:
+        """Return a copy of the current environment with extra values.
+
+        :rtype: dict[str, str]
+        """
+        return {**os.environ, **kwargs}
+
+    @contextmanager
+    def session(self) -> Iterator[GitRunner]:
+        """Enable the memoisation of the read-only commands inside this
+        context, like the lifetime of a CLI invocation.
+
+        :rtype: Iterator[GitRunner]
+        """
+        memo = self._memo
+        self._memo = {}
+        try:
+            yield self
+        finally:
+            self._memo = memo
+            self._env = None
+            self._git_dirs.clear()
+
+    def invalidate(self) -> None:
+        """Drop all memoised outputs of the current session."""
+        if self._memo is not None:
+            self._memo.clear()
+
+    @staticmethod
+    def _record(start: Optional[float], args: Any = None) -> None:
+        from .profiling import get_profiler
+
+        if (profiler := get_profiler()) is not None:
+            if start is None:
+                profiler.record("git.cached", 0.0)
+            else:
+                profiler.record("git", perf_counter() - start, args=args)
+
+    def output(
+        self,
+        args: Sequence[str],
+        *,
+        cache: bool = False,
+        stderr: Optional[int] = None,
+    ) -> bytes:
+        """Return the output of a read-only git command. It raises the
+        CalledProcessError if the command fails.
+
+        :param args: A list of command arguments.
+        :param cache: A cache flag that memoise the output on the session.
+        :param stderr: A stderr value of the subprocess.
+
+        :rtype: bytes
+        """
+        cwd: str = os.getcwd()
+        key: tuple[str, ...] = (cwd, *args)
+        token: Optional[HeadToken] = None
+        if cache and self._memo is not None:
+            # NOTE: The git directory of a path resolves once per session.
+            if cwd not in self._git_dirs:
+                self._git_dirs[cwd] = find_git_dir()
+            if (git_dir := self._git_dirs[cwd]) is not None:
+                token = get_head_token(git_dir)
+            if token is not None and (hit := self._memo.get(key)):
+                if hit[0] == token:
+                    self._record(None)
+                    return hit[1]
+
+        start: float = perf_counter()
+        try:
+            rs: bytes = subprocess.check_output(
+                list(args),
+                stderr=stderr,
+                env=self.read_env,
+                close_fds=False,
+            )
+        finally:
+            self._record(start, args)
+
+        if token is not None:
+            self._memo[key] = (token, rs)
+        return rs
+
+    def call(
+        self,
+        args: Sequence[str],
+        *,
+        cache: bool = False,
+    ) -> int:
+        """Return the return code of a read-only git command without output.
+
+        :param args: A list of command arguments.
+        :param cache: A cache flag that memoise the return code on the session.
+
+        :rtype: int
+        """
+        try:
+            self.output(args, cache=cache, stderr=subprocess.DEVNULL)
+        except subprocess.CalledProcessError as err:
+            return err.returncode
+        return 0
+
+    def popen(self, args: Sequence[str], **kwargs: Any) -> subprocess.Popen:
+        """Start a read-only git command that want to stream its output.
+
+        :param args: A list of command arguments.
+
+        :rtype: subprocess.Popen
+        """
+        from .profiling import TimedPopen, get_profiler
+
+        kwargs.setdefault("env", self.read_env)
+        kwargs.setdefault("close_fds", False)
+        if get_profiler() is not None:
+            return TimedPopen(list(args), **kwargs)
+        return subprocess.Popen(list(args), **kwargs)
+
+    def run(
+        self,
+        args: Sequence[str],
+        *,
+        invalidate: bool = True,
+        **kwargs: Any,
+    ) -> subprocess.CompletedProcess:
+        """Run a git command that able to change the repository. It drops all
+        memoised outputs of the session after the command finished.
+
+        :param args: A list of command arguments.
+        :param invalidate: An invalidate flag that drop the memoised outputs.
+
+        :rtype: subprocess.CompletedProcess
+        """
+        kwargs.setdefault("close_fds", False)
+        start: float = perf_counter()
+        try:
+            return subprocess.run(list(args), **kwargs)
+        finally:
+            self._record(start, args)
+            if invalidate:
+                self.invalidate()
+
+    def check(
+        self,
+        args: Sequence[str],
+        *,
+        invalidate: bool = True,
+        **kwargs: Any,
+    ) -> bytes:
+        """Run a git command that able to change the repository and return its
+        output. It raises the CalledProcessError if the command fails.
+
+        :param args: A list of command arguments.
+        :param invalidate: An invalidate flag that drop the memoised outputs.
+
+        :rtype: bytes
+        """
+        kwargs.setdefault("close_fds", False)
+        start: float = perf_counter()
+        try:
+            return subprocess.check_output(list(args), **kwargs)
+        finally:
+            self._record(start, args)
+            if invalidate:
+                self.invalidate()
+
+
+# NOTE: The shared runner of this package.
+runner: Final[GitRunner] = GitRunner()
+
+
+@dataclass(frozen=True)
+class GitObject:
+    """Git Object dataclass that keep an object that read from the cat-file
+    process. The content is None if it was read by the batch-check mode.
+    """
+
+    oid: str
+    type: str
+    size: int
+    content: Optional[bytes] = None
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return (self.content or b"").decode(encoding)
+
+    def message(self) -> str:
+        """Return the message of a commit or an annotated tag object.
+
+        :rtype: str
+        """
+        return self.text().partition("\n\n")[2]
+
+
+class CatFile:
+    """Cat File object that keep the long-lived ``git cat-file`` processes of
+    a repository for reading many objects over one pipe. It starts the process
+    lazily on the first read, and the processes are closed on exit.
+
+    :param cwd: A working directory of the repository.
+    """
+
+    def __init__(self, cwd: str) -> None:
+        self.cwd: str = cwd
+        self._procs: dict[str, subprocess.Popen] = {}
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        proc: Optional[subprocess.Popen] = self._procs.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = runner.popen(
+                ["git", "cat-file", mode],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd,
+            )
+            self._procs[mode] = proc
+        return proc
+
+    def _read(
+        self,
+        names: Iterable[str],
+        mode: str,
+    ) -> Iterator[Optional[GitObject]]:
+        chunk: list[str] = []
+        for name in names:
+            if "\n" in name:
+                raise ValueError(
+                    f"Object name {name!r} should not has newline."
+                )
+            chunk.append(name)
+            if len(chunk) == CAT_FILE_BATCH:
+                yield from self._read_chunk(chunk, mode)
+                chunk = []
+        if chunk:
+            yield from self._read_chunk(chunk, mode)
+
+    def _read_chunk(
+        self,
+        names: list[str],
+        mode: str,
+    ) -> list[Optional[GitObject]]:
+        proc: subprocess.Popen = self._process(mode)
+        proc.stdin.write("".join(f"{n}\n" for n in names).encode("utf-8"))
+        proc.stdin.flush()
+
+        rs: list[Optional[GitObject]] = []
+        for _ in names:
+            # NOTE: The name of a missing object may have spaces, like
+            #   ``HEAD:a b missing``, so it splits from the right and checks
+            #   the size field.
+            header: list[str] = (
+                proc.stdout.readline().decode("utf-8").rsplit(maxsplit=2)
+            )
+            if len(header) != 3 or not header[2].isdigit():
+                # NOTE: The name does not exist or it is ambiguous.
+                rs.append(None)
+                continue
+            oid, kind, size = header[0], header[1], int(header[2])
+            content: Optional[bytes] = None
+            if mode == "--batch":
+                content = proc.stdout.read(size + 1)[:size]
+            rs.append(GitObject(oid, kind, size, content))
+        return rs
+
+    def get(self, name: str) -> Optional[GitObject]:
+        """Return the object with its content or None if it does not exist.
+
+        :param name: An object name, like ``HEAD`` or ``HEAD:README.md``.
+
+        :rtype: Optional[GitObject]
+        """
+        return self.get_many([name])[0]
+
+    def get_many(self, names: Iterable[str]) -> list[Optional[GitObject]]:
+        """Return the list of objects with their contents by names over one
+        pipe.
+
+        :param names: An iterable of object names.
+
+        :rtype: list[Optional[GitObject]]
+        """
+        return list(self._read(names, "--batch"))
+
+    def check_many(self, names: Iterable[str]) -> list[Optional[GitObject]]:
+        """Return the list of objects without their contents by names over one
+        pipe.
+
+        :param names: An iterable of object names.
+
+        :rtype: list[Optional[GitObject]]
+        """
+        return list(self._read(names, "--batch-check"))
+
+    def close(self) -> None:
+        """Close all cat-file processes of this repository."""
+        for proc in self._procs.values():
+            if proc.poll() is None:
+                proc.stdin.close()
+                try:
+                    proc.wait(timeout=1)
+                except subprocess.TimeoutExpired:  # pragma: no cov
+                    proc.kill()
+                    proc.wait()
+            proc.stdout.close()
+        self._procs.clear()
+
+
+_CAT_FILES: dict[str, CatFile] = {}
+
+
+def get_cat_file() -> CatFile:
+    """Return the shared cat-file object of the current working directory.
+
+    :rtype: CatFile
+    """
+    cwd: str = os.getcwd()
+    if (cat_file := _CAT_FILES.get(cwd)) is None:
+        cat_file = _CAT_FILES[cwd] = CatFile(cwd)
+    return cat_file
+
+
+@atexit.register
+def close_cat_files() -> None:
+    """Close all shared cat-file processes."""
+    for cat_file in _CAT_FILES.values():
+        cat_file.close()
+    _CAT_FILES.clear()
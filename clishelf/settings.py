@@ -243,6 +243,35 @@ class BumpVerConf:
         Released: {{utcnow:%Y-%m-%d}}
     """).strip()
 
+    # NOTE: The same values of the templates above that the direct bump
+    #   pipeline builds its version configs from without the config file.
+    serialize: tuple[str, ...] = (
+        "{major}.{minor}.{patch}.{prekind}{pre}.{postkind}{post}",
+        "{major}.{minor}.{patch}.{prekind}{pre}",
+        "{major}.{minor}.{patch}.{postkind}{post}",
+        "{major}.{minor}.{patch}",
+    )
+    serialize_dt: tuple[str, ...] = ("{date}.{pre}", "{date}")
+    part_values: dict[str, tuple[str, ...]] = {
+        "prekind": ("_", "a", "b", "rc"),
+        "postkind": ("_", "post"),
+    }
+    # NOTE: The parts whose optional value means a release, so it sorts after
+    #   all their values, like ``1.2.0`` after ``1.2.0.rc1``.
+    release_parts: tuple[str, ...] = ("prekind",)
+    # NOTE: The other spellings of the part values that the regex accepts. The
+    #   ``dev`` kind is not on the values, so it sorts before all the
+    #   pre-release kinds.
+    part_aliases: dict[str, dict[str, str]] = {
+        "prekind": {"alpha": "a", "beta": "b", "d": "dev"},
+    }
+    changelog_search: str = "{#}{#} Latest Changes"
+    changelog_v1: str = "{#}{#} Latest Changes\n\n{#}{#} {new_version}"
+    changelog_v2: str = (
+        "{#}{#} Latest Changes\n\n{#}{#} {new_version}\n\n"
+        "Released: {utcnow:%Y-%m-%d}"
+    )
+
     commit_subject_format: str = "{emoji} {prefix}: {subject}"
     commit_msg_format: str = "- {subject} (_{datetime:%Y-%m-%d}_)"
 
@@ -261,20 +290,13 @@ class BumpVerConf:
             version = 1
         template: str = getattr(cls, f"v{version}")
         if is_dt:
-            if (action := params.get("action", "date")) == "date":
-                new_version: str = datetime.datetime.now().strftime("%Y%m%d")
-            elif action == "pre":
-                new_version = cls.update_dt_pre(params.get("version"))
-            else:
-                raise ValueError(
-                    f"the action does not support for {action} with use "
-                    f"datetime mode."
-                )
             return template.format(
                 changelog=params.get("changelog"),
                 main=cls.main_dt.format(
                     version=params.get("version"),
-                    new_version=new_version,
+                    new_version=cls.get_dt_version(
+                        params.get("action", "date"), params.get("version")
+                    ),
                     msg=cls.msg,
                     regex=cls.regex_dt,
                     file=params.get("file"),
@@ -290,6 +312,34 @@ class BumpVerConf:
             ),
         )
 
+    @classmethod
+    def get_changelog_replace(cls, version: int) -> str:
+        """Return the replace template of the changelog file from specific
+        version of the bump config.
+
+        :rtype: str
+        """
+        if not hasattr(cls, f"changelog_v{version}"):
+            version = 1
+        return getattr(cls, f"changelog_v{version}")
+
+    @classmethod
+    def get_dt_version(cls, action: str, version: str) -> str:
+        """Return the new version of datetime mode from an action.
+
+        :param action: An action that should be ``date`` or ``pre``.
+        :param version: A current version.
+
+        :rtype: str
+        """
+        if action == "date":
+            return datetime.datetime.now().strftime("%Y%m%d")
+        elif action == "pre":
+            return cls.update_dt_pre(version)
+        raise ValueError(
+            f"the action does not support for {action} with use datetime mode."
+        )
+
     @classmethod
     def update_dt_pre(cls, version: str) -> str:
         """Return new pre version of datetime mode.
@@ -0,0 +1,341 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+from __future__ import annotations
+
+import re
+import subprocess
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Final, Optional
+
+from .refs import Refs, read_refs
+from .runner import runner
+from .settings import BumpVerConf
+
+if TYPE_CHECKING:
+    from .bump.version_part import Version, VersionConfig
+
+VersionKey = tuple[tuple[int, str], ...]
+
+SPEC_OPS: Final[tuple[str, ...]] = (">=", "<=", "==", ">", "<")
+# NOTE: The sort key of an optional release part of a floor key, so it sorts
+#   before all the values of the part.
+FLOOR_KEY: Final[tuple[int, str]] = (-1, "")
+
+_INDEX: dict[bool, tuple[Refs, TagIndex]] = {}
+
+
+@lru_cache(maxsize=None)
+def get_tag_pattern(is_dt: bool = False) -> re.Pattern[str]:
+    """Return the compiled pattern of a version tag name that may have the
+    ``v`` prefix.
+
+    :param is_dt: A datetime mode flag.
+
+    :rtype: re.Pattern[str]
+    """
+    return re.compile(rf"v?(?P<version>{BumpVerConf.get_regex(is_dt)})")
+
+
+@lru_cache(maxsize=None)
+def get_version_config(is_dt: bool = False) -> VersionConfig:
+    """Return the version config of the version file that the bump command
+    uses, so the tags sort with the same order as the bumped versions and
+    share its parse cache.
+
+    :param is_dt: A datetime mode flag.
+
+    :rtype: VersionConfig
+    """
+    from .bump.configs import get_bump_configs
+
+    return get_bump_configs(is_dt=is_dt)[0]
+
+
+def is_release(version: Version) -> bool:
+    """Return True if all the release parts of a version are optional, like
+    ``1.2.0`` and not ``1.2.0.rc1``.
+
+    :param version: A parsed version.
+
+    :rtype: bool
+    """
+    return all(
+        version[label].is_optional()
+        for label in BumpVerConf.release_parts
+        if label in version.labels
+    )
+
+
+def parse_version(version: str, is_dt: bool = False) -> Version:
+    """Return the parsed version of a version or a version tag. The partial
+    version of the normal mode, like ``1`` or ``1.2``, pads its missing parts
+    with zero.
+
+    :param version: A version string, like ``1.2.0.rc1`` or ``v1.2``.
+    :param is_dt: A datetime mode flag.
+
+    :raise ValueError: If the version does not match the version regex.
+
+    :rtype: Version
+    """
+    if not is_dt and re.fullmatch(r"v?\d+(\.\d+)?", version):
+        version += ".0" * (2 - version.count("."))
+    if (m := get_tag_pattern(is_dt).fullmatch(version)) is None:
+        raise ValueError(f"Version {version!r} does not match the regex.")
+    return get_version_config(is_dt).parse(m["version"])
+
+
+def version_key(
+    version: str,
+    is_dt: bool = False,
+    *,
+    floor: bool = False,
+) -> VersionKey:
+    """Return the sort key of a version or a version tag that is the sort key
+    of its parsed version.
+
+    :param version: A version string, like ``1.2.0.rc1`` or ``v1.2``.
+    :param is_dt: A datetime mode flag.
+    :param floor: A floor flag that make a release sort before its own
+        pre-releases, so an exclusive upper bound excludes them.
+
+    :raise ValueError: If the version does not match the version regex.
+
+    :rtype: VersionKey
+    """
+    parsed: Version = parse_version(version, is_dt)
+    if not floor:
+        return parsed.sort_key()
+    return tuple(
+        (
+            FLOOR_KEY
+            if label in BumpVerConf.release_parts and part.is_optional()
+            else key
+        )
+        for label, part, key in zip(
+            parsed.labels, parsed.parts, parsed.sort_key(), strict=True
+        )
+    )
+
+
+@dataclass(frozen=True, order=True)
+class Tag:
+    """Tag dataclass that keep a version tag with its sort key, its version
+    without the prefix, and its peeled commit.
+    """
+
+    key: VersionKey
+    version: str
+    name: str
+    commit: str
+
+
+class TagIndex:
+    """Tag Index object that keep the version tags of a repository sorted by
+    their versions instead of their dates or their positions on the history,
+    so the queries are the binary searches on the sorted version keys.
+
+    :param tags: An iterable of version tags.
+    :param is_dt: A datetime mode flag.
+    """
+
+    def __init__(self, tags: Iterable[Tag], is_dt: bool = False) -> None:
+        self.is_dt: bool = is_dt
+        self.tags: list[Tag] = sorted(tags)
+        self.keys: list[VersionKey] = [tag.key for tag in self.tags]
+
+    @classmethod
+    def from_tags(cls, tags: dict[str, str], is_dt: bool = False) -> TagIndex:
+        """Create the index from a mapping of tag names and their peeled
+        commits. The tags that do not match the version regex are skipped.
+
+        :param tags: A mapping of tag names and their commit hashes.
+        :param is_dt: A datetime mode flag.
+
+        :rtype: TagIndex
+        """
+        pattern: re.Pattern[str] = get_tag_pattern(is_dt)
+        config: VersionConfig = get_version_config(is_dt)
+        return cls(
+            (
+                Tag(
+                    config.parse(m["version"]).sort_key(),
+                    m["version"],
+                    name,
+                    commit,
+                )
+                for name, commit in tags.items()
+                if (m := pattern.fullmatch(name)) is not None
+            ),
+            is_dt=is_dt,
+        )
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def __iter__(self) -> Iterator[Tag]:
+        return iter(self.tags)
+
+    def __reversed__(self) -> Iterator[Tag]:
+        return reversed(self.tags)
+
+    @cached_property
+    def by_commit(self) -> dict[str, Tag]:
+        """Return the mapping of commits and their lowest version tags, so a
+        commit that has many tags keeps its first release like the first tag
+        decoration of the ``git log`` command.
+
+        :rtype: dict[str, Tag]
+        """
+        return {tag.commit: tag for tag in reversed(self.tags)}
+
+    def key(self, version: str, *, floor: bool = False) -> VersionKey:
+        return version_key(version, self.is_dt, floor=floor)
+
+    def get(self, version: str) -> Optional[Tag]:
+        """Return the highest tag of a version if it exists.
+
+        :param version: A version string.
+
+        :rtype: Optional[Tag]
+        """
+        key: VersionKey = self.key(version)
+        if (i := bisect_right(self.keys, key)) and self.keys[i - 1] == key:
+            return self.tags[i - 1]
+        return None
+
+    def latest(self, pre: bool = True) -> Optional[Tag]:
+        """Return the tag of the highest version.
+
+        :param pre: A pre-release flag, if it is False, the pre-release tags
+            are skipped.
+
+        :rtype: Optional[Tag]
+        """
+        for tag in reversed(self.tags):
+            if pre or is_release(parse_version(tag.version, self.is_dt)):
+                return tag
+        return None
+
+    def previous(self, version: str) -> Optional[Tag]:
+        """Return the tag of the highest version that lower than a version.
+
+        :param version: A version string.
+
+        :rtype: Optional[Tag]
+        """
+        if i := bisect_left(self.keys, self.key(version)):
+            return self.tags[i - 1]
+        return None
+
+    def range(self, spec: str) -> list[Tag]:
+        """Return the tags that match all the comma separated clauses of a
+        version specifier, like ``>=1.2,<2``, in ascending order. Like the
+        PEP 440 specifiers, the exclusive upper bound excludes the
+        pre-releases of its own release.
+
+        :param spec: A version specifier.
+
+        :raise ValueError: If a clause does not have a supported operator or
+            its version does not match the version regex.
+
+        :rtype: list[Tag]
+        """
+        lo, hi = 0, len(self.keys)
+        for clause in filter(None, (c.strip() for c in spec.split(","))):
+            if (op := next(filter(clause.startswith, SPEC_OPS), None)) is None:
+                raise ValueError(f"Version clause {clause!r} does not support.")
+            bound: str = clause[len(op) :].strip()
+            if op == ">=":
+                lo = max(lo, bisect_left(self.keys, self.key(bound)))
+            elif op == ">":
+                lo = max(lo, bisect_right(self.keys, self.key(bound)))
+            elif op == "<=":
+                hi = min(hi, bisect_right(self.keys, self.key(bound)))
+            elif op == "<":
+                hi = min(
+                    hi, bisect_left(self.keys, self.key(bound, floor=True))
+                )
+            else:
+                lo = max(lo, bisect_left(self.keys, self.key(bound)))
+                hi = min(hi, bisect_right(self.keys, self.key(bound)))
+        return self.tags[lo:hi]
+
+    def ranges(self) -> list[tuple[Tag, str]]:
+        """Return the list of pair of a tag and its revision range from the
+        highest version. The range of a tag starts at the tag of the previous
+        version, and a commit that has many tags keeps only the lowest one.
+
+        :rtype: list[tuple[Tag, str]]
+        """
+        tags: list[Tag] = [
+            tag
+            for tag in reversed(self.tags)
+            if self.by_commit[tag.commit] is tag
+        ]
+        return [
+            (
+                tag,
+                (
+                    f"{tags[i + 1].commit}..{tag.commit}"
+                    if i + 1 < len(tags)
+                    else tag.commit
+                ),
+            )
+            for i, tag in enumerate(tags)
+        ]
+
+
+def get_tag_index(
+    is_dt: bool = False,
+    *,
+    merged: Optional[str] = None,
+) -> TagIndex:
+    """Return the tag index of the current repository. It reads all tags from
+    the refs that cache on the mtimes of the refs files, or only the tags that
+    a revision reaches with one ``git for-each-ref --merged`` command that
+    memoise on the runner session.
+
+    :param is_dt: A datetime mode flag.
+    :param merged: A revision that the tags should be reachable from, like
+        ``HEAD``.
+
+    :raise CalledProcessError: If the git command fails, like the revision
+        does not exist.
+
+    :rtype: TagIndex
+    """
+    if merged is None:
+        refs: Refs = read_refs()
+        if (hit := _INDEX.get(is_dt)) is not None and hit[0] is refs:
+            return hit[1]
+        index: TagIndex = TagIndex.from_tags(refs.tags, is_dt=is_dt)
+        _INDEX[is_dt] = (refs, index)
+        return index
+
+    tags: dict[str, str] = {}
+    for line in (
+        runner.output(
+            [
+                "git",
+                "for-each-ref",
+                f"--merged={merged}",
+                "--format=%(refname:strip=2)%00%(objectname)%00%(*objectname)",
+                "refs/tags",
+            ],
+            cache=True,
+            stderr=subprocess.DEVNULL,
+        )
+        .decode("utf-8")
+        .split("\n")
+    ):
+        if line:
+            name, oid, peeled = line.split("\x00")
+            tags[name] = peeled or oid
+    return TagIndex.from_tags(tags, is_dt=is_dt)
@@ -5,12 +5,13 @@
 # ------------------------------------------------------------------------------
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
-import yaml
+from .profiling import timed
 
 try:  # pragma: no cov
     # NOTE: This package already provided at core package for Python v3.11+
@@ -20,6 +21,77 @@ except ModuleNotFoundError:
     #   >>> uv pip install pip
     import pip._vendor.tomli as tomllib
 
+# NOTE: The process-wide cache of parsed config files. It keeps the stat key,
+#   ``(st_mtime_ns, st_size)``, together with the parsed data for each resolved
+#   file path.
+_CONFIG_CACHE: dict[Path, tuple[tuple[int, int], Any]] = {}
+
+
+def _stat_key(file: Path) -> Optional[tuple[int, int]]:
+    """Return the cache key of a file or None if it does not exist.
+
+    :param file: A file path that want to make the cache key.
+
+    :rtype: Optional[tuple[int, int]]
+    """
+    try:
+        st = file.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_cached(file: Path, loader: Callable[[Path], Any]) -> Any:
+    """Return the parsed data of a file from the process-wide config cache. It
+    will call the loader function only if the file was never loaded or its
+    mtime or size was changed.
+
+    :param file: A file path that want to load.
+    :param loader: A function that receive the file path and return its data.
+
+    :rtype: Any
+    :return: A parsed data or None if the file does not exist.
+    """
+    path: Path = file.absolute()
+    if (key := _stat_key(path)) is None:
+        _CONFIG_CACHE.pop(path, None)
+        return None
+
+    if (cached := _CONFIG_CACHE.get(path)) is not None and cached[0] == key:
+        return cached[1]
+
+    data: Any = loader(path)
+    _CONFIG_CACHE[path] = (key, data)
+    return data
+
+
+def invalidate_config(file: Optional[str | Path] = None) -> None:
+    """Drop the cached config data of a file or all files if it does not pass.
+
+    :param file: A file path that want to drop from the config cache.
+    """
+    if file is None:
+        _CONFIG_CACHE.clear()
+    else:
+        _CONFIG_CACHE.pop(Path(file).absolute(), None)
+
+
+def _read_toml(file: Path) -> dict[str, Any]:
+    with file.open(mode="rb") as f:
+        return tomllib.load(f)
+
+
+def _read_yaml(file: Path) -> dict[str, Any]:
+    # NOTE: Import yaml only when a yaml config file exists because it is slow
+    #   to import at the startup of the command.
+    import yaml
+
+    # NOTE: Use the libyaml binding if PyYAML was built with it because it
+    #   parses several times faster than the pure Python loader.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with file.open(mode="rb") as f:
+        return yaml.load(f, Loader=loader) or {}
+
 
 def load_pyproject(file: Optional[str] = None) -> dict[str, Any]:
     """Load Configuration from pyproject.toml file.
@@ -28,31 +100,35 @@ def load_pyproject(file: Optional[str] = None) -> dict[str, Any]:
 
     :rtype: dict[str, Any]
     """
-    pyproject: Path = Path(file or "./pyproject.toml")
-    if not pyproject.exists():
-        return {}
-
-    with pyproject.open(mode="rb") as f:
-        return tomllib.load(f)
+    return load_cached(Path(file or "./pyproject.toml"), _read_toml) or {}
 
 
+@timed("load_config")
 def load_config() -> dict[str, Any]:
     """Return config of the shelf package that was set on pyproject.toml.
 
+    The parsed files are cached for the whole process and reloaded only when
+    their mtime or size change, so the returned nested values should be treated
+    as read-only.
+
     :rtype: dict[str, Any]
     """
-    data: dict[str, Any] = {}
-
-    conf_file: Path = Path(".clishelf.yaml")
-    if conf_file.exists():
-        data = yaml.safe_load(conf_file.read_text(encoding="utf-8"))
-
+    data: dict[str, Any] = load_cached(Path(".clishelf.yaml"), _read_yaml)
     return {
-        **data,
+        **(data or {}),
         **load_pyproject().get("tool", {}).get("shelf", {}),
     }
 
 
+def reload_config() -> dict[str, Any]:
+    """Drop all cached config files and load the config data again.
+
+    :rtype: dict[str, Any]
+    """
+    invalidate_config()
+    return load_config()
+
+
 class Bcolors(str, Enum):
     """An Enum for colors using ANSI escape sequences.
 
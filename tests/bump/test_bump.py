@@ -1,16 +1,24 @@
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from clishelf.bump.bump import (
     assemble_context,
     bump_version_by_part_or_literal,
+    check_files_contain_version,
+    map_files,
+    opportunistic_bump_part_and_serialize,
+    plan_version_edits,
     replace_version_in_files,
+    write_version_edits,
 )
 from clishelf.bump.cli import write_bump_file
 from clishelf.bump.conf import load_config
 from clishelf.bump.utils import ConfFile
 from clishelf.bump.version_part import VersionConfig
+from clishelf.errors import VersionFilesException
 
 
 @pytest.fixture(scope="function")
@@ -40,6 +48,27 @@ def test_bump_with_explicit_new_version(vc):
     assert new_version == "2.0.0"
 
 
+def test_opportunistic_bump(vc):
+    context = assemble_context()
+    current_obj = vc.parse("2.7.1")
+    assert (
+        opportunistic_bump_part_and_serialize("patch", current_obj, vc, context)
+        == "2.7.2"
+    )
+    vc_short = VersionConfig(
+        parse=vc.parse_regex.pattern,
+        serialize=["{major}.{minor}.{release}"],
+        search="{current_version}",
+        replace="{new_version}",
+    )
+    assert (
+        opportunistic_bump_part_and_serialize(
+            "minor", vc_short.parse("2.7.1"), vc_short, context
+        )
+        is None
+    )
+
+
 def test_bump_invalid_no_part_or_new_version(vc):
     context = assemble_context()
     with pytest.raises(ValueError):
@@ -53,8 +82,15 @@ def test_replace_in_file(tmp_path: Path, vc):
     cf = ConfFile(p, vc)
     ctx = assemble_context()
 
+    check_files_contain_version([cf], "1.2.3", ctx)
+    with pytest.raises(ValueError):
+        check_files_contain_version([cf], "1.2.5", ctx)
+    assert p.read_text() == "version = 1.2.3\n"
+
     # replace 1.2.3 -> 1.2.4 (not dry-run)
-    replace_version_in_files([cf], "1.2.3", "1.2.4", dry_run=False, context=ctx)
+    assert replace_version_in_files(
+        [cf], "1.2.3", "1.2.4", dry_run=False, context=ctx
+    ) == [p]
     content = p.read_text()
     assert "1.2.4" in content
 
@@ -71,6 +107,109 @@ def test_replace_dry_run_does_not_modify(tmp_path, vc):
     assert "1.2.4" not in content
 
 
+def test_plan_version_edits(tmp_path: Path, vc):
+    p = tmp_path / "setup.cfg"
+    p.write_text("version = 1.2.3\nrequires = dep==1.2.3\n")
+    p.chmod(0o640)
+    other = tmp_path / "other.txt"
+    other.write_text("1.2.3\n")
+    ctx = assemble_context()
+    files = [
+        ConfFile(
+            p,
+            VersionConfig(
+                parse=vc._parse,
+                serialize=vc.serialize_formats,
+                search="version = {current_version}",
+                replace="version = {new_version}",
+            ),
+        ),
+        ConfFile(other, vc),
+        ConfFile(
+            p,
+            VersionConfig(
+                parse=vc._parse,
+                serialize=vc.serialize_formats,
+                search="dep=={current_version}",
+                replace="dep>={new_version}",
+            ),
+        ),
+    ]
+
+    read_text = Path.read_text
+    with patch.object(
+        Path, "read_text", autospec=True, side_effect=read_text
+    ) as mock:
+        plan = plan_version_edits(files, "1.2.3", "1.2.4", ctx)
+        assert mock.call_count == 2
+    assert list(plan) == [p, other]
+    assert plan[p][1] == "version = 1.2.4\nrequires = dep>=1.2.4\n"
+
+    with patch("clishelf.bump.bump.write_atomic") as mock:
+        assert write_version_edits(plan, dry_run=True) == [p, other]
+        assert mock.call_count == 0
+    assert write_version_edits(plan) == [p, other]
+    assert p.read_text() == "version = 1.2.4\nrequires = dep>=1.2.4\n"
+    assert p.stat().st_mode & 0o777 == 0o640
+    assert sorted(os.listdir(tmp_path)) == ["other.txt", "setup.cfg"]
+
+    # NOTE: The second section does not match, so it does not write any file.
+    p.write_text("version = 1.2.3\n")
+    with pytest.raises(ValueError):
+        plan_version_edits(files, "1.2.3", "1.2.4", ctx)
+    assert other.read_text() == "1.2.4\n"
+
+
+def test_plan_version_edits_jobs(tmp_path: Path, vc, caplog):
+    paths: list[Path] = [tmp_path / f"file-{i:02}.txt" for i in range(20)]
+    for path in paths:
+        path.write_text("version = 1.2.3\n")
+    paths[3].write_text("version = 1.0.0\n")
+    paths[11].write_text("version = 1.0.0\n")
+    files: list[ConfFile] = [ConfFile(path, vc) for path in paths]
+    ctx = assemble_context()
+
+    with pytest.raises(VersionFilesException) as err:
+        plan_version_edits(files, "1.2.3", "1.2.4", ctx, jobs=4)
+    assert [e.args[0].split()[1] for e in err.value.errors] == [
+        str(paths[3]),
+        str(paths[11]),
+    ]
+    assert all(p.read_text() != "version = 1.2.4\n" for p in paths)
+
+    paths[3].write_text("version = 1.2.3\n")
+    paths[11].write_text("version = 1.2.3\n")
+    with caplog.at_level("INFO", logger="clishelf.bump"):
+        plan = plan_version_edits(files, "1.2.3", "1.2.4", ctx, jobs=4)
+    assert [r.getMessage().split()[0] for r in caplog.records] == [
+        f"[{path}]" for path in paths
+    ]
+    assert write_version_edits(plan, jobs=4) == paths
+    assert all(p.read_text() == "version = 1.2.4\n" for p in paths)
+
+    # NOTE: The single error raises as it is.
+    with pytest.raises(FileNotFoundError):
+        map_files(Path.read_text, [(tmp_path / "missing.txt",)], jobs=4)
+
+    # NOTE: The error that is not an OSError or a ValueError, like a missing
+    #   key of a template, is reported with the others.
+    def render(path: Path) -> str:
+        template: str = "{missing} = {version}"
+        return template.format_map({"version": path.read_text()})
+
+    with pytest.raises(VersionFilesException) as err:
+        map_files(
+            render,
+            [(paths[0],), (tmp_path / "missing.txt",), (paths[1],)],
+            jobs=4,
+        )
+    assert [type(e) for e in err.value.errors] == [
+        KeyError,
+        FileNotFoundError,
+        KeyError,
+    ]
+
+
 def test_bump_from_old_format(tmp_path: Path):
     bump_filepath = tmp_path / ".bumpversion.cfg"
     write_bump_file(
@@ -3,22 +3,34 @@
 # Licensed under the MIT License. See LICENSE in the project root for
 # license information.
 # ------------------------------------------------------------------------------
+import os
 from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
 from textwrap import dedent
 from unittest.mock import DEFAULT, patch
 
+import click
+import pytest
+from click.testing import CliRunner
+
 from clishelf.bump.cli import (
+    bump_version,
+    cli_vs,
     create_changelog,
     current_version,
+    get_bump_configs,
     get_changelog,
+    get_tag_ranges,
     map_group_commit_logs,
     write_bump_file,
     write_group_log,
 )
+from clishelf.bump.conf import load_config
 from clishelf.git import CommitLog, CommitMsg, Profile
 
+from ..conftest import git, git_commit
+
 
 def side_effect_func(*args, **kwargs):
     _ = kwargs
@@ -157,6 +169,58 @@ def test_create_changelog(mock_map_group_commit_logs):
     write_changelog_file.unlink()
 
 
+def test_create_changelog_incremental(git_repo):
+    file: Path = git_repo / "CHANGELOG.md"
+    create_changelog(file, incremental=True)
+
+    assert file.read_text(encoding="utf-8") == (
+        "# Changelogs\n\n"
+        "## Latest Changes\n\n"
+        "### :sparkles: Features\n\n"
+        "- :dart: feat: add new feature (_2024-01-04_)\n\n"
+        "## 0.0.2\n\n"
+        "### :bug: Bug fixes\n\n"
+        "- :gear: fix: fixed bug (END) | pipe (_2024-01-02_)\n\n"
+        "### :books: Documentations\n\n"
+        "- :page_facing_up: docs: update readme file (_2024-01-03_)\n\n"
+        "## 0.0.1\n\n"
+        "### :sparkles: Features\n\n"
+        "- :dart: feat: first initial commit (_2024-01-01_)\n\n"
+    ).replace("\n", os.linesep)
+    assert (git_repo / ".git/clishelf/changelog.json").exists()
+
+    # NOTE: The file does not write if the rendered content is the same.
+    os.utime(file, ns=(0, 0))
+    create_changelog(file, incremental=True)
+    assert file.stat().st_mtime_ns == 0
+
+    # NOTE: The sections that its range does not move keep byte-for-byte.
+    content: str = file.read_text(encoding="utf-8")
+    file.write_text(
+        content.replace("initial commit (_2024-01-01_)", "initial (manual)"),
+        encoding="utf-8",
+    )
+    git_commit(git_repo, "build: add new workflow", 1704412800, tag="v0.0.3")
+    create_changelog(file, incremental=True)
+
+    content = file.read_text(encoding="utf-8")
+    assert content.index("## 0.0.3") < content.index("## 0.0.2")
+    assert "- :toolbox: build: add new workflow (_2024-01-05_)" in content
+    assert "- :dart: feat: add new feature (_2024-01-04_)" in content
+    assert "- :dart: feat: first initial (manual)" in content
+
+    # NOTE: The refresh flag re-render all tag sections.
+    create_changelog(file, incremental=True, refresh=True)
+    content = file.read_text(encoding="utf-8")
+    assert "- :dart: feat: first initial commit (_2024-01-01_)" in content
+
+
+def test_get_tag_ranges(git_repo):
+    ranges = get_tag_ranges()
+    assert [tag for tag, _ in ranges] == ["0.0.2", "0.0.1"]
+    assert ranges[0][1].split("..")[0] == ranges[1][1]
+
+
 def test_write_group_log():
     test_file_path: Path = Path(__file__).parent / "test_write_group_log.md"
     group_log = {
@@ -275,3 +339,125 @@ def test_current_version(mock_path):
     assert current_version("__version__.py", is_dt=True) == "20240101"
 
     version_file_path.unlink()
+
+
+def test_current_version_ref(git_repo):
+    about: Path = git_repo / "__about__.py"
+    about.write_text('__version__ = "0.0.1"\n', encoding="utf-8")
+    git("add", "__about__.py", cwd=git_repo)
+    git("commit", "-q", "-m", "build: add version file", cwd=git_repo)
+    about.write_text('__version__ = "0.0.2"\n', encoding="utf-8")
+
+    assert current_version("__about__.py") == "0.0.2"
+    assert current_version("__about__.py", ref="HEAD") == "0.0.1"
+    assert current_version("./__about__.py", ref="HEAD") == "0.0.1"
+    with pytest.raises(FileNotFoundError):
+        current_version("__about__.py", ref="HEAD~1")
+
+    runner = CliRunner()
+    result = runner.invoke(cli_vs, ["current", "-f", "__about__.py"])
+    assert result.output == "0.0.2\n"
+    for args in (["-f", "nofile.py"], ["-f", "__about__.py", "-r", "HEAD~1"]):
+        result = runner.invoke(cli_vs, ["current", *args])
+        assert result.exit_code == 2
+        assert "Invalid value for '-f' / '--file'" in result.output
+
+
+@pytest.mark.parametrize("is_dt", [False, True])
+@pytest.mark.parametrize("version", [1, 2])
+def test_get_bump_configs(tmp_path, monkeypatch, version, is_dt):
+    monkeypatch.chdir(tmp_path)
+    write_bump_file(
+        param={
+            "version": "20240101" if is_dt else "0.0.1",
+            "changelog": "CHANGELOG.md",
+            "file": "__about__.py",
+            "action": "date",
+        },
+        version=version,
+        is_dt=is_dt,
+    )
+    with pytest.warns(DeprecationWarning):
+        _, files, _, _, _ = load_config()
+
+    for conf, expected in zip(
+        get_bump_configs(version, is_dt=is_dt),
+        [f.version_config for f in files],
+        strict=True,
+    ):
+        assert conf.parse_regex.pattern.replace("\n", "") == (
+            expected.parse_regex.pattern.replace("\n", "")
+        )
+        assert conf.serialize_formats == expected.serialize_formats
+        assert conf.search == expected.search
+        assert conf.replace == expected.replace
+        assert {
+            k: v.function._values for k, v in conf.part_configs.items()
+        } == {k: v.function._values for k, v in expected.part_configs.items()}
+
+
+def test_bump_version(git_repo):
+    about: Path = git_repo / "__about__.py"
+    about.write_text('__version__: str = "0.0.2"\n', encoding="utf-8")
+    changelog: Path = git_repo / "CHANGELOG.md"
+    changelog.write_text(
+        "# Changelogs\n\n## Latest Changes\n\n## 0.0.2\n", encoding="utf-8"
+    )
+    (git_repo / "untracked.txt").write_text("untracked")
+    git("add", "__about__.py", "CHANGELOG.md", cwd=git_repo)
+    git("commit", "-q", "-m", "build: add version file", cwd=git_repo)
+
+    with patch("clishelf.bump.cli.runner.run") as mock:
+        assert bump_version(
+            "patch", "__about__.py", "CHANGELOG.md", dry_run=True
+        )
+        assert mock.call_count == 0
+    assert current_version("__about__.py") == "0.0.2"
+
+    assert bump_version("patch", "__about__.py", "CHANGELOG.md") == "0.0.3"
+    assert current_version("__about__.py") == "0.0.3"
+    assert git("log", "-1", "--format=%s", cwd=git_repo).strip() == (
+        ":label: Bump up to version 0.0.2 -> 0.0.3."
+    )
+    assert git("show", "--name-only", "--format=", cwd=git_repo).split() == [
+        "CHANGELOG.md",
+        "__about__.py",
+    ]
+    assert git("status", "--porcelain", cwd=git_repo).split() == [
+        "??",
+        "untracked.txt",
+    ]
+    content: str = changelog.read_text(encoding="utf-8")
+    assert "## Latest Changes\n\n## 0.0.3\n" in content
+    assert "- :dart: feat: add new feature" in content
+
+    bump_version("minor", "__about__.py", "CHANGELOG.md", changelog_ignore=True)
+    assert current_version("__about__.py") == "0.1.0"
+
+    # NOTE: The failed commit restores the written files.
+    (git_repo / ".git/index.lock").touch()
+    with pytest.raises(click.ClickException) as err:
+        bump_version("patch", "__about__.py", "CHANGELOG.md")
+    assert "All files were restored." in err.value.message
+    (git_repo / ".git/index.lock").unlink()
+    assert current_version("__about__.py") == "0.1.0"
+    assert git("status", "--porcelain", cwd=git_repo).split() == [
+        "??",
+        "untracked.txt",
+    ]
+
+    # NOTE: The configured file does not contain the current version, so it
+    #   does not write any file.
+    with (
+        patch(
+            "clishelf.bump.cli.load_config",
+            return_value={"version": {"files": ["untracked.txt"]}},
+        ),
+        pytest.raises(ValueError),
+    ):
+        bump_version("patch", "__about__.py", "CHANGELOG.md")
+    assert current_version("__about__.py") == "0.1.0"
+    assert git("status", "--porcelain", cwd=git_repo).split() == [
+        "??",
+        "untracked.txt",
+    ]
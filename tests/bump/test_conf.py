@@ -1,9 +1,21 @@
+import glob
+import logging
+import os
+import subprocess
 from pathlib import Path
+from unittest.mock import patch
 
+import pytest
 import tomli_w
 
 from clishelf.bump.cli import write_bump_file
-from clishelf.bump.conf import load_config, save_config, tomllib
+from clishelf.bump.conf import (
+    expand_glob,
+    get_tracked_files,
+    load_config,
+    save_config,
+    tomllib,
+)
 from clishelf.bump.version_part import ConfiguredPartConf
 
 
@@ -110,3 +122,75 @@ values = 0,1,2
     assert defaults["tag"] is False
     assert defaults["dry_run"] is True
     assert "minor" in parts
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*.txt",
+        "**/*.txt",
+        "docs/**",
+        "./docs/**/*.md",
+        "docs/*/[a-b]?.md",
+        "docs/[!a]*.md",
+        ".github/*.yml",
+        "**/chart.yaml",
+    ],
+)
+def test_expand_glob(git_repo, pattern):
+    for name in (
+        "docs/a1.md",
+        "docs/b.md",
+        "docs/sub/a1.md",
+        "docs/sub/c1.md",
+        "docs/.hidden/a1.md",
+        "docs/sub/deep/chart.yaml",
+        ".github/ci.yml",
+        "a b.txt",
+    ):
+        (git_repo / name).parent.mkdir(parents=True, exist_ok=True)
+        (git_repo / name).write_text("0.1.0")
+    subprocess.check_output(["git", "add", "."], cwd=git_repo)
+
+    tracked: list[str] = get_tracked_files()
+    assert sorted(expand_glob(pattern, tracked)) == sorted(
+        os.path.normpath(p)
+        for p in glob.glob(pattern, recursive=True)
+        if os.path.isfile(p)
+    )
+
+
+def test_load_config_glob(git_repo):
+    (git_repo / "node_modules").mkdir()
+    (git_repo / "node_modules" / "pkg.txt").write_text("0.1.0")
+    (git_repo / "bumpversion.toml").write_text(
+        '[bumpversion]\ncurrent_version = "0.1.0"\n\n'
+        '["bumpversion:glob:**/*.txt"]\n\n'
+        '["bumpversion:glob:*.txt"]\n'
+    )
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        _, files, _, _, _ = load_config()
+        assert mock.call_count == 1
+    assert [str(f.path) for f in files] == ["file.txt", "file.txt"]
+
+    # NOTE: It walks the file system outside a repository.
+    with patch(
+        "clishelf.bump.conf.get_tracked_files",
+        side_effect=subprocess.CalledProcessError(128, "git"),
+    ):
+        _, files, _, _, _ = load_config()
+    assert sorted(str(f.path) for f in files) == [
+        "file.txt",
+        "file.txt",
+        "node_modules/pkg.txt",
+    ]
+
+
+def test_expand_glob_skipped(git_repo, caplog):
+    (git_repo / "build.txt").write_text("0.1.0")
+    with caplog.at_level(logging.DEBUG, logger="clishelf.bump.conf"):
+        assert expand_glob("*.txt", get_tracked_files()) == ["file.txt"]
+    assert "skipped 1 untracked files, like 'build.txt'" in caplog.text
@@ -1,7 +1,18 @@
 import pytest
 
-from clishelf.bump.bump import assemble_context
-from clishelf.bump.utils import ConfFile, kv_str
+from clishelf.bump import utils
+from clishelf.bump.bump import (
+    assemble_context,
+    plan_version_edits,
+    write_version_edits,
+)
+from clishelf.bump.utils import (
+    ConfFile,
+    StreamEdit,
+    kv_str,
+    stream_replace,
+    write_atomic,
+)
 from clishelf.bump.version_part import VersionConfig
 
 
@@ -64,6 +75,112 @@ def test_should_contain_version_changelog(tmp_path, vs_conf_changelog):
     cf.should_contain_version("1.0.0", ctx)
 
 
+@pytest.fixture(scope="function")
+def stream(monkeypatch):
+    """Stream every file with the small chunks, so the search strings span
+    the chunk boundaries.
+    """
+    monkeypatch.setattr(utils, "STREAM_THRESHOLD", 0)
+    monkeypatch.setattr(utils, "STREAM_CHUNK", 7)
+
+
+def test_stream_replace(tmp_path, stream):
+    content: str = "".join(f"dep-{i} == 1.2.3 ✓\n" for i in range(50))
+    p = tmp_path / "lock.txt"
+    p.write_text(content)
+    p.chmod(0o600)
+
+    stream_replace(p, [(b"1.2.3", b"1.2.45"), (b"== 1.2", b">= 1.2")])
+    assert p.read_text() == content.replace("1.2.3", "1.2.45").replace(
+        "== 1.2", ">= 1.2"
+    )
+    assert p.stat().st_mode & 0o777 == 0o600
+
+    with pytest.raises(ValueError):
+        stream_replace(p, [(b"1.2.45", b"1.2.5"), (b"1.2.45", b"1.2.6")])
+    assert "1.2.45" in p.read_text()
+    assert [f.name for f in tmp_path.iterdir()] == ["lock.txt"]
+
+
+def test_write_symlink(tmp_path, stream):
+    real = tmp_path / "real.txt"
+    real.write_text("version = 1.0.0\n")
+    link = tmp_path / "link.txt"
+    link.symlink_to(real.name)
+
+    write_atomic(link, "version = 1.0.1\n")
+    assert link.is_symlink()
+    assert real.read_text() == "version = 1.0.1\n"
+
+    stream_replace(link, [(b"1.0.1", b"1.0.2")])
+    assert link.is_symlink()
+    assert real.read_text() == "version = 1.0.2\n"
+    assert sorted(f.name for f in tmp_path.iterdir()) == [
+        "link.txt",
+        "real.txt",
+    ]
+
+
+def test_replace_stream(tmp_path, vs_conf, stream):
+    p = tmp_path / "lock.txt"
+    p.write_text("a = 1.2.3\n" * 10)
+    cf = ConfFile(p, vs_conf)
+    ctx = assemble_context()
+
+    cf.should_contain_version("1.2.3", ctx)
+    with pytest.raises(ValueError):
+        cf.should_contain_version("1.0.0", ctx)
+
+    cf.replace("1.2.3", "1.2.4", ctx, dry_run=True)
+    assert p.read_text() == "a = 1.2.3\n" * 10
+    cf.replace("1.2.3", "1.2.4", ctx)
+    assert p.read_text() == "a = 1.2.4\n" * 10
+
+
+def test_plan_version_edits_stream(tmp_path, vs_conf, stream):
+    p = tmp_path / "lock.txt"
+    p.write_text("a = 1.2.3\n" * 10)
+    ctx = assemble_context()
+
+    plan = plan_version_edits([ConfFile(p, vs_conf)], "1.2.3", "1.2.4", ctx)
+    assert plan == {p: StreamEdit(((b"1.2.3", b"1.2.4"),))}
+    assert write_version_edits(plan) == [p]
+    assert p.read_text() == "a = 1.2.4\n" * 10
+
+    with pytest.raises(ValueError):
+        plan_version_edits([ConfFile(p, vs_conf)], "1.2.3", "1.2.5", ctx)
+
+
+def test_plan_version_edits_stream_chained(tmp_path, vs_conf, stream):
+    p = tmp_path / "lock.txt"
+    p.write_text("a = 1.2.3\nb = 1.2.3\n")
+    ctx = assemble_context()
+
+    def conf(key: str) -> ConfFile:
+        return ConfFile(
+            p,
+            VersionConfig(
+                parse=vs_conf.parse_regex.pattern,
+                serialize=vs_conf.serialize_formats,
+                search=f"{key} = {{current_version}}",
+                replace=f"{key} = {{new_version}}",
+                part_configs={},
+            ),
+        )
+
+    plan = plan_version_edits([conf("a"), conf("b")], "1.2.3", "1.2.4", ctx)
+    assert write_version_edits(plan) == [p]
+    assert p.read_text() == "a = 1.2.4\nb = 1.2.4\n"
+
+    # NOTE: The first section replaces every version, so the search of the
+    #   second section does not exist on its chained pass.
+    with pytest.raises(ValueError, match="overlaps the earlier section"):
+        plan_version_edits(
+            [ConfFile(p, vs_conf), conf("b")], "1.2.4", "1.2.5", ctx
+        )
+    assert p.read_text() == "a = 1.2.4\nb = 1.2.4\n"
+
+
 def test_kv_str():
     assert kv_str({"foo": 1, "bar": "baz"}) == "foo=1, bar=baz"
     assert kv_str(1) == "1"
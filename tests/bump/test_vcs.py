@@ -0,0 +1,132 @@
+# ------------------------------------------------------------------------------
+# Copyright (c) 2022 Korawich Anuttra. All rights reserved.
+# Licensed under the MIT License. See LICENSE in the project root for
+# license information.
+# ------------------------------------------------------------------------------
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.bump import vcs
+from clishelf.bump.bump import commit_and_tag_if_required
+from clishelf.bump.utils import ConfFile
+from clishelf.bump.vcs import Git
+from clishelf.errors import WorkingDirectoryIsDirtyException
+
+from ..conftest import git
+
+
+def test_git_is_dirty(git_repo):
+    (git_repo / "untracked.txt").write_text("untracked")
+    assert not Git.is_dirty()
+    Git.assert_nondirty()
+
+    # NOTE: A file that was only touched is not dirty.
+    (git_repo / "file.txt").touch()
+    assert not Git.is_dirty()
+
+    # NOTE: The staged change is dirty even if the working tree was reverted.
+    content: str = (git_repo / "file.txt").read_text()
+    (git_repo / "file.txt").write_text("changed")
+    git("add", "file.txt", cwd=git_repo)
+    (git_repo / "file.txt").write_text(content)
+    assert Git.is_dirty()
+    assert Git.dirty_paths() == ["MM file.txt"]
+
+
+def test_git_is_dirty_unborn(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git("init", "-q", cwd=tmp_path)
+    assert not Git.is_dirty()
+    Path("new.txt").write_text("new")
+    git("add", "new.txt", cwd=tmp_path)
+    assert Git.is_dirty()
+
+
+def test_git_assert_nondirty(git_repo, monkeypatch):
+    git("mv", "file.txt", "moved.txt", cwd=git_repo)
+    for i in range(5):
+        (git_repo / f"new-{i}.txt").write_text("new")
+        git("add", f"new-{i}.txt", cwd=git_repo)
+
+    with patch(
+        "clishelf.runner.subprocess.Popen", wraps=subprocess.Popen
+    ) as mock:
+        assert Git.dirty_paths(limit=2) == [
+            "R  file.txt -> moved.txt",
+            "A  new-0.txt",
+        ]
+        assert mock.call_count == 1
+        assert "--untracked-files=no" in mock.call_args.args[0]
+
+    monkeypatch.setattr(vcs, "DIRTY_PATHS_LIMIT", 3)
+    with pytest.raises(WorkingDirectoryIsDirtyException) as err:
+        Git.assert_nondirty()
+    assert str(err.value).splitlines()[1:] == [
+        "R  file.txt -> moved.txt",
+        "A  new-0.txt",
+        "A  new-1.txt",
+        "...",
+    ]
+
+
+def test_git_commit_and_tag_batched(git_repo, monkeypatch):
+    monkeypatch.setenv("GIT_AUTHOR_DATE", "1704500000 +0000")
+    monkeypatch.setenv("GIT_COMMITTER_DATE", "1704500000 +0000")
+    names: list[str] = [f"file {i}.txt" for i in range(5)]
+
+    def change() -> None:
+        for name in names:
+            (git_repo / name).write_text("0.0.3\n")
+
+    for name in names:
+        (git_repo / name).write_text("0.0.2\n")
+    git("add", *names, cwd=git_repo)
+    git("commit", "-q", "-m", "build: add files", cwd=git_repo)
+
+    # NOTE: The previous flow adds each path, commits from a file, and tags.
+    change()
+    for name in names:
+        git("add", "--update", name, cwd=git_repo)
+    msg: Path = git_repo.parent / "msg.txt"
+    msg.write_text("Bump version: 0.0.2 → 0.0.3", encoding="utf-8")
+    git("commit", "-F", str(msg), "--no-verify", cwd=git_repo)
+    git("tag", "v0.0.3", "--message", "Bump 0.0.3", cwd=git_repo)
+    expected = git("rev-parse", "HEAD", "v0.0.3", cwd=git_repo)
+    git("reset", "-q", "--hard", "HEAD~1", cwd=git_repo)
+    git("tag", "-d", "v0.0.3", cwd=git_repo)
+
+    change()
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        commit_and_tag_if_required(
+            vcs=Git,
+            files=[ConfFile(name, None) for name in names],
+            config_file=None,
+            config_file_exists=False,
+            args={
+                "commit": True,
+                "tag": True,
+                "tag_name": "v{new_version}",
+                "tag_message": "Bump {new_version}",
+                "commit_args": "--no-verify",
+            },
+            current_version_str="0.0.2",
+            new_version_str="0.0.3",
+            dry_run=False,
+        )
+        # NOTE: The rev-parse command is the usable check of the VCS.
+        assert [
+            c.args[0][1]
+            for c in mock.call_args_list
+            if c.args[0][1] != "rev-parse"
+        ] == [
+            "add",
+            "commit",
+            "tag",
+        ]
+    assert git("rev-parse", "HEAD", "v0.0.3", cwd=git_repo) == expected
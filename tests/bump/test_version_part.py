@@ -1,11 +1,21 @@
 import pytest
 
+from clishelf.bump.bump import assemble_context
+from clishelf.bump.configs import get_part_configs
 from clishelf.bump.version_part import (
     ConfiguredPartConf,
     NumericPartConf,
+    SerializePlan,
+    Version,
+    VersionConfig,
     VersionPart,
     labels_for_format,
 )
+from clishelf.errors import (
+    IncompleteVersionRepresentationException,
+    MissingValueForSerializationException,
+)
+from clishelf.settings import BumpVerConf
 
 
 @pytest.fixture(params=[None, (("0", "1", "2"),), (("0", "3"),)])
@@ -81,3 +91,138 @@ def test_labels_for_format():
         "patch",
         "release",
     ]
+
+
+def test_serialize_plan():
+    plan = SerializePlan("v{major}.{minor!s}{{x}}{now:%Y}")
+    assert plan.order == ("major", "minor", "now")
+    assert plan.labels == {"major", "minor", "now"}
+    assert plan.specs == {"minor", "now"}
+    values = {"major": 1, "minor": "2", "now": assemble_context()["now"]}
+    assert plan.render(values) == plan.format.format(**values)
+
+
+@pytest.fixture(scope="function")
+def vc_main() -> VersionConfig:
+    return VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=list(BumpVerConf.serialize),
+        search="{current_version}",
+        replace="{new_version}",
+        part_configs=get_part_configs(),
+    )
+
+
+def test_version_ordering(vc_main):
+    tags: list[str] = [
+        "1.10.0",
+        "1.2.0",
+        "1.2.0.rc1",
+        "1.2.0.a2",
+        "1.2.0.a10",
+        "0.9.9.post1",
+        "1.2.0.b1.post1",
+        "0.9.9",
+    ]
+    versions = sorted(vc_main.parse(tag) for tag in tags)
+    assert [v.original for v in versions] == [
+        "0.9.9",
+        "0.9.9.post1",
+        "1.2.0.a2",
+        "1.2.0.a10",
+        "1.2.0.b1.post1",
+        "1.2.0.rc1",
+        "1.2.0",
+        "1.10.0",
+    ]
+    assert max(versions).original == "1.10.0"
+
+    # NOTE: The aliases of the pre-release kinds sort like their values, and
+    #   the dev kinds that are not on the values sort before all of them.
+    kinds: list[str] = [
+        "1.2.0",
+        "1.2.0.rc1",
+        "1.2.0.beta2",
+        "1.2.0.b1",
+        "1.2.0.alpha1",
+        "1.2.0.a2",
+        "1.2.0.dev1",
+        "1.2.0.d2",
+    ]
+    assert [v.original for v in sorted(map(vc_main.parse, kinds))] == [
+        "1.2.0.dev1",
+        "1.2.0.d2",
+        "1.2.0.alpha1",
+        "1.2.0.a2",
+        "1.2.0.b1",
+        "1.2.0.beta2",
+        "1.2.0.rc1",
+        "1.2.0",
+    ]
+    assert vc_main.parse("1.2.0.alpha1") == vc_main.parse("1.2.0.a1")
+
+    # NOTE: The versions that have the same keys on the other labels are not
+    #   equal, so they order by their labels.
+    major = Version({"major": VersionPart("1", None)})
+    minor = Version({"minor": VersionPart("1", None)})
+    assert major != minor and (major < minor) != (minor < major)
+
+    version = vc_main.parse("1.2.0")
+    assert vc_main.parse("1.2.0") is version
+    assert version == VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=list(BumpVerConf.serialize),
+        search="{current_version}",
+        replace="{new_version}",
+        part_configs=vc_main.part_configs,
+    ).parse("1.2.0")
+    assert len({version, version, vc_main.parse("1.2.0.rc1")}) == 2
+    assert version.bump("minor", vc_main.order()) > version
+    with pytest.raises(AttributeError):
+        version.original = "1.2.1"
+    with pytest.raises(KeyError):
+        version["unknown"]
+
+
+@pytest.mark.parametrize(
+    "version,expected",
+    [
+        ("1.2.3", "1.2.3"),
+        ("1.2.3.rc1", "1.2.3.rc1"),
+        ("1.2.3.post2", "1.2.3.post2"),
+        ("1.2.3.b1.post2", "1.2.3.b1.post2"),
+    ],
+)
+def test_version_config_serialize(version, expected):
+    vc = VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=list(BumpVerConf.serialize),
+        search="{current_version}",
+        replace="{new_version}",
+        part_configs=get_part_configs(),
+    )
+    ctx = assemble_context()
+    assert vc.order() is vc.order()
+    assert vc.serialize(vc.parse(version), ctx) == expected
+
+    vc = VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=["{major}.{minor}.{unknown}", "{major}.{minor}"],
+        search="{current_version}",
+        replace="{new_version}",
+    )
+    with pytest.raises(MissingValueForSerializationException):
+        vc.serialize(vc.parse(version), ctx)
+
+    vc = VersionConfig(
+        parse=BumpVerConf.regex,
+        serialize=["{major}.{minor}.{prekind}"],
+        search="{current_version}",
+        replace="{new_version}",
+        part_configs={"prekind": ConfiguredPartConf(values=["_", "rc"])},
+    )
+    if vc.parse(version)["prekind"].is_optional():
+        with pytest.raises(IncompleteVersionRepresentationException):
+            vc.serialize(vc.parse(version), ctx)
+        with pytest.raises(KeyError):
+            vc.serialize(vc.parse(version), ctx)
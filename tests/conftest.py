@@ -1,5 +1,8 @@
+import os
 import shutil
+import subprocess
 from pathlib import Path
+from typing import Optional
 
 import pytest
 
@@ -23,3 +26,94 @@ def make_yaml_conf(test_path):
     yield
 
     conf_file_mock.unlink(missing_ok=True)
+
+
+def git(*args: str, cwd: Path) -> str:
+    return subprocess.check_output(["git", *args], cwd=cwd).decode("utf-8")
+
+
+def git_commit(
+    repo: Path,
+    msg: str,
+    ts: int,
+    tag: Optional[str] = None,
+    body: Optional[str] = None,
+) -> None:
+    file: Path = repo / "file.txt"
+    with file.open(mode="a", encoding="utf-8") as f:
+        f.write(f"{msg}\n")
+    git("add", "file.txt", cwd=repo)
+    env: dict[str, str] = {
+        **os.environ,
+        "GIT_AUTHOR_DATE": f"{ts} +0000",
+        "GIT_COMMITTER_DATE": f"{ts} +0000",
+    }
+    subprocess.check_output(
+        ["git", "commit", "-q", "--no-verify", "-m", msg]
+        + (["-m", body] if body else []),
+        cwd=repo,
+        env=env,
+    )
+    if tag:
+        git("tag", tag, cwd=repo)
+
+
+@pytest.fixture(scope="function")
+def git_repo(tmp_path, monkeypatch) -> Path:
+    """Create a local Git repository with some commits and tags, and change the
+    current working directory to it.
+    """
+    repo: Path = tmp_path / "repo"
+    repo.mkdir()
+    monkeypatch.setenv("GIT_AUTHOR_NAME", "Test User")
+    monkeypatch.setenv("GIT_AUTHOR_EMAIL", "test@mail.com")
+    monkeypatch.setenv("GIT_COMMITTER_NAME", "Test User")
+    monkeypatch.setenv("GIT_COMMITTER_EMAIL", "test@mail.com")
+    git("init", "-q", "-b", "main", cwd=repo)
+    git_commit(repo, "feat: first initial commit", 1704067200, tag="v0.0.1")
+    git_commit(
+        repo,
+        "fix: fixed bug (END) | pipe",
+        1704153600,
+        body="first line\n(END)\nsecond | line",
+    )
+    git_commit(repo, "docs: update readme file", 1704240000, tag="v0.0.2")
+    git_commit(repo, "feat: add new feature", 1704326400)
+    monkeypatch.chdir(repo)
+    return repo
+
+
+@pytest.fixture(scope="function")
+def history_repo(git_repo) -> Path:
+    """Extend the git repository with a merged branch, an annotated tag, the
+    commits with the same committer dates, and the multi-line subjects.
+    """
+    body: str = "\n".join(f"line {i} of a long commit body" for i in range(40))
+    git("checkout", "-q", "-b", "dev", "HEAD~1", cwd=git_repo)
+    for i in range(6):
+        git_commit(git_repo, f"feat: dev {i}", 1704400000 + i, body=body)
+    git("checkout", "-q", "main", cwd=git_repo)
+    for i in range(6):
+        git_commit(git_repo, f"fix: main {i}", 1704400000 + i, body=body)
+    git_commit(git_repo, "docs: wrap\nthe subject  ", 1704500000, tag="v0.1.0")
+    subprocess.check_output(
+        [
+            "git",
+            "merge",
+            "-q",
+            "--no-ff",
+            "-X",
+            "ours",
+            "-m",
+            "Merge branch 'dev'",
+            "dev",
+        ],
+        cwd=git_repo,
+        env={
+            **os.environ,
+            "GIT_COMMITTER_DATE": "1704600000 -0130",
+        },
+    )
+    git("tag", "-a", "v0.2.0", "-m", "annotated", cwd=git_repo)
+    git("tag", "v0.2.0-alias", cwd=git_repo)
+    return git_repo
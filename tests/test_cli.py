@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from clishelf.cli import LAZY_COMMANDS, cli
+
+
+def test_cli_lazy_import():
+    modules = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            (
+                "import sys; from click.testing import CliRunner; "
+                "from clishelf.cli import cli; "
+                "CliRunner().invoke(cli, ['--help']); "
+                "print(' '.join(sys.modules))"
+            ),
+        ]
+    ).decode("utf-8")
+    for module, _, _ in LAZY_COMMANDS.values():
+        assert module not in modules.split()
+    assert "requests" not in modules.split()
+
+
+def test_cli_help():
+    runner = CliRunner()
+    result = runner.invoke(cli, ["--help"])
+    assert result.exit_code == 0
+    for name, (_, _, short_help) in LAZY_COMMANDS.items():
+        assert f"{name}  " in result.output
+        assert short_help in result.output
+
+    result = runner.invoke(cli, ["emoji", "--help"])
+    assert result.exit_code == 0
+    assert "The Emoji commands" in result.output
@@ -29,6 +29,9 @@ def test_fetch_emoji(mock_request, mock_now, mock_path):
     test_file: Path = Path(__file__).parent / "assets/emoji.json"
     assert test_file.exists()
 
+    test_sidecar: Path = Path(__file__).parent / "assets/emoji.marshal"
+    assert test_sidecar.exists()
+
     result = runner.invoke(emoji.fetch, args="-b")
     assert result.exit_code == 0
 
@@ -37,4 +40,5 @@ def test_fetch_emoji(mock_request, mock_now, mock_path):
 
     test_file.unlink()
     test_file_bk.unlink()
+    test_sidecar.unlink()
     test_file_bk.parent.rmdir()
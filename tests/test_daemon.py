@@ -0,0 +1,100 @@
+import os
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.daemon import (
+    ANSI_ESCAPE,
+    get_socket_path,
+    request,
+    request_cm,
+    serve,
+)
+from clishelf.git import check_commit_msg
+
+
+@pytest.fixture(scope="function")
+def daemon(tmp_path, monkeypatch) -> Path:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    socket_path: Path = get_socket_path()
+    thread = threading.Thread(target=serve)
+    thread.start()
+    for _ in range(100):
+        if request({"cmd": "ping"}, socket_path=socket_path):
+            break
+        thread.join(0.02)
+    yield socket_path
+    request({"cmd": "stop"}, socket_path=socket_path)
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_daemon_cm(git_repo, daemon):
+    assert "pid" in request({"cmd": "ping"}, socket_path=daemon)
+    assert request({"cmd": "unknown"}, socket_path=daemon) is None
+
+    msg_file: Path = git_repo / ".git" / "COMMIT_EDITMSG"
+    msg_file.write_text(
+        "feat: add the commit message daemon\n# comment\n", encoding="utf-8"
+    )
+    lines, rss, _ = check_commit_msg(
+        ["feat: add the commit message daemon", "# comment"], edit=True
+    )
+    rs = request_cm(["-e", "-o"])
+    assert rs["code"] == 0
+    assert ANSI_ESCAPE.sub("", rs["output"]).splitlines() == [*rss, *lines[:-1]]
+    assert msg_file.read_text(encoding="utf-8").splitlines() == lines[:-1]
+    assert lines[0] == ":dart: feat: add the commit message daemon."
+
+    # NOTE: The daemon loads the new config file of the repository.
+    (git_repo / ".clishelf.yaml").write_text(
+        "git:\n  commit_prefix:\n    - ['feat', 'Features', ':rocket:']\n",
+        encoding="utf-8",
+    )
+    msg_file.write_text(
+        "feat: add the commit message daemon\n", encoding="utf-8"
+    )
+    rs = request_cm(["--edit", str(msg_file)])
+    assert ANSI_ESCAPE.sub("", rs["output"]).splitlines()[-1] == (
+        ":rocket: feat: add the commit message daemon."
+    )
+
+    # NOTE: The error on the daemon falls back to run in-process.
+    msg_file.write_text("# comment\n", encoding="utf-8")
+    assert request_cm([str(msg_file)]) is None
+
+    # NOTE: The unsupported arguments fall back to run in-process.
+    assert request_cm(["--prepare"]) is None
+
+
+def test_daemon_absent(git_repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert request({"cmd": "ping"}) is None
+    assert request_cm(["-e"]) is None
+
+
+def test_daemon_private_dir(git_repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    socket_path: Path = get_socket_path()
+    assert socket_path.parent == tmp_path / f"clishelf-{os.getuid()}"
+
+    # NOTE: The directory that other users are able to access is not trusted.
+    socket_path.parent.mkdir(mode=0o755)
+    socket_path.parent.chmod(0o755)
+    with pytest.raises(RuntimeError):
+        serve()
+    assert request({"cmd": "ping"}) is None
+
+    with patch("clishelf.daemon.get_peer_uid", return_value=os.getuid() + 1):
+        socket_path.parent.chmod(0o700)
+        thread = threading.Thread(target=serve, kwargs={"idle_timeout": 0.5})
+        thread.start()
+        for _ in range(50):
+            if socket_path.exists():
+                break
+            thread.join(0.02)
+        assert request({"cmd": "ping"}) is None
+        thread.join(5)
+    assert not thread.is_alive()
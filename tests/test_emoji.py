@@ -8,3 +8,53 @@ def test_demojize_and_emojize():
 
     msg: str = "⬆️ deps: upgrade"
     assert ":arrow_up: deps: upgrade" == emoji.demojize(msg)
+
+
+def test_demojize_longest_first():
+    # NOTE: The `😶` emoji is a prefix of the `😶‍🌫️` ZWJ sequence.
+    assert ":face_in_clouds: :no_mouth:" == emoji.demojize("😶‍🌫️ 😶")
+    assert "ascii message only" == emoji.demojize("ascii message only")
+
+
+def test_emojize_tokens():
+    assert "🎯🔥" == emoji.emojize(":dart::fire:")
+    assert "👍 :not_exists_alias: 🦖" == emoji.emojize(
+        ":+1: :not_exists_alias: :t-rex:"
+    )
+    assert "🎯fire:" == emoji.emojize(":dart:fire:")
+    assert "no alias" == emoji.emojize("no alias")
+
+
+def test_emoji_matcher():
+    matcher = emoji.EmojiMatcher([("🔥", "fire"), ("🔥", "flame")])
+    assert ":fire: :dart:" == matcher.demojize("🔥 :dart:")
+    assert "🔥 🔥 :dart:" == matcher.emojize(":fire: :flame: :dart:")
+    assert "🔥" == emoji.EmojiMatcher([]).demojize("🔥")
+
+
+def test_emoji_sidecar(tmp_path):
+    content: bytes = (
+        b'[{"emoji": "\\ud83c\\udfaf", "alias": "dart"}, '
+        b'{"emoji": "\\ud83d\\udd25", "alias": "fire"}]'
+    )
+    sidecar = tmp_path / "emoji.marshal"
+    assert emoji.load_emoji_sidecar(content, sidecar) is None
+
+    emoji.dump_emoji_sidecar(content, sidecar)
+    data = emoji.load_emoji_sidecar(content, sidecar)
+    assert data.aliases == ("dart", "fire")
+    assert data.to_emoji == {"dart": "🎯", "fire": "🔥"}
+    assert data.to_alias == {"🎯": "dart", "🔥": "fire"}
+
+    # NOTE: The sidecar was generated from another json content.
+    assert emoji.load_emoji_sidecar(content + b" ", sidecar) is None
+
+    sidecar.write_bytes(b"not marshal data")
+    assert emoji.load_emoji_sidecar(content, sidecar) is None
+
+
+def test_load_emoji_data():
+    data = emoji.load_emoji_data()
+    assert data is emoji.load_emoji_data()
+    assert len(data.emojis) == len(data.aliases)
+    assert data.to_emoji["dart"] == "🎯"
@@ -1,4 +1,5 @@
 import datetime
+import subprocess
 import sys
 from unittest.mock import DEFAULT, patch
 
@@ -307,3 +308,88 @@ def test_validate_commit_msg():
         ],
         git.Level.WARNING,
     )
+
+
+def test_gen_commit_logs(git_repo):
+    logs = list(git.gen_commit_logs("HEAD"))
+    assert [log.subject for log in logs] == [
+        "feat: add new feature",
+        "docs: update readme file",
+        "fix: fixed bug (END) | pipe",
+        "feat: first initial commit",
+    ]
+    assert "tag: v0.0.2" in logs[1].refs
+    assert logs[2].body == "first line|(END)|second | line"
+    assert logs[0].date == datetime.datetime(
+        2024, 1, 4, tzinfo=datetime.timezone.utc
+    )
+    assert logs[0].author == git.Profile("Test User", "test@mail.com")
+
+    logs = list(git.gen_commit_logs("v0.0.2..HEAD"))
+    assert len(logs) == 1
+
+
+def test_gen_commit_logs_close_early(git_repo):
+    procs: list[subprocess.Popen] = []
+
+    class RecordPopen(subprocess.Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            procs.append(self)
+
+    with patch("clishelf.git.subprocess.Popen", RecordPopen):
+        gen = git.gen_commit_logs("HEAD")
+        assert next(gen).subject == "feat: add new feature"
+        gen.close()
+
+    # NOTE: The git process should exit after the generator was closed.
+    assert len(procs) == 1
+    assert procs[0].returncode is not None
+
+
+def test_gen_commit_logs_raise(git_repo):
+    with pytest.raises(subprocess.CalledProcessError):
+        list(git.gen_commit_logs("not-exists-ref"))
+
+
+def test_parse_commit_records():
+    stream: bytes = (
+        b"abc1234abc\x1eabc1234\x1etag: v1.0.0\x1e1704067200\x1e+0700\x1eUser\x1e"
+        b"user@mail.com\x1efeat: first\x1ebody\x1e(END)\n\x00"
+        b"def5678def\x1edef5678\x1e\x1e1704153600\x1e-0130\x1eUser\x1euser@mail.com\x1e"
+        b"fix: \xe0\xb8\x81 second\x1e\x00"
+    )
+    # NOTE: Split the stream to small chunks that do not align with records.
+    records = list(
+        git.parse_commit_records(
+            stream[i : i + 7] for i in range(0, len(stream), 7)
+        )
+    )
+    assert len(records) == 2
+    assert records[0].hash == "abc1234"
+    assert records[0].hash_full == "abc1234abc"
+    assert records[0].body == "body\x1e(END)"
+    assert records[0].date == datetime.datetime(
+        2024, 1, 1, 7, tzinfo=datetime.timezone(datetime.timedelta(hours=7))
+    )
+    assert records[1].subject == "fix: ก second"
+    assert records[1].body == ""
+    assert records[1].date.utcoffset() == -datetime.timedelta(minutes=90)
+
+    with pytest.raises(ValueError):
+        list(git.parse_commit_records([b"abc1234\x1enot-enough\x00"]))
+
+
+def test_get_commit_logs(git_repo):
+    logs = list(git.get_commit_logs(all_logs=True))
+    assert [(log.hash[:4], log.refs) for log in logs] == [
+        (logs[0].hash[:4], "HEAD"),
+        (logs[1].hash[:4], "0.0.2"),
+        (logs[2].hash[:4], "0.0.2"),
+        (logs[3].hash[:4], "0.0.1"),
+    ]
+    assert logs[2].msg.body == "first line|(END)|second | line"
+    assert logs[2].msg.content == ":gear: fix: fixed bug (END) | pipe"
+
+    logs = list(git.get_commit_logs())
+    assert [log.msg.content for log in logs] == [":dart: feat: add new feature"]
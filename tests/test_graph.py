@@ -0,0 +1,125 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.bump.vcs import Git
+from clishelf.graph import Ancestry, CommitGraph, describe_head
+from clishelf.objects import ObjectStore, UnsupportedObject
+
+from .conftest import git, git_commit
+
+
+def describe(rev: str) -> tuple[str, int, str]:
+    out = (
+        git(
+            "describe",
+            "--tags",
+            "--long",
+            "--abbrev=40",
+            "--match=v*",
+            rev,
+            cwd=Path(),
+        )
+        .strip()
+        .split("-")
+    )
+    commit = out.pop().lstrip("g")
+    distance = int(out.pop())
+    return "-".join(out), distance, commit
+
+
+@pytest.fixture(scope="function")
+def graph_repo(history_repo) -> Path:
+    """Write the commit-graph with an octopus merge, and add the new commits
+    that are not in the commit-graph after that.
+    """
+    git("tag", "-d", "v0.2.0-alias", cwd=history_repo)
+    for i, name in enumerate(("left", "right")):
+        git("checkout", "-q", "-b", name, "v0.1.0", cwd=history_repo)
+        git_commit(history_repo, f"feat: {name}", 1704650000 + i)
+    git("checkout", "-q", "main", cwd=history_repo)
+    git(
+        "merge",
+        "-q",
+        "-s",
+        "ours",
+        "-m",
+        "Merge octopus",
+        "left",
+        "right",
+        cwd=history_repo,
+    )
+    git("commit-graph", "write", "--reachable", cwd=history_repo)
+    git_commit(history_repo, "feat: not graphed", 1704700000)
+    git_commit(history_repo, "feat: not graphed again", 1704800000)
+    return history_repo
+
+
+def test_ancestry(graph_repo):
+    revs = [
+        git("rev-parse", rev, cwd=graph_repo).strip()
+        for rev in ("HEAD", "HEAD~2", "v0.1.0", "dev", "v0.0.1", "left")
+    ]
+    with (
+        CommitGraph.open(Path(".git")) as graph,
+        ObjectStore(Path(".git")) as store,
+    ):
+        ancestry = Ancestry(graph, store)
+        assert len(ancestry.node(revs[1])[0]) == 3
+        for head in revs:
+            for base in revs:
+                assert ancestry.distance(head, base) == int(
+                    git(
+                        "rev-list", "--count", f"{base}..{head}", cwd=graph_repo
+                    )
+                )
+                expected = subprocess.call(
+                    ["git", "merge-base", "--is-ancestor", base, head],
+                    cwd=graph_repo,
+                )
+                assert ancestry.is_ancestor(base, head) is (expected == 0)
+
+
+def test_describe_head(graph_repo):
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        rs = describe_head("v*")
+        assert mock.call_count == 0
+    assert rs == describe("HEAD") == ("v0.2.0", 5, rs[2])
+
+    for rev in ("dev", "v0.1.0", "HEAD~3"):
+        git("checkout", "-q", "--detach", rev, cwd=graph_repo)
+        assert describe_head("v*") == describe("HEAD")
+    assert describe_head("not-exists*") is None
+
+
+def test_describe_head_unsupported(history_repo):
+    # NOTE: The commit-graph was not written.
+    with pytest.raises(UnsupportedObject):
+        describe_head("v*")
+
+    # NOTE: The two tags on the HEAD have the same distance.
+    git("commit-graph", "write", "--reachable", cwd=history_repo)
+    with pytest.raises(UnsupportedObject):
+        describe_head("v*")
+
+
+def test_git_latest_tag_info(graph_repo):
+    info = Git.latest_tag_info()
+    assert info == {
+        "commit_sha": describe("HEAD")[2],
+        "distance_to_latest_tag": 5,
+        "current_version": "0.2.0",
+    }
+
+    (graph_repo / "file.txt").write_text("changed")
+    assert "dirty" not in Git.latest_tag_info()
+    assert Git.latest_tag_info(dirty=True)["dirty"] is True
+
+    # NOTE: It falls back to the git describe command.
+    with patch("clishelf.graph.describe_head", side_effect=UnsupportedObject):
+        assert Git.latest_tag_info() == info
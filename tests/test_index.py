@@ -0,0 +1,86 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+import clishelf.git as git
+from clishelf.index import CommitIndex, IndexedCommit
+
+from .conftest import git_commit
+
+
+def commit_logs(**kwargs) -> list[tuple]:
+    return [
+        (
+            log.hash,
+            log.refs,
+            log.date,
+            log.msg.content,
+            log.msg.mtype,
+            log.msg.body,
+            log.author,
+        )
+        for log in git.get_commit_logs(**kwargs)
+    ]
+
+
+def test_commit_index(git_repo):
+    index = CommitIndex.from_repo()
+    assert index.path.absolute() == git_repo / ".git/clishelf/index.sqlite"
+    assert not index.status().exists
+    assert CommitIndex.open_fresh() is None
+
+    expected = commit_logs(all_logs=True)
+    expected_latest = commit_logs()
+
+    assert index.build() == 4
+    assert index.status().fresh
+    assert index.status().count == 4
+    assert CommitIndex.open_fresh() is not None
+
+    assert all(
+        isinstance(r, IndexedCommit) for r in index.gen_commit_logs("HEAD")
+    )
+
+    # NOTE: The hashes stream in the chunks, and a missing range raises.
+    with patch("clishelf.index.INDEX_CHUNK", 3):
+        hashes = [r.hash_full for r in index.gen_commit_logs("HEAD")]
+    assert (
+        hashes
+        == subprocess.check_output(["git", "rev-list", "HEAD"]).decode().split()
+    )
+    assert next(index.gen_commit_logs("HEAD")).hash_full == hashes[0]
+    with pytest.raises(subprocess.CalledProcessError):
+        list(index.gen_commit_logs("v9.9.9..HEAD"))
+    assert commit_logs(all_logs=True) == expected
+    assert commit_logs() == expected_latest
+
+    # NOTE: Add the new commit, and it should index only this commit.
+    git_commit(git_repo, "build: add new workflow", 1704412800, tag="v0.0.3")
+    assert not index.status().fresh
+    assert CommitIndex.open_fresh() is None
+    assert index.build() == 1
+    assert index.status().fresh
+    assert commit_logs(all_logs=True)[0][1] == "0.0.3"
+
+    # NOTE: Add tag to the commit that already indexed.
+    subprocess.check_output(["git", "tag", "v0.0.0", "HEAD~4"])
+    assert not index.status().tags
+    assert index.build() == 0
+    assert commit_logs(all_logs=True)[-1][1] == "0.0.0"
+
+    assert index.drop()
+    assert not index.drop()
+
+
+def test_commit_index_config_changed(git_repo):
+    index = CommitIndex.from_repo()
+    index.build()
+    assert index.status().config
+
+    (git_repo / ".clishelf.yaml").write_text(
+        "git:\n  commit_msg_format: '{prefix}: {subject}'\n"
+    )
+    assert not index.status().config
+    assert index.build() == 4
+    assert commit_logs()[0][3] == "feat: add new feature"
@@ -0,0 +1,143 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from clishelf import git as shelf_git
+from clishelf.objects import (
+    ObjectStore,
+    UnsupportedObject,
+    apply_delta,
+    split_message,
+    walk_commit_records,
+)
+
+from .conftest import git
+
+
+def compare(rev_range: str) -> int:
+    native = [r.fields for r in walk_commit_records(rev_range)]
+    expected = [r.fields for r in shelf_git.gen_commit_logs_git(rev_range)]
+    assert native == expected
+    return len(native)
+
+
+def test_walk_commit_records_loose(history_repo):
+    assert not list((history_repo / ".git/objects/pack").glob("*.pack"))
+    assert compare("HEAD") == 18
+    assert compare("v0.0.2..HEAD") == 15
+    assert compare("v0.1.0..v0.2.0") == 7
+    assert compare("dev") == 9
+    assert compare("refs/heads/dev..main") == 9
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        "repack.useDeltaBaseOffset=true",
+        "repack.useDeltaBaseOffset=false",
+    ],
+)
+def test_walk_commit_records_packed(history_repo, config):
+    git("-c", config, "repack", "-q", "-a", "-d", "-f", cwd=history_repo)
+    verify = git(
+        "verify-pack",
+        "-v",
+        *map(str, (history_repo / ".git/objects/pack").glob("*.idx")),
+        cwd=history_repo,
+    )
+    assert "chain length" in verify
+
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        records = list(walk_commit_records("HEAD"))
+        assert mock.call_count == 0
+    assert len(records) == 18
+    assert compare("HEAD") == 18
+    assert compare("v0.0.1..dev") == 8
+
+
+def test_gen_commit_logs_native(history_repo):
+    with patch(
+        "clishelf.git.load_config",
+        return_value={"git": {"native_log": True}},
+    ):
+        with patch("clishelf.git.gen_commit_logs_git") as mock:
+            logs = list(shelf_git.gen_commit_logs("HEAD"))
+            mock.assert_not_called()
+        assert logs[0].subject == "Merge branch 'dev'"
+        assert logs[0].refs == "tag: v0.2.0-alias, tag: v0.2.0"
+        assert logs[0].offset == "-0130"
+
+        # NOTE: It falls back to git log for an unsupported revision.
+        logs = list(shelf_git.gen_commit_logs("HEAD~2..HEAD"))
+        assert len(logs) == 8
+
+        # NOTE: It skips the commits that the native reader already yielded.
+        records = walk_commit_records("HEAD")
+
+        def broken(*args):
+            yield next(records)
+            yield next(records)
+            raise UnsupportedObject("broken")
+
+        with patch("clishelf.objects.walk_commit_records", broken):
+            logs = list(shelf_git.gen_commit_logs("HEAD"))
+        records.close()
+        expected = [r.fields for r in shelf_git.gen_commit_logs_git("HEAD")]
+        assert [r.fields for r in logs] == expected
+
+        # NOTE: The native order may differ from git log, so it skips the
+        #   commits by their hashes instead of their positions.
+        def reordered(*args):
+            yield list(walk_commit_records("HEAD"))[2]
+            raise UnsupportedObject("broken")
+
+        with patch("clishelf.objects.walk_commit_records", reordered):
+            logs = list(shelf_git.gen_commit_logs("HEAD"))
+        assert [r.fields for r in logs] == [
+            expected[2],
+            *expected[:2],
+            *expected[3:],
+        ]
+
+
+def test_walk_commit_records_unsupported(git_repo):
+    with pytest.raises(UnsupportedObject):
+        list(walk_commit_records("HEAD~1"))
+    with pytest.raises(UnsupportedObject):
+        list(walk_commit_records("v0.0.1...HEAD"))
+
+    (git_repo / ".git/shallow").touch()
+    with pytest.raises(UnsupportedObject):
+        list(walk_commit_records("HEAD"))
+
+
+def test_split_message():
+    assert split_message(b"\n\nfirst\nsecond \n\n\nbody\n") == (
+        b"first second",
+        b"body\n",
+    )
+    assert split_message(b"subject") == (b"subject", b"")
+
+
+def test_apply_delta():
+    base: bytes = b"0123456789"
+    # NOTE: Copy 4 bytes from the offset 2, then insert 3 bytes.
+    delta: bytes = bytes([10, 7, 0x80 | 0x01 | 0x10, 2, 4, 3]) + b"abc"
+    assert apply_delta(base, delta) == b"2345abc"
+    with pytest.raises(UnsupportedObject):
+        apply_delta(b"short", delta)
+
+
+def test_object_store(git_repo):
+    head: str = git("rev-parse", "HEAD", cwd=git_repo).strip()
+    with ObjectStore(Path(".git")) as store:
+        kind, data = store.read(head)
+        assert kind == "commit"
+        assert store.abbrev(head, 7) == head[:7]
+        with pytest.raises(UnsupportedObject):
+            store.read("0" * 40)
@@ -0,0 +1,66 @@
+import json
+import pstats
+import subprocess
+
+from click.testing import CliRunner
+
+import clishelf.git as git
+import clishelf.utils as utils
+from clishelf.cli import cli
+from clishelf.profiling import get_profiler, phase, profile
+from clishelf.runner import runner
+
+
+def test_profile_json(tmp_path):
+    original = utils.load_config
+    popen = subprocess.Popen
+    report_file = tmp_path / "report.json"
+    with profile(report_file) as profiler:
+        assert get_profiler() is profiler
+
+        # NOTE: It does not patch the objects of the other code.
+        assert subprocess.Popen is popen
+        assert git.load_config is original
+
+        with phase("check"):
+            runner.output(["git", "--version"])
+            with runner.popen(["git", "--version"], stdout=subprocess.PIPE):
+                pass
+            subprocess.check_output(["git", "--version"])
+            git.load_config()
+            git.load_config()
+
+    assert get_profiler() is None
+
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert report["phases"]["check"]["count"] == 1
+    assert report["phases"]["command"]["count"] == 1
+    assert report["calls"]["git"]["count"] == 2
+    assert "subprocess" not in report["calls"]
+    assert report["calls"]["load_config"]["count"] == 2
+    assert [s["args"] for s in report["subprocesses"]] == [
+        ["git", "--version"],
+        ["git", "--version"],
+    ]
+
+
+def test_profile_disabled():
+    assert get_profiler() is None
+    assert phase("check") is phase("other")
+    with phase("check"):
+        pass
+
+
+def test_cli_profile(tmp_path, monkeypatch):
+    runner = CliRunner()
+    report_file = tmp_path / "report.pstats"
+    result = runner.invoke(cli, ["--profile", str(report_file), "conf"])
+    assert result.exit_code == 0
+    assert pstats.Stats(str(report_file)).total_calls > 0
+
+    report_file = tmp_path / "report.json"
+    monkeypatch.setenv("CLISHELF_PROFILE", str(report_file))
+    result = runner.invoke(cli, ["conf"])
+    assert result.exit_code == 0
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert report["calls"]["load_config"]["count"] == 1
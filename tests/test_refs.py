@@ -0,0 +1,128 @@
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.git import get_latest_tag
+from clishelf.refs import (
+    UnsupportedRefs,
+    get_gone_branches,
+    read_refs,
+    read_refs_git,
+    read_refs_native,
+    read_upstreams,
+)
+
+from .conftest import git
+
+
+def test_read_refs(git_repo):
+    head: str = git("rev-parse", "HEAD", cwd=git_repo).strip()
+    git("tag", "-a", "v0.0.3", "-m", "annotated", cwd=git_repo)
+    git("branch", "dev", "HEAD~1", cwd=git_repo)
+
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        refs = read_refs()
+        assert mock.call_count == 0
+
+    assert refs.head == "refs/heads/main"
+    assert refs.branch == "main"
+    assert refs.head_commit == head
+    assert refs.branches["main"] == head
+    assert refs.tags["v0.0.3"] == head
+    assert refs.tags_at(head) == ["v0.0.3"]
+    assert refs == read_refs_git()
+
+    # NOTE: It returns the cached refs until any ref was changed.
+    assert read_refs() is refs
+    git("tag", "v0.0.4", cwd=git_repo)
+    assert read_refs().tags_at(head) == ["v0.0.3", "v0.0.4"]
+
+
+def test_read_refs_packed(git_repo):
+    git("tag", "-a", "v0.0.3", "-m", "annotated", "HEAD~1", cwd=git_repo)
+    git("pack-refs", "--all", cwd=git_repo)
+    assert not (git_repo / ".git/refs/tags/v0.0.3").exists()
+    assert "^" in (git_repo / ".git/packed-refs").read_text()
+
+    refs = read_refs_native(Path(".git"))
+    assert refs == read_refs_git()
+    assert refs.tags["v0.0.3"] == refs.tags["v0.0.2"]
+
+    # NOTE: A loose ref overrides the packed ref that has the same name.
+    git("tag", "-f", "v0.0.3", "HEAD", cwd=git_repo)
+    refs = read_refs_native(Path(".git"))
+    assert refs.tags["v0.0.3"] == refs.head_commit
+    assert refs == read_refs_git()
+
+
+def test_read_refs_detached(git_repo):
+    git("checkout", "-q", "--detach", "v0.0.2", cwd=git_repo)
+    refs = read_refs()
+    assert refs.head is None
+    assert refs.branch is None
+    assert refs.tags_at(refs.head_commit) == ["v0.0.2"]
+    assert get_latest_tag() == "v0.0.2"
+
+
+def test_read_refs_fallback(git_repo):
+    (git_repo / ".git/reftable").mkdir()
+    with pytest.raises(UnsupportedRefs):
+        read_refs_native(Path(".git"))
+
+    with patch("clishelf.refs.read_refs_git") as mock:
+        read_refs()
+        mock.assert_called_once()
+
+
+def test_get_gone_branches(git_repo, tmp_path):
+    remote: Path = tmp_path / "remote"
+    git("clone", "-q", str(git_repo), str(remote), cwd=tmp_path)
+    git("checkout", "-q", "-b", "feature", cwd=remote)
+
+    git("remote", "add", "origin", str(remote), cwd=git_repo)
+    git("fetch", "-q", "origin", cwd=git_repo)
+    git("branch", "-q", "-t", "feature", "origin/feature", cwd=git_repo)
+    assert read_upstreams() == {"feature": "refs/remotes/origin/feature"}
+    assert get_gone_branches() == []
+
+    git("update-ref", "-d", "refs/remotes/origin/feature", cwd=git_repo)
+    assert get_gone_branches() == ["feature"]
+
+    with (git_repo / ".git/config").open(mode="a") as f:
+        f.write('[include]\n\tpath = "other.config"\n')
+    with pytest.raises(UnsupportedRefs):
+        read_upstreams()
+    assert get_gone_branches() == ["feature"]
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [
+        "[branch.main]\n\tremote = origin\n",
+        '[branch "main"]\n\tremote = origin ; comment\n',
+        '[branch "main"]\n\tremote = "ori\\"gin"\n',
+        '[branch "main"]\n\tmerge = refs/heads/\\\nmain\n',
+        '[branch "main"] # comment\n',
+    ],
+)
+def test_get_gone_branches_config(git_repo, tmp_path, extra):
+    remote: Path = tmp_path / "remote"
+    git("clone", "-q", str(git_repo), str(remote), cwd=tmp_path)
+    git("remote", "add", "origin", str(remote), cwd=git_repo)
+    git("fetch", "-q", "origin", cwd=git_repo)
+    git("branch", "-q", "-t", "gone", "origin/main", cwd=git_repo)
+    git("update-ref", "-d", "refs/remotes/origin/main", cwd=git_repo)
+    assert get_gone_branches() == ["gone"]
+
+    # NOTE: The config lines that it does not parse fall back to git, so the
+    #   main branch that it would mis-parse as gone is kept.
+    with (git_repo / ".git/config").open(mode="a") as f:
+        f.write(extra)
+    with pytest.raises(UnsupportedRefs):
+        read_upstreams()
+    assert get_gone_branches() == ["gone"]
@@ -0,0 +1,177 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.bump.vcs import Git
+from clishelf.runner import (
+    CatFile,
+    GitRunner,
+    close_cat_files,
+    get_cat_file,
+    get_head_token,
+)
+
+from .conftest import git
+
+
+def test_get_head_token(git_repo, tmp_path, monkeypatch):
+    token = get_head_token()
+    assert token[0] == b"ref: refs/heads/main\n"
+    assert token[1] is not None
+
+    git("tag", "v0.0.3", cwd=git_repo)
+    assert get_head_token() != token
+
+    # NOTE: The tag on a nested namespace changes only its own directory.
+    git("tag", "release/v0.0.3", cwd=git_repo)
+    token = get_head_token()
+    git("tag", "release/v0.0.4", cwd=git_repo)
+    assert get_head_token() != token
+
+    monkeypatch.chdir(tmp_path)
+    assert get_head_token() is None
+
+
+def test_get_head_token_subdir(git_repo, monkeypatch):
+    (git_repo / "sub").mkdir()
+    monkeypatch.chdir(git_repo / "sub")
+    token = get_head_token()
+    assert token == get_head_token(git_repo / ".git")
+
+    # NOTE: The worktree reads the refs from its common directory.
+    git("worktree", "add", "-q", str(git_repo.parent / "wt"), cwd=git_repo)
+    monkeypatch.chdir(git_repo.parent / "wt")
+    assert (git_repo.parent / "wt" / ".git").is_file()
+    assert get_head_token()[2:5] == token[2:5]
+
+    # NOTE: The staged change changes the index stat.
+    monkeypatch.chdir(git_repo / "sub")
+    (git_repo / "new.txt").write_text("new")
+    git("add", "new.txt", cwd=git_repo)
+    assert get_head_token()[5] != token[5]
+
+
+def count(mock, args: list[str]) -> int:
+    return sum(call.args[0] == args for call in mock.call_args_list)
+
+
+def test_git_runner_session(git_repo):
+    runner = GitRunner()
+    describe: list[str] = ["git", "describe", "--tags", "--abbrev=0"]
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        # NOTE: It does not memoise outside the session.
+        assert runner.output(describe, cache=True) == b"v0.0.2\n"
+        assert runner.output(describe, cache=True) == b"v0.0.2\n"
+        assert count(mock, describe) == 2
+
+        with runner.session():
+            assert runner.output(describe, cache=True) == b"v0.0.2\n"
+            assert runner.output(describe, cache=True) == b"v0.0.2\n"
+            assert runner.output(describe) == b"v0.0.2\n"
+            assert count(mock, describe) == 4
+
+            # NOTE: The new tag changes the HEAD token.
+            git("tag", "v0.0.3", cwd=git_repo)
+            assert runner.output(describe, cache=True) == b"v0.0.3\n"
+            assert count(mock, describe) == 5
+
+            # NOTE: The mutating command drops the memoised outputs.
+            runner.check(["git", "tag", "-d", "v0.0.3"])
+            assert runner.output(describe, cache=True) == b"v0.0.2\n"
+            assert count(mock, describe) == 6
+
+        assert runner._memo is None
+
+
+def test_git_runner_session_subdir(git_repo, monkeypatch):
+    runner = GitRunner()
+    ls_files: list[str] = ["git", "ls-files"]
+    (git_repo / "sub").mkdir()
+    monkeypatch.chdir(git_repo / "sub")
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        with runner.session():
+            assert runner.output(ls_files, cache=True) == b""
+            assert runner.output(ls_files, cache=True) == b""
+            assert count(mock, ls_files) == 1
+
+            # NOTE: The staged file outside the runner changes the token.
+            (git_repo / "sub" / "new.txt").write_text("new")
+            git("add", "sub/new.txt", cwd=git_repo)
+            assert runner.output(ls_files, cache=True) == b"new.txt\n"
+            assert count(mock, ls_files) == 2
+        assert count(mock, ["git", "rev-parse", "--absolute-git-dir"]) == 1
+
+
+def test_git_runner_call(git_repo):
+    runner = GitRunner()
+    assert runner.call(["git", "rev-parse", "--git-dir"]) == 0
+    assert runner.call(["git", "rev-parse", "--verify", "-q", "unknown"]) == 1
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.output(["git", "rev-parse", "--verify", "-q", "unknown"])
+
+
+def test_vcs_is_usable_memoised(git_repo):
+    from clishelf.runner import runner
+
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        with runner.session():
+            assert Git.is_usable()
+            assert Git.is_usable()
+        assert mock.call_count == 1
+
+
+def test_cat_file(git_repo):
+    cat_file = CatFile(str(git_repo))
+    head = cat_file.get("HEAD")
+    assert head.type == "commit"
+    assert head.message() == "feat: add new feature\n"
+
+    objs = cat_file.get_many(["HEAD~1:file.txt", "unknown", "v0.0.1"])
+    assert objs[0].type == "blob"
+    assert objs[0].text().splitlines() == [
+        "feat: first initial commit",
+        "fix: fixed bug (END) | pipe",
+        "docs: update readme file",
+    ]
+    assert objs[1] is None
+    assert objs[2].type == "commit"
+
+    # NOTE: The missing name that has spaces is not a valid header.
+    assert cat_file.check_many(["HEAD:a b", "HEAD:a b c", "HEAD"])[:2] == [
+        None,
+        None,
+    ]
+
+    # NOTE: It reads more objects than the batch size over the same process.
+    names = [f"HEAD~{i % 4}" for i in range(200)]
+    checks = cat_file.check_many(names)
+    assert len(checks) == 200
+    assert all(c.content is None and c.type == "commit" for c in checks)
+    assert len(cat_file._procs) == 2
+
+    with pytest.raises(ValueError):
+        cat_file.get("HEAD\nHEAD")
+
+    cat_file.close()
+    assert cat_file._procs == {}
+    assert cat_file.get("HEAD").oid == head.oid
+    cat_file.close()
+
+
+def test_get_cat_file(git_repo):
+    cat_file = get_cat_file()
+    assert get_cat_file() is cat_file
+    assert cat_file.cwd == str(git_repo)
+    close_cat_files()
+    assert get_cat_file() is not cat_file
+    close_cat_files()
@@ -0,0 +1,116 @@
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+from clishelf.bump.cli import get_tag_ranges
+from clishelf.git import get_latest_tag
+from clishelf.tags import TagIndex, get_tag_index, version_key
+
+from .conftest import git, git_commit
+
+
+def test_tag_index():
+    index = TagIndex.from_tags(
+        {
+            name: f"commit-{i}"
+            for i, name in enumerate(
+                (
+                    "v1.10.0",
+                    "v1.2.0",
+                    "v1.2.0.rc1",
+                    "1.9.0.post1",
+                    "v2.0.0.a1",
+                    "v1.2.0.dev1",
+                    "v0.2.0-alias",
+                    "release",
+                )
+            )
+        }
+    )
+    assert [t.version for t in index] == [
+        "1.2.0.dev1",
+        "1.2.0.rc1",
+        "1.2.0",
+        "1.9.0.post1",
+        "1.10.0",
+        "2.0.0.a1",
+    ]
+    assert index.latest().name == "v2.0.0.a1"
+    assert index.latest(pre=False).name == "v1.10.0"
+    assert index.previous("1.10.0").version == "1.9.0.post1"
+    assert index.previous("1.2.0.dev1") is None
+    assert index.get("1.2.0").name == "v1.2.0"
+    assert index.get("1.3.0") is None
+
+    assert [t.version for t in index.range(">=1.2,<2")] == [
+        "1.2.0",
+        "1.9.0.post1",
+        "1.10.0",
+    ]
+    assert [t.version for t in index.range(">1.2.0, <=1.10")] == [
+        "1.9.0.post1",
+        "1.10.0",
+    ]
+    assert [t.version for t in index.range("==1.2.0.rc1")] == ["1.2.0.rc1"]
+    assert len(index.range("")) == len(index)
+    assert index.range(">=3") == []
+    with pytest.raises(ValueError):
+        index.range("~=1.2")
+    with pytest.raises(ValueError):
+        index.range(">=latest")
+
+
+def test_tag_index_dt():
+    index = TagIndex.from_tags(
+        {"20240102": "c1", "v20240101.2": "c2", "20240101": "c3", "v1.0.0": ""},
+        is_dt=True,
+    )
+    assert [t.name for t in index] == ["20240101", "v20240101.2", "20240102"]
+    assert index.previous("20240102").version == "20240101.2"
+    assert [t.name for t in index.range(">20240101,<20240102")] == [
+        "v20240101.2"
+    ]
+    assert version_key("20240101.1", is_dt=True) < version_key(
+        "20240101.10", is_dt=True
+    )
+
+
+def test_get_latest_tag_out_of_order(git_repo):
+    # NOTE: The backport tag that has the higher version does not reach from
+    #   the HEAD, and the out of order tag is nearer to the HEAD.
+    git("checkout", "-q", "-b", "backport", "v0.0.1", cwd=git_repo)
+    git_commit(git_repo, "fix: backport", 1704400000, tag="v0.0.5")
+    git("checkout", "-q", "main", cwd=git_repo)
+    git("tag", "v0.0.1.post1", "HEAD", cwd=git_repo)
+    git("tag", "-a", "v0.0.2.rc1", "-m", "annotated", "HEAD~2", cwd=git_repo)
+
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        assert get_latest_tag() == "v0.0.2"
+        assert mock.call_count == 1
+        assert mock.call_args.args[0][1] == "for-each-ref"
+
+    assert get_tag_index().latest().name == "v0.0.5"
+    ranges = get_tag_ranges()
+    assert [tag for tag, _ in ranges] == [
+        "0.0.2",
+        "0.0.2.rc1",
+        "0.0.1.post1",
+        "0.0.1",
+    ]
+    assert ranges[0][1].split("..")[0] == ranges[1][1].split("..")[1]
+
+
+def test_get_latest_tag_head(git_repo):
+    git("tag", "v0.0.3", "HEAD", cwd=git_repo)
+    git("tag", "release", "HEAD", cwd=git_repo)
+
+    with patch(
+        "clishelf.runner.subprocess.check_output",
+        wraps=subprocess.check_output,
+    ) as mock:
+        assert get_latest_tag() == "v0.0.3"
+        assert mock.call_count == 0
@@ -57,3 +57,34 @@ def test_load_config(mock_load_pyproject, mock_path):
         "git": {"commit_prefix": [["comment", "Documents", ":bulb:"]]}
     } == data
     main_file.unlink()
+
+
+def test_load_cached(tmp_path):
+    conf_file = tmp_path / "conf.yaml"
+    conf_file.write_text("git:\n  commit_prefix_force_fix: true\n")
+
+    calls = []
+
+    def loader(file):
+        calls.append(file)
+        return utils._read_yaml(file)
+
+    data = utils.load_cached(conf_file, loader)
+    assert data == {"git": {"commit_prefix_force_fix": True}}
+    assert utils.load_cached(conf_file, loader) is data
+    assert len(calls) == 1
+
+    # NOTE: The size of file was changed, it should reload this file.
+    conf_file.write_text("git:\n  commit_prefix_force_fix: false\n")
+    assert utils.load_cached(conf_file, loader) == {
+        "git": {"commit_prefix_force_fix": False}
+    }
+    assert len(calls) == 2
+
+    utils.invalidate_config(conf_file)
+    utils.load_cached(conf_file, loader)
+    assert len(calls) == 3
+
+    conf_file.unlink()
+    assert utils.load_cached(conf_file, loader) is None
+    assert len(calls) == 3